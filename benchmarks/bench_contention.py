@@ -0,0 +1,77 @@
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from number_guessing_game import ScoreManager  # noqa: E402
+from storage import MemoryScoreStorage  # noqa: E402
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+class GlobalLockScoreManager(ScoreManager):
+    # The coarse alternative: one lock around every update and read.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.global_lock = threading.Lock()
+
+    def update_high_score(self, difficulty, score, player_name):
+        with self.global_lock:
+            super().update_high_score(difficulty, score, player_name)
+
+    def get_rank(self, difficulty, player_name):
+        with self.global_lock:
+            return super().get_rank(difficulty, player_name)
+
+
+def worker(score_manager, index, operations, start):
+    # Mostly wins, with a rank lookup every tenth operation.
+    rng = random.Random(index)
+    start.wait()
+    for operation in range(operations):
+        difficulty = DIFFICULTIES[rng.randrange(3)]
+        player_name = f"Player{rng.randrange(1000)}"
+        if operation % 10 == 9:
+            score_manager.get_rank(difficulty, player_name)
+        else:
+            score_manager.update_high_score(difficulty, rng.randrange(3000),
+                                            player_name)
+
+
+def throughput(manager_class, threads, operations):
+    score_manager = manager_class(MemoryScoreStorage())
+    start = threading.Barrier(threads + 1)
+    workers = [threading.Thread(target=worker,
+                                args=(score_manager, index, operations, start))
+               for index in range(threads)]
+    for thread in workers:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    return threads * operations / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Measure ScoreManager throughput as threads are added.")
+    parser.add_argument("--threads", type=int, nargs="+",
+                        default=[1, 2, 4, 8, 16])
+    parser.add_argument("--operations", type=int, default=20000,
+                        help="operations per thread")
+    args = parser.parse_args(argv)
+    print(f"{'threads':>7} {'per-difficulty':>16} {'global lock':>14}")
+    for threads in args.threads:
+        fine = throughput(ScoreManager, threads, args.operations)
+        coarse = throughput(GlobalLockScoreManager, threads, args.operations)
+        print(f"{threads:>7} {fine:>12,.0f}/s {coarse:>10,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
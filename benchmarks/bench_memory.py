@@ -0,0 +1,107 @@
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from number_guessing_game import GameRound, GameSettings, Player  # noqa: E402
+
+
+class DictPlayer:
+    # Player as it was before __slots__: every instance carries a __dict__.
+    def __init__(self, name):
+        self.name = name
+        self.best_scores = {}
+        self.total_games_played = 0
+        self.total_wins = 0
+
+
+class DictGameRound:
+    # The same fields as GameRound before __slots__ and difficulty codes:
+    # a __dict__ per instance, the difficulty name as read and float times.
+    def __init__(self, difficulty_level, number_range, attempts,
+                 hints_remaining, rng=None):
+        self.target_number = None
+        self.remaining_attempts = attempts
+        self.difficulty_level = difficulty_level
+        self.number_range = number_range
+        self.start_time = time.time()
+        self.end_time = None
+        self.hints_remaining = hints_remaining
+        self.current_score = 0
+        self.is_won = False
+        self.rng = rng or random
+        self.event_log = None
+        self.session_id = 0
+        self.clock = None
+        self.candidates = None
+
+    def generate_target_number(self):
+        self.target_number = self.rng.randint(*self.number_range)
+
+    def process_guess(self, guess):
+        self.remaining_attempts -= 1
+        if guess == self.target_number:
+            self.end_time = time.time()
+            return "correct"
+        elif guess < self.target_number:
+            return "greater"
+        return "less"
+
+
+IMPLEMENTATIONS = {"before (dict)": (DictPlayer, DictGameRound),
+                   "after (slots)": (Player, GameRound)}
+
+
+def live_sessions(count, game_settings, player_class=Player,
+                  round_class=GameRound):
+    # What a server holds per connected player between messages: the
+    # player, their round in progress and the last guess result. Names and
+    # difficulties are built at runtime, as when they arrive off the wire.
+    rng = random.Random(1)
+    difficulties = list(game_settings.difficulty_levels)
+    sessions = []
+    for index in range(count):
+        difficulty = "".join(difficulties[index % 3])
+        player = player_class(f"Player{index}")
+        game_round = round_class(difficulty, game_settings.number_range,
+                                 game_settings.get_attempts(difficulty),
+                                 game_settings.get_hints_allowed(difficulty),
+                                 rng=rng)
+        game_round.generate_target_number()
+        result = game_round.process_guess(50)
+        sessions.append((player, game_round, result))
+    return sessions
+
+
+def bytes_per_session(count, player_class=Player, round_class=GameRound):
+    game_settings = GameSettings()
+    live_sessions(10, game_settings, player_class, round_class)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        sessions = live_sessions(count, game_settings, player_class,
+                                 round_class)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del sessions
+    return (after - before) / count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Measure memory held per live game session.")
+    parser.add_argument("--sessions", type=int, default=100000)
+    args = parser.parse_args(argv)
+    print(f"{args.sessions:,} live sessions:")
+    for label, classes in IMPLEMENTATIONS.items():
+        size = bytes_per_session(args.sessions, *classes)
+        print(f"  {label:<14} {size:7,.0f} bytes per session")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from number_guessing_game import GameRound, GameSettings  # noqa: E402
+
+RANGES = [
+    ("100", (1, 100)),
+    ("10^4", (1, 10 ** 4)),
+    ("10^6", (1, 10 ** 6)),
+    ("10^9", (1, 10 ** 9)),
+    ("2^32", (1, 2 ** 32)),
+    ("2^63", (1, 2 ** 63)),
+]
+
+
+def bench_range(number_range, rounds):
+    settings = GameSettings(number_range)
+    rng = random.Random(1)
+    guesses = hints = 0
+    guess_time = hint_time = score_time = 0.0
+    for _ in range(rounds):
+        game_round = GameRound("hard", settings.number_range, 64, 1, rng=rng)
+        game_round.generate_target_number()
+        low, high = settings.number_range
+        while not game_round.check_game_over():
+            guess = (low + high) // 2
+            start = time.perf_counter()
+            result = game_round.process_guess(guess)
+            guess_time += time.perf_counter() - start
+            guesses += 1
+            if result == "correct":
+                game_round.is_won = True
+            elif result == "greater":
+                low = guess + 1
+            else:
+                high = guess - 1
+
+        start = time.perf_counter()
+        game_round.hints_remaining = 1
+        game_round.provide_hint()
+        hint_time += time.perf_counter() - start
+        hints += 1
+
+        start = time.perf_counter()
+        game_round.calculate_score(3)
+        score_time += time.perf_counter() - start
+
+    return (guess_time / guesses * 1e9, hint_time / hints * 1e9,
+            score_time / rounds * 1e9)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Per-operation latency across number range sizes.")
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args(argv)
+    print(f"{'range':>6} {'guess ns':>10} {'hint ns':>10} {'score ns':>10}")
+    for name, number_range in RANGES:
+        guess_ns, hint_ns, score_ns = bench_range(number_range, args.rounds)
+        print(f"{name:>6} {guess_ns:10.0f} {hint_ns:10.0f} {score_ns:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
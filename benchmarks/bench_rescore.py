@@ -0,0 +1,53 @@
+import argparse
+import os
+import struct
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from round_history import (HEADER_FORMAT, MAGIC, RECORD_SIZE,  # noqa: E402
+                           ROUND_FIELDS, names_path, rescore_history)
+
+
+def write_history(path, rounds, players, seed=0):
+    # Synthetic history written as one array rather than round by round.
+    generator = np.random.default_rng(seed)
+    difficulties = ["easy", "medium", "hard"]
+    records = np.zeros(rounds, dtype=np.dtype(ROUND_FIELDS))
+    records["player"] = generator.integers(3, players + 3, size=rounds)
+    records["difficulty"] = generator.integers(0, 3, size=rounds)
+    records["duration"] = generator.integers(0, 600, size=rounds)
+    records["remaining"] = generator.integers(0, 10, size=rounds)
+    records["won"] = generator.random(rounds) < 0.6
+    with open(path, 'wb') as file:
+        file.write(struct.pack(HEADER_FORMAT, MAGIC, RECORD_SIZE, 0))
+        records.tofile(file)
+    with open(names_path(path), 'w', encoding='utf-8') as file:
+        file.write("\n".join(difficulties + [f"Player{index}" for index
+                                             in range(players)]) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time rescoring a round history and rebuilding the "
+                    "leaderboards.")
+    parser.add_argument("--rounds", type=int, default=10_000_000)
+    parser.add_argument("--players", type=int, default=100_000)
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "rounds.bin")
+        write_history(path, args.rounds, args.players)
+        started = time.perf_counter()
+        leaderboards = rescore_history(path)
+        elapsed = time.perf_counter() - started
+    wins = sum(map(len, leaderboards.values()))
+    print(f"{args.rounds:,} rounds ({wins:,} wins) rescored in "
+          f"{elapsed:.2f}s ({args.rounds / elapsed:,.0f} rounds/s)")
+
+
+if __name__ == "__main__":
+    main()
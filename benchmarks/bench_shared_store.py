@@ -0,0 +1,83 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from number_guessing_game import ScoreManager  # noqa: E402
+from shared_storage import SharedJsonScoreStorage  # noqa: E402
+from storage import JsonScoreStorage, scores_from_json  # noqa: E402
+
+DIFFICULTIES = ("easy", "medium", "hard")
+BACKENDS = {"shared": SharedJsonScoreStorage, "plain": JsonScoreStorage}
+
+
+def writer(backend, path, worker, saves, start):
+    # One game process: record a win, then save, `saves` times over.
+    rng = random.Random(worker)
+    score_manager = ScoreManager(BACKENDS[backend](path))
+    score_manager.load_score_history()
+    submitted = []
+    start.wait()
+    began = time.time()
+    for index in range(saves):
+        difficulty = DIFFICULTIES[index % 3]
+        score = rng.randint(0, 1500)
+        player_name = f"W{worker}-{index}"
+        score_manager.update_high_score(difficulty, score, player_name)
+        score_manager.save_score_history()
+        submitted.append((difficulty, player_name, score))
+    return submitted, began, time.time()
+
+
+def run(backend, workers, saves):
+    context = multiprocessing.get_context("fork")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "score_history.json")
+        start = context.Manager().Event()
+        with context.Pool(workers) as pool:
+            pending = [pool.apply_async(writer, (backend, path, worker, saves,
+                                                 start))
+                       for worker in range(workers)]
+            # Let every worker reach the start line first.
+            time.sleep(0.5)
+            start.set()
+            results = [result.get() for result in pending]
+        with open(path, 'r') as file:
+            stored = Counter(scores_from_json(json.load(file)))
+
+    elapsed = max(result[2] for result in results) - \
+        min(result[1] for result in results)
+    # Every submitted score has to be on disk; the order does not matter.
+    expected = Counter(entry for submitted, _, _ in results
+                       for entry in submitted)
+    lost = sum((expected - stored).values())
+    return workers * saves / elapsed, lost
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Hammer one score_history.json from many processes.")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=[1, 8, 32, 64])
+    parser.add_argument("--saves", type=int, default=200,
+                        help="saves per worker process")
+    parser.add_argument("--backend", choices=sorted(BACKENDS),
+                        default="shared")
+    args = parser.parse_args(argv)
+
+    for workers in args.workers:
+        throughput, lost = run(args.backend, workers, args.saves)
+        print(f"{args.backend:6} {workers:3} writers: "
+              f"{throughput:10,.0f} saves/s, "
+              f"{lost} lost score(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from number_guessing_game import GameSettings  # noqa: E402
+from snapshot import Snapshot, write_snapshot  # noqa: E402
+from storage import (JsonScoreStorage, scores_to_json,  # noqa: E402
+                     write_json_atomically)
+
+SCORES = [("easy", "Player1", 900), ("medium", "Player2", 1200),
+          ("hard", "Player3", 1500)]
+
+
+def profiles(count):
+    return {f"Player{index}": {
+        "name": f"Player{index}", "total_games_played": index % 500,
+        "total_wins": index % 250,
+        "best_scores": {"easy": index % 900, "hard": index % 1500}}
+        for index in range(count)}
+
+
+def json_start(directory, name):
+    # What the game does at startup with the JSON backend: parse the score
+    # file, then find the returning player in the parsed profiles.
+    storage = JsonScoreStorage(os.path.join(directory, "scores.json"),
+                               players_path=os.path.join(directory,
+                                                         "players.json"))
+    storage.load_scores()
+    return storage.load_player(name)
+
+
+def snapshot_start(directory, name):
+    with Snapshot(os.path.join(directory, "state.snap")) as snapshot:
+        snapshot.scores()
+        return snapshot.load_player(name)
+
+
+def measure(function, *args):
+    started = time.perf_counter()
+    function(*args)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    try:
+        function(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare loading game state from JSON and from a "
+                    "binary snapshot.")
+    parser.add_argument("--players", type=int, nargs="+",
+                        default=[1000, 100000])
+    args = parser.parse_args(argv)
+    for count in args.players:
+        players = profiles(count)
+        with tempfile.TemporaryDirectory() as directory:
+            write_json_atomically(os.path.join(directory, "scores.json"),
+                                  scores_to_json(SCORES))
+            write_json_atomically(os.path.join(directory, "players.json"),
+                                  players)
+            write_snapshot(os.path.join(directory, "state.snap"),
+                           SCORES, players.values(), GameSettings())
+            name = f"Player{count // 2}"
+            print(f"{count:,} players:")
+            for label, function in [("json", json_start),
+                                    ("snapshot", snapshot_start)]:
+                elapsed, peak = measure(function, directory, name)
+                print(f"  {label:<9} {elapsed * 1000:9.2f} ms "
+                      f"{peak / 1024:11,.0f} KiB peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from number_guessing_game import ScoreManager  # noqa: E402
+from score_journal import ScoreJournal  # noqa: E402
+from sqlite_storage import SqliteScoreStorage  # noqa: E402
+from storage import JsonScoreStorage  # noqa: E402
+
+
+def make_json(directory):
+    return JsonScoreStorage(os.path.join(directory, 'score_history.json'),
+                            ScoreJournal(os.path.join(directory,
+                                                      'score_history.log'),
+                                         batch_size=500))
+
+
+def make_sqlite(directory):
+    return SqliteScoreStorage(os.path.join(directory, 'scores.db'))
+
+
+BACKENDS = {"json": make_json, "sqlite": make_sqlite}
+
+
+def bench_backend(name, make_storage, scores, queries):
+    rng = random.Random(1)
+    events = [(rng.choice(["easy", "medium", "hard"]),
+               f"Player{rng.randrange(10000)}", rng.randint(0, 1500))
+              for _ in range(scores)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        storage = make_storage(directory)
+        score_manager = ScoreManager(storage)
+        start = time.perf_counter()
+        for difficulty, player_name, score in events:
+            score_manager.update_high_score(difficulty, score, player_name)
+        score_manager.save_score_history()
+        insert_time = time.perf_counter() - start
+        storage.close()
+
+        storage = make_storage(directory)
+        score_manager = ScoreManager(storage)
+        start = time.perf_counter()
+        score_manager.load_score_history()
+        load_time = time.perf_counter() - start
+
+        # SQLite answers top-K from its (difficulty, score) index; the JSON
+        # backend answers from the in-memory leaderboards after loading.
+        query = getattr(storage, "top_scores", score_manager.top_scores)
+        start = time.perf_counter()
+        for index in range(queries):
+            query(["easy", "medium", "hard"][index % 3], 10)
+        query_time = time.perf_counter() - start
+        storage.close()
+
+    print(f"{name:>6}: {scores / insert_time:12,.0f} inserts/s "
+          f"{load_time * 1000:9.1f} ms load "
+          f"{queries / query_time:12,.0f} top-10 queries/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare score storage backends.")
+    parser.add_argument("--scores", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=10000)
+    args = parser.parse_args(argv)
+    for name, make_storage in BACKENDS.items():
+        bench_backend(name, make_storage, args.scores, args.queries)
+
+
+if __name__ == "__main__":
+    main()
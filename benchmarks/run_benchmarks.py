@@ -0,0 +1,247 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import timeit
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+
+from cli_io import NullOutput, ScriptedInput  # noqa: E402
+from number_guessing_game import (CLI, GameManager,  # noqa: E402
+                                  GameRound, HintSystem, Player,
+                                  ScoreManager)
+from profile_store import ShardedProfileStore  # noqa: E402
+from score_journal import ScoreJournal  # noqa: E402
+from storage import JsonScoreStorage  # noqa: E402
+
+HISTORY_SIZES = [10, 10 ** 4, 10 ** 6]
+BENCHMARKS = {}
+
+
+def benchmark(name, number):
+    # Registers setup(directory) -> callable; the callable is timed
+    # `number` times per repeat and the best repeat wins. setup may instead
+    # return (prepare, callable): prepare runs untimed before each repeat.
+    def register(setup):
+        BENCHMARKS[name] = (setup, number)
+        return setup
+    return register
+
+
+def make_round():
+    game_round = GameRound("medium", (1, 100), 7, 2, rng=random.Random(1))
+    game_round.generate_target_number()
+    return game_round
+
+
+@benchmark("game_round.process_guess", 200000)
+def bench_process_guess(directory):
+    game_round = make_round()
+    game_round.remaining_attempts = 10 ** 9
+
+    def run():
+        game_round.process_guess(50)
+    return run
+
+
+@benchmark("game_round.calculate_score", 200000)
+def bench_calculate_score(directory):
+    game_round = make_round()
+    game_round.end_time = game_round.start_time + 12
+
+    def run():
+        game_round.calculate_score(2)
+    return run
+
+
+@benchmark("hint_system.generate_hint", 100000)
+def bench_generate_hint(directory):
+    rng = random.Random(2)
+
+    def run():
+        HintSystem.generate_hint(60, rng, (1, 100))
+    return run
+
+
+def filled_score_manager(directory, entries, copy=0):
+    rng = random.Random(3)
+    storage = JsonScoreStorage(
+        os.path.join(directory, f"scores_{entries}_{copy}.json"),
+        ScoreJournal(os.path.join(directory, f"scores_{entries}_{copy}.log"),
+                     batch_size=10000, compact_every=entries + 1))
+    score_manager = ScoreManager(storage)
+    for index in range(entries):
+        score_manager.update_high_score(
+            ("easy", "medium", "hard")[index % 3], rng.randint(0, 1500),
+            f"Player{index % 1000}")
+    return score_manager
+
+
+def register_history_benchmarks(entries):
+    number = max(1, 2000 // entries)
+
+    @benchmark(f"score_manager.save_score_history[{entries}]", number)
+    def bench_save(directory):
+        # A save folds the journal away, so every timed call gets its own
+        # freshly filled manager instead of saving an emptied one again.
+        managers = []
+
+        def prepare():
+            managers[:] = [filled_score_manager(directory, entries, copy)
+                           for copy in range(number)]
+
+        def run():
+            managers.pop().save_score_history()
+        return prepare, run
+
+    @benchmark(f"score_manager.load_score_history[{entries}]", number)
+    def bench_load(directory):
+        filled = filled_score_manager(directory, entries).storage
+        # Leave the events in the journal so loading has to replay them.
+        filled.journal.flush()
+
+        def run():
+            # A fresh manager per call, so loads do not pile up scores.
+            storage = JsonScoreStorage(filled.path, ScoreJournal(
+                filled.journal.path, compact_every=entries + 1))
+            ScoreManager(storage).load_score_history()
+        return run
+
+
+for size in HISTORY_SIZES:
+    register_history_benchmarks(size)
+
+
+@benchmark("game_manager.handle_game_round", 2000)
+def bench_handle_game_round(directory):
+    script = ["easy", "hint"] + [str(guess) for guess in range(10, 101, 10)]
+    cli = CLI.using(output=NullOutput())
+    game_manager = GameManager(ScoreManager(JsonScoreStorage(
+        os.path.join(directory, "rounds.json"))), cli=cli)
+    game_manager.current_player = Player("Bench")
+
+    def run():
+        random.seed(4)
+        cli.input_driver = ScriptedInput(script)
+        game_manager.handle_game_round()
+    return run
+
+
+@benchmark("profile_store.load_player", 20000)
+def bench_profile_lookup(directory):
+    # Cold lookups: the cache is off, so every call reads its shard.
+    store = ShardedProfileStore(os.path.join(directory, "profiles"),
+                                cache_size=0)
+    names = [f"Player{index}" for index in range(10 ** 4)]
+    for name in names:
+        store.save_player({"name": name, "total_games_played": 1,
+                           "total_wins": 1, "best_scores": {"easy": 100}})
+    state = {"index": 0}
+
+    def run():
+        state["index"] = (state["index"] + 7919) % len(names)
+        store.load_player(names[state["index"]])
+    return run
+
+
+@benchmark("startup.import", 10)
+def bench_startup_import(directory):
+    command = [sys.executable, "-c", "import number_guessing_game"]
+    env = dict(os.environ, PYTHONPATH=SRC)
+
+    def run():
+        subprocess.run(command, env=env, check=True)
+    return run
+
+
+@benchmark("startup.first_prompt", 10)
+def bench_startup_first_prompt(directory):
+    # Cold start up to the name prompt: stdin is empty, so the game exits
+    # as soon as it asks for a name.
+    command = [sys.executable, os.path.join(SRC, "number_guessing_game.py")]
+    score_manager = filled_score_manager(directory, 10 ** 4)
+    score_manager.save_score_history()
+    score_manager.close()
+    os.replace(score_manager.storage.path,
+               os.path.join(directory, "score_history.json"))
+
+    def run():
+        subprocess.run(command, cwd=directory, stdin=subprocess.DEVNULL,
+                       stdout=subprocess.DEVNULL, check=True)
+    return run
+
+
+def run_benchmarks(selected=None, repeat=5, max_entries=None):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (setup, number) in BENCHMARKS.items():
+            if selected and not any(part in name for part in selected):
+                continue
+            if max_entries is not None and "[" in name and \
+               int(name.split("[")[1].rstrip("]")) > max_entries:
+                continue
+            run = setup(directory)
+            prepare = "pass"
+            if isinstance(run, tuple):
+                prepare, run = run
+            best = min(timeit.Timer(run, prepare).repeat(repeat, number))
+            results[name] = best / number * 1e9
+            print(f"{name:48} {results[name]:14,.0f} ns/op")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, baseline_ns in sorted(baseline["metrics"].items()):
+        if name not in results:
+            print(f"missing: {name}")
+            continue
+        ratio = results[name] / baseline_ns
+        status = "ok"
+        if ratio > 1 + tolerance:
+            status = "REGRESSION"
+            regressions.append(name)
+        print(f"{name:48} {ratio:6.2f}x baseline  {status}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time the game's hot paths offline.")
+    parser.add_argument("--save", metavar="FILE",
+                        help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE",
+                        help="fail if a metric regressed against a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true",
+                        help="skip the 10^6 entry history benchmarks")
+    parser.add_argument("names", nargs="*",
+                        help="only run benchmarks whose name contains these")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.names, args.repeat,
+                             10 ** 4 if args.quick else None)
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({"python": platform.python_version(),
+                       "metrics": results}, file, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare, 'r') as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than "
+                  f"{args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
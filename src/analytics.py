@@ -0,0 +1,195 @@
+import argparse
+import math
+
+from event_log import GUESS, HINT, LOSS, ROUND_START, WIN, EventLogReader
+from metrics import LatencyHistogram
+from number_guessing_game import DIFFICULTY_NAMES, GameSettings
+
+# Every stage is a generator or an online aggregator, so a report over any
+# amount of history holds one round per open session plus a few fixed-size
+# accumulators in memory.
+
+
+class RoundSummary:
+    def __init__(self, session_id, difficulty, started_at, duration, won,
+                 guesses, hints):
+        self.session_id = session_id
+        self.difficulty = difficulty
+        self.started_at = started_at
+        self.duration = duration
+        self.won = won
+        self.guesses = guesses
+        self.hints = hints
+
+
+def rounds_from_event_log(events, game_settings=None):
+    # Rebuilds rounds from (session_id, timestamp, value, remaining, event)
+    # records. A round runs from its ROUND_START to its win or loss; a new
+    # start in the same session drops an abandoned round, so at most one
+    # round per session is ever open. Logs written before ROUND_START
+    # existed open a round at its first guess or hint and recognise the
+    # difficulty from its attempt count.
+    game_settings = game_settings or GameSettings()
+    difficulties = {attempts: difficulty for difficulty, attempts
+                    in game_settings.difficulty_levels.items()}
+    open_rounds = {}
+    for session_id, timestamp, value, remaining, event in events:
+        if event == ROUND_START:
+            # Codes are only stable for the built-in difficulties.
+            difficulty = (DIFFICULTY_NAMES[value]
+                          if value < len(DIFFICULTY_NAMES) else
+                          difficulties.get(remaining, "unknown"))
+            open_rounds[session_id] = [difficulty, timestamp, 0, 0]
+            continue
+        state = open_rounds.get(session_id)
+        if state is None:
+            attempts = remaining + 1 if event == GUESS else remaining
+            state = open_rounds[session_id] = [
+                difficulties.get(attempts, "unknown"), timestamp, 0, 0]
+        if event == GUESS:
+            state[2] += 1
+        elif event == HINT:
+            state[3] += 1
+        elif event == WIN or event == LOSS:
+            del open_rounds[session_id]
+            difficulty, started_at, guesses, hints = state
+            yield RoundSummary(session_id, difficulty, started_at,
+                               timestamp - started_at, event == WIN,
+                               guesses, hints)
+
+
+def read_rounds(path, game_settings=None):
+    with EventLogReader(path) as reader:
+        yield from rounds_from_event_log(reader, game_settings)
+
+
+def filter_rounds(rounds, difficulty=None, since=None, until=None):
+    # `since` and `until` are timestamps in nanoseconds since the epoch.
+    for summary in rounds:
+        if difficulty is not None and summary.difficulty != difficulty:
+            continue
+        if since is not None and summary.started_at < since:
+            continue
+        if until is not None and summary.started_at >= until:
+            continue
+        yield summary
+
+
+class RunningStats:
+    # Welford's online mean and variance.
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+
+class DifficultyAnalytics:
+    def __init__(self):
+        self.rounds = 0
+        self.wins = 0
+        self.rounds_with_hints = 0
+        self.hints = RunningStats()
+        self.duration = RunningStats()
+        # Durations in nanoseconds; the histogram keeps percentiles within
+        # 1/16 relative error in a few hundred buckets.
+        self.duration_histogram = LatencyHistogram()
+        self.guesses_to_win = {}
+
+    def add(self, summary):
+        self.rounds += 1
+        self.hints.add(summary.hints)
+        if summary.hints:
+            self.rounds_with_hints += 1
+        self.duration.add(summary.duration)
+        self.duration_histogram.record(summary.duration)
+        if summary.won:
+            self.wins += 1
+            self.guesses_to_win[summary.guesses] = \
+                self.guesses_to_win.get(summary.guesses, 0) + 1
+
+    @property
+    def win_rate(self):
+        return self.wins / self.rounds if self.rounds else 0.0
+
+    def as_dict(self, quantiles=(0.5, 0.9, 0.99)):
+        return {
+            "rounds": self.rounds,
+            "wins": self.wins,
+            "win_rate": self.win_rate,
+            "mean_duration_seconds": self.duration.mean / 1e9,
+            "stddev_duration_seconds": self.duration.stddev / 1e9,
+            "duration_percentiles_seconds": {
+                quantile: self.duration_histogram.percentile(quantile) / 1e9
+                for quantile in quantiles
+            },
+            "guesses_to_win": dict(sorted(self.guesses_to_win.items())),
+            "mean_hints": self.hints.mean,
+            "hint_usage_rate": (self.rounds_with_hints / self.rounds
+                                if self.rounds else 0.0),
+        }
+
+
+def analyze(rounds):
+    report = {}
+    for summary in rounds:
+        stats = report.get(summary.difficulty)
+        if stats is None:
+            stats = report[summary.difficulty] = DifficultyAnalytics()
+        stats.add(summary)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Summarise rounds recorded in an event log.")
+    parser.add_argument("path", help="event log written via GAME_EVENT_LOG")
+    parser.add_argument("--difficulty")
+    parser.add_argument("--since", type=float, metavar="EPOCH_SECONDS")
+    parser.add_argument("--until", type=float, metavar="EPOCH_SECONDS")
+    args = parser.parse_args(argv)
+
+    since = int(args.since * 1e9) if args.since is not None else None
+    until = int(args.until * 1e9) if args.until is not None else None
+    report = analyze(filter_rounds(read_rounds(args.path), args.difficulty,
+                                   since, until))
+    for difficulty, stats in report.items():
+        summary = stats.as_dict()
+        percentiles = ", ".join(
+            f"p{quantile * 100:g} {seconds:.1f}s" for quantile, seconds
+            in summary["duration_percentiles_seconds"].items())
+        guesses = ", ".join(f"{guesses}: {count}" for guesses, count
+                            in summary["guesses_to_win"].items())
+        print(f"{difficulty.capitalize()}: {stats.wins}/{stats.rounds} wins "
+              f"({stats.win_rate * 100:.1f}%), "
+              f"mean duration {summary['mean_duration_seconds']:.1f}s "
+              f"({percentiles})")
+        print(f"  guesses to win: {guesses or 'none'}")
+        print(f"  hints: {summary['mean_hints']:.2f} per round, used in "
+              f"{summary['hint_usage_rate'] * 100:.1f}% of rounds")
+
+
+if __name__ == "__main__":
+    main()
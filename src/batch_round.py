@@ -0,0 +1,102 @@
+import numpy as np
+
+from number_guessing_game import (CORRECT, GREATER, LESS,  # noqa: F401
+                                  RESULT_CODES, RESULT_NAMES)
+from simulation import DifficultyStats
+
+
+# Returned for rounds that were already over when the guess was applied.
+INACTIVE = -1
+INT64 = np.iinfo(np.int64)
+
+
+def check_number_range(number_range):
+    # Targets, guesses and the search bounds are int64 arrays, and the
+    # binary search steps by high - low, so all of it has to fit.
+    low, high = number_range
+    if low < INT64.min or high > INT64.max or high - low > INT64.max:
+        raise ValueError(
+            f"Number range {low}..{high} does not fit the batch simulator: "
+            f"both ends and their distance must be at most {INT64.max}")
+
+
+class BatchRound:
+    # Array-backed equivalent of N GameRound objects sharing one difficulty.
+    def __init__(self, difficulty_level, number_range, attempts, targets):
+        check_number_range(number_range)
+        self.difficulty_level = difficulty_level
+        self.number_range = number_range
+        self.target_numbers = np.asarray(targets, dtype=np.int64)
+        size = len(self.target_numbers)
+        self.remaining_attempts = np.full(size, attempts, dtype=np.int32)
+        self.is_won = np.zeros(size, dtype=bool)
+
+    @classmethod
+    def random(cls, difficulty_level, number_range, attempts, size,
+               seed=None):
+        check_number_range(number_range)
+        generator = np.random.default_rng(seed)
+        targets = generator.integers(number_range[0], number_range[1],
+                                     size=size, endpoint=True)
+        return cls(difficulty_level, number_range, attempts, targets)
+
+    @classmethod
+    def from_rng(cls, difficulty_level, number_range, attempts, size, rng):
+        # Draws targets exactly like GameRound.generate_target_number does
+        # with the same rng, so a batch can be checked against scalar rounds.
+        targets = [rng.randint(*number_range) for _ in range(size)]
+        return cls(difficulty_level, number_range, attempts, targets)
+
+    def __len__(self):
+        return len(self.target_numbers)
+
+    def check_game_over(self):
+        return (self.remaining_attempts <= 0) | self.is_won
+
+    def process_guesses(self, guesses):
+        guesses = np.asarray(guesses, dtype=np.int64)
+        active = ~self.check_game_over()
+        results = np.where(guesses < self.target_numbers, GREATER, LESS)
+        correct = guesses == self.target_numbers
+        results[correct] = CORRECT
+        results[~active] = INACTIVE
+
+        self.remaining_attempts -= active
+        self.is_won |= correct & active
+        return results.astype(np.int8)
+
+    def calculate_scores(self, multiplier, durations=0):
+        scores = (self.remaining_attempts.astype(np.int64) * multiplier * 100
+                  - np.asarray(durations, dtype=np.int64))
+        return np.maximum(scores, 0)
+
+
+def play_binary_search(batch):
+    low = np.full(len(batch), batch.number_range[0], dtype=np.int64)
+    high = np.full(len(batch), batch.number_range[1], dtype=np.int64)
+    while not batch.check_game_over().all():
+        # low + high would overflow for ranges near the int64 limit.
+        guesses = low + (high - low) // 2
+        results = batch.process_guesses(guesses)
+        low = np.where(results == GREATER, guesses + 1, low)
+        high = np.where(results == LESS, guesses - 1, high)
+    return batch
+
+
+def simulate_binary_search(game_settings, difficulty, size, seed=None):
+    attempts = game_settings.get_attempts(difficulty)
+    batch = BatchRound.random(difficulty, game_settings.number_range,
+                              attempts, size, seed)
+    play_binary_search(batch)
+    scores = batch.calculate_scores(
+        game_settings.get_score_multiplier(difficulty))
+
+    stats = DifficultyStats()
+    won_scores = scores[batch.is_won]
+    stats.rounds = len(batch)
+    stats.wins = int(batch.is_won.sum())
+    stats.attempts_used = int(
+        (attempts - batch.remaining_attempts.astype(np.int64)).sum())
+    stats.total_score = int(won_scores.sum())
+    stats.best_score = int(won_scores.max()) if len(won_scores) else 0
+    return stats
@@ -0,0 +1,188 @@
+import math
+from operator import add
+
+from number_guessing_game import digit_sum
+
+# The numbers still consistent with a round's guesses and hints are
+#   low <= n <= high,  n = residue (mod modulus),  digit_sum(n) = digits
+# where the congruence collects divisibility and parity hints (modulus
+# always divides 2520). Without a digit sum, counting and sampling are plain
+# arithmetic; with one they walk the decimal digits of the bounds against
+# precomputed suffix tables, so every query costs O(digits) whatever the
+# size of the range.
+
+# suffix_tables(m)[L][t][v]: strings of L decimal digits (leading zeros
+# allowed) with digit sum t whose value is v modulo m.
+_SUFFIX_TABLES = {}
+
+
+def suffix_tables(modulus, length):
+    tables = _SUFFIX_TABLES.setdefault(modulus, [[[1] + [0] * (modulus - 1)]])
+    while len(tables) <= length:
+        size = len(tables)
+        previous = tables[-1]
+        # Prepending digit d shifts a suffix's value by d * 10^(L-1).
+        place = pow(10, size - 1, modulus)
+        table = [[0] * modulus for _ in range(9 * size + 1)]
+        for d in range(10):
+            shift = d * place % modulus
+            for t, row in enumerate(previous):
+                if shift:
+                    row = row[-shift:] + row[:-shift]
+                target = table[t + d]
+                target[:] = map(add, target, row)
+        tables.append(table)
+    return tables
+
+
+def strip_threes(modulus):
+    while modulus % 3 == 0:
+        modulus //= 3
+    return modulus
+
+
+class CandidateTracker:
+    def __init__(self, number_range):
+        self.low, self.high = number_range
+        self.modulus = 1
+        self.residue = 0
+        self.digits = None
+        self.wasted_guesses = 0
+        self.count = self._count()
+        self.initial_count = self.count
+
+    def __contains__(self, n):
+        return (self.low <= n <= self.high and
+                n % self.modulus == self.residue and
+                (self.digits is None or digit_sum(n) == self.digits))
+
+    @property
+    def information_bits(self):
+        # How much the guesses and hints so far have narrowed things down.
+        if not self.count:
+            return math.inf
+        return math.log2(self.initial_count / self.count)
+
+    def apply_guess(self, guess, result):
+        if guess not in self:
+            # It could not have been the target; nothing was learned.
+            self.wasted_guesses += 1
+        if result == "correct":
+            self.low = self.high = guess
+        elif result == "greater":
+            self.low = max(self.low, guess + 1)
+        elif result == "less":
+            self.high = min(self.high, guess - 1)
+        self.count = self._count()
+
+    def apply_hint(self, hint_type, value):
+        if hint_type == "divisor":
+            self._add_congruence(value, 0)
+        elif hint_type == "parity":
+            self._add_congruence(2, value)
+        elif hint_type == "digit_sum":
+            if self.digits is not None and self.digits != value:
+                self.high = self.low - 1
+            self.digits = value
+        else:
+            raise ValueError(f"Unknown hint type: {hint_type}")
+        self.count = self._count()
+
+    def _add_congruence(self, modulus, residue):
+        combined = self.modulus * modulus // math.gcd(self.modulus, modulus)
+        for candidate in range(self.residue, combined, self.modulus):
+            if candidate % modulus == residue:
+                self.modulus, self.residue = combined, candidate
+                return
+        # Contradictory facts: nothing is left.
+        self.high = self.low - 1
+
+    def _first(self):
+        return self.low + (self.residue - self.low) % self.modulus
+
+    def _digit_constraint(self):
+        # n = digit sum (mod 9), so the powers of three in the modulus are
+        # implied by the digit sum and can be dropped from the digit walk.
+        threes = self.modulus // strip_threes(self.modulus)
+        if self.residue % threes != self.digits % threes:
+            return None
+        modulus = strip_threes(self.modulus)
+        return modulus, self.residue % modulus
+
+    def _count(self):
+        if self.high < self.low:
+            return 0
+        if self.digits is None:
+            first = self._first()
+            return (self.high - first) // self.modulus + 1 \
+                if first <= self.high else 0
+        constraint = self._digit_constraint()
+        if constraint is None:
+            return 0
+        return (self._count_upto(self.high, *constraint) -
+                self._count_upto(self.low - 1, *constraint))
+
+    def _count_upto(self, bound, modulus, residue):
+        # Candidates in [0, bound] with the digit sum and congruence.
+        if bound < 0:
+            return 0
+        digits = list(map(int, str(bound)))
+        tables = suffix_tables(modulus, len(digits))
+        total = 0
+        prefix_sum = 0
+        prefix_value = 0
+        for position, digit in enumerate(digits):
+            length = len(digits) - position - 1
+            place = pow(10, length, modulus)
+            table = tables[length]
+            for d in range(digit):
+                remaining = self.digits - prefix_sum - d
+                if 0 <= remaining < len(table):
+                    value = (prefix_value * 10 + d) * place
+                    total += table[remaining][(residue - value) % modulus]
+            prefix_sum += digit
+            prefix_value = (prefix_value * 10 + digit) % modulus
+            if prefix_sum > self.digits:
+                return total
+        if prefix_sum == self.digits and prefix_value == residue:
+            total += 1
+        return total
+
+    def random_candidate(self, rng):
+        if not self.count:
+            return None
+        return self.candidate_at(rng.randrange(self.count))
+
+    def candidate_at(self, index):
+        # The index-th (from 0) remaining candidate in increasing order.
+        if not 0 <= index < self.count:
+            raise IndexError("candidate index out of range")
+        if self.digits is None:
+            return self._first() + index * self.modulus
+        modulus, residue = self._digit_constraint()
+        return self._select(
+            index + self._count_upto(self.low - 1, modulus, residue),
+            modulus, residue)
+
+    def _select(self, index, modulus, residue):
+        # The index-th (from 0) candidate in [0, high], digit by digit.
+        width = len(str(self.high))
+        tables = suffix_tables(modulus, width)
+        number = 0
+        prefix_sum = 0
+        for position in range(width):
+            length = width - position - 1
+            place = pow(10, length, modulus)
+            table = tables[length]
+            for d in range(10):
+                remaining = self.digits - prefix_sum - d
+                count = 0
+                if 0 <= remaining < len(table):
+                    value = (number * 10 + d) * place
+                    count = table[remaining][(residue - value) % modulus]
+                if index < count:
+                    break
+                index -= count
+            number = number * 10 + d
+            prefix_sum += d
+        return number
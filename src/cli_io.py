@@ -0,0 +1,67 @@
+class TerminalInput:
+    def read(self, prompt):
+        return input(prompt)
+
+
+def split_seed_header(lines):
+    # A transcript may open with a "# seed: N" line pinning the target
+    # numbers. Every other line is an answer, even one starting with "#".
+    if lines and lines[0].startswith("#"):
+        key, _, value = lines[0][1:].partition(":")
+        if key.strip() == "seed":
+            return int(value), lines[1:]
+    return None, lines
+
+
+class ScriptedInput:
+    # Feeds recorded answers in order. Running out raises EOFError, the
+    # same as input() at the end of stdin.
+    def __init__(self, lines):
+        self.lines = iter(lines)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r') as file:
+            _, lines = split_seed_header(
+                [line.rstrip("\n") for line in file])
+        return cls(lines)
+
+    def read(self, prompt):
+        try:
+            return next(self.lines)
+        except StopIteration:
+            raise EOFError("Transcript ended") from None
+
+
+class RecordingInput:
+    # Wraps another input driver and appends every answer to a transcript.
+    def __init__(self, inner, file):
+        self.inner = inner
+        self.file = file
+
+    def read(self, prompt):
+        line = self.inner.read(prompt)
+        self.file.write(line + "\n")
+        self.file.flush()
+        return line
+
+
+class TerminalOutput:
+    def write(self, text):
+        print(text)
+
+
+class BufferedOutput:
+    def __init__(self):
+        self.parts = []
+
+    def write(self, text):
+        self.parts.append(text)
+
+    def getvalue(self):
+        return "".join(part + "\n" for part in self.parts)
+
+
+class NullOutput:
+    def write(self, text):
+        pass
@@ -0,0 +1,13 @@
+class VirtualClock:
+    # Drop-in for time.perf_counter_ns whose time only moves when advanced,
+    # so timed scoring can be simulated without waiting.
+    def __init__(self, start_ns=0):
+        self.now_ns = start_ns
+
+    def __call__(self):
+        return self.now_ns
+
+    def advance(self, seconds):
+        if seconds < 0:
+            raise ValueError("Time cannot go backwards")
+        self.now_ns += round(seconds * 1_000_000_000)
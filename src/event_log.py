@@ -0,0 +1,131 @@
+import mmap
+import os
+import struct
+import time
+
+# Every event is one fixed-size little-endian record:
+#   session_id u64 | timestamp_ns i64 | value u64 | remaining u32 | type u8
+# padded to 32 bytes, so the n-th event always starts at a known offset and
+# a whole file can be viewed as an array without parsing anything. A round
+# opens with ROUND_START, whose value is the difficulty code and remaining
+# the attempts allowed.
+RECORD_FORMAT = "<QqQIB3x"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+HEADER_FORMAT = "<8sII"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+MAGIC = b"NGEVLOG1"
+
+GUESS = 1
+HINT = 2
+WIN = 3
+LOSS = 4
+ROUND_START = 5
+EVENT_NAMES = {GUESS: "guess", HINT: "hint", WIN: "win", LOSS: "loss",
+               ROUND_START: "round_start"}
+
+# The same layout as a NumPy structured dtype, for as_array().
+EVENT_FIELDS = [("session_id", "<u8"), ("timestamp", "<i8"),
+                ("value", "<u8"), ("remaining", "<u4"), ("event", "u1"),
+                ("padding", "V3")]
+
+
+def new_session_id():
+    return int.from_bytes(os.urandom(8), "little") >> 1
+
+
+class EventLog:
+    # Appends events to a preallocated buffer and writes it out in one call
+    # per `buffer_records` events.
+    def __init__(self, path, buffer_records=4096):
+        self.path = path
+        self.buffer_records = buffer_records
+        self.buffer = bytearray(buffer_records * RECORD_SIZE)
+        self.pending = 0
+        self.file = None
+
+    def _open(self):
+        self.file = open(self.path, 'ab')
+        size = self.file.tell()
+        if size == 0:
+            self.file.write(struct.pack(HEADER_FORMAT, MAGIC, RECORD_SIZE, 0))
+            return
+        with open(self.path, 'rb') as file:
+            magic, record_size, _ = struct.unpack(
+                HEADER_FORMAT, file.read(HEADER_SIZE))
+        if magic != MAGIC or record_size != RECORD_SIZE:
+            self.file.close()
+            self.file = None
+            raise ValueError(f"{self.path} is not an event log")
+        # Drop a torn record left by a crash so appends stay aligned.
+        extra = (size - HEADER_SIZE) % RECORD_SIZE
+        if extra:
+            self.file.truncate(size - extra)
+            self.file.seek(0, os.SEEK_END)
+
+    def record(self, session_id, event, value, remaining):
+        struct.pack_into(RECORD_FORMAT, self.buffer,
+                         self.pending * RECORD_SIZE, session_id,
+                         time.time_ns(), value, remaining, event)
+        self.pending += 1
+        if self.pending == self.buffer_records:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        if self.file is None:
+            self._open()
+        with memoryview(self.buffer) as view:
+            self.file.write(view[:self.pending * RECORD_SIZE])
+        self.file.flush()
+        self.pending = 0
+
+    def close(self):
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class EventLogReader:
+    # Maps the file read-only; iteration and as_array() read straight from
+    # the mapping instead of copying it.
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, record_size, _ = struct.unpack_from(HEADER_FORMAT, self.mmap)
+        if magic != MAGIC or record_size != RECORD_SIZE:
+            self.mmap.close()
+            raise ValueError(f"{path} is not an event log")
+        self.count = (len(self.mmap) - HEADER_SIZE) // RECORD_SIZE
+        self.view = memoryview(self.mmap)[
+            HEADER_SIZE:HEADER_SIZE + self.count * RECORD_SIZE]
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        # (session_id, timestamp_ns, value, remaining, event) tuples.
+        return struct.iter_unpack(RECORD_FORMAT, self.view)
+
+    def __getitem__(self, index):
+        if not -self.count <= index < self.count:
+            raise IndexError("event index out of range")
+        return struct.unpack_from(RECORD_FORMAT, self.view,
+                                  (index % self.count) * RECORD_SIZE)
+
+    def as_array(self):
+        # The array borrows the mapping: drop it before calling close().
+        import numpy as np
+
+        return np.frombuffer(self.view, dtype=np.dtype(EVENT_FIELDS))
+
+    def close(self):
+        self.view.release()
+        self.mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,145 @@
+import math
+from bisect import bisect_left, bisect_right, insort
+from numbers import Real
+
+
+def check_score(score):
+    # Any finite real number is a score; bool is an int but never a score.
+    if isinstance(score, bool) or not isinstance(score, Real):
+        raise TypeError(f"Score must be a number, not {type(score).__name__}")
+    if not math.isfinite(score):
+        raise ValueError(f"Score must be finite, not {score}")
+
+
+class Leaderboard:
+    # Every recorded score for one difficulty. Scores are compressed to
+    # their position among the distinct values recorded, and the counts per
+    # position live in a Fenwick tree, so memory follows the number of
+    # distinct scores rather than their size. Inserts of a known score,
+    # rank queries and seeking to an offset are O(log distinct scores); a
+    # new score shifts the positions, so the tree is rebuilt before the
+    # next query.
+    def __init__(self):
+        # Distinct recorded scores, ascending.
+        self.values = []
+        self.tree = [0]
+        self.stale = False
+        self.entries = {}
+        self.best_scores = {}
+        self.size = 0
+
+    @classmethod
+    def from_entries(cls, entries, best_scores):
+        # Bulk load: `entries` maps each score to its players in insertion
+        # order and `best_scores` each player to their best, as add() would
+        # have left them, so the tree is built once instead of per score.
+        leaderboard = cls()
+        leaderboard.entries = entries
+        leaderboard.values = sorted(entries)
+        leaderboard.best_scores = best_scores
+        leaderboard.size = sum(map(len, entries.values()))
+        leaderboard._build_tree()
+        return leaderboard
+
+    def __len__(self):
+        return self.size
+
+    def items(self):
+        # Every (player_name, score), lowest score first and equal scores
+        # in the order they were added, so adding them back in this order
+        # rebuilds the same leaderboard.
+        for score in self.values:
+            for player_name in self.entries[score]:
+                yield player_name, score
+
+    def add(self, player_name, score):
+        check_score(score)
+        players = self.entries.get(score)
+        if players is None:
+            self.entries[score] = [player_name]
+            insort(self.values, score)
+            self.stale = True
+        else:
+            players.append(player_name)
+            if not self.stale:
+                self._update(bisect_left(self.values, score), 1)
+        self.size += 1
+        best = self.best_scores.get(player_name)
+        if best is None or best < score:
+            self.best_scores[player_name] = score
+
+    def count_above(self, score):
+        # How many recorded scores beat the given score.
+        return self.size - self._count_upto(bisect_right(self.values, score))
+
+    def rank_of_score(self, score):
+        return self.count_above(score) + 1
+
+    def rank(self, player_name):
+        if player_name not in self.best_scores:
+            return None
+        return self.rank_of_score(self.best_scores[player_name])
+
+    def top(self, limit=10, offset=0):
+        if offset < 0 or limit <= 0 or offset >= self.size:
+            return []
+        # Descending position `offset` is ascending position size-1-offset.
+        position = self.size - 1 - offset
+        value = self._find(position)
+        below = self._count_upto(value)
+        # Equal scores are listed oldest first, like the old high score.
+        index = len(self.entries[self.values[value]]) - 1 - (position - below)
+
+        results = []
+        while len(results) < limit:
+            score = self.values[value]
+            players = self.entries[score]
+            for player_name in players[index:index + limit - len(results)]:
+                results.append((player_name, score))
+            if value == 0 or len(results) == limit:
+                break
+            value -= 1
+            index = 0
+        return results
+
+    def _update(self, value, delta):
+        index = value + 1
+        while index < len(self.tree):
+            self.tree[index] += delta
+            index += index & -index
+
+    def _count_upto(self, values):
+        # How many scores the lowest `values` distinct values hold.
+        if self.stale:
+            self._build_tree()
+        index = values
+        total = 0
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+        return total
+
+    def _find(self, position):
+        # Index into `values` of the score at ascending `position`.
+        if self.stale:
+            self._build_tree()
+        index = 0
+        step = 1 << (len(self.values).bit_length() - 1)
+        while step:
+            following = index + step
+            if following < len(self.tree) and \
+               self.tree[following] <= position:
+                index = following
+                position -= self.tree[following]
+            step //= 2
+        return index
+
+    def _build_tree(self):
+        size = len(self.values)
+        self.tree = [0] + [len(self.entries[value]) for value in self.values]
+        # Linear-time Fenwick build from the raw counts.
+        for index in range(1, size + 1):
+            parent = index + (index & -index)
+            if parent <= size:
+                self.tree[parent] += self.tree[index]
+        self.stale = False
@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+
+# Values below 2 * SUB_BUCKETS nanoseconds get exact buckets; above that,
+# every power of two is split into SUB_BUCKETS linear buckets, which keeps
+# the relative error under 1 / SUB_BUCKETS at any magnitude.
+SUB_BUCKETS = 16
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+def bucket_index(value):
+    if value < 2 * SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - 5
+    return (shift + 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
+
+
+def bucket_upper_bound(index):
+    if index < 2 * SUB_BUCKETS:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    mantissa = index % SUB_BUCKETS + SUB_BUCKETS
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, nanoseconds):
+        nanoseconds = max(0, nanoseconds)
+        index = bucket_index(nanoseconds)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += nanoseconds
+        if nanoseconds > self.max:
+            self.max = nanoseconds
+
+    def percentile(self, quantile):
+        if not self.count:
+            return 0
+        threshold = quantile * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if bucket_count and seen >= threshold:
+                return min(bucket_upper_bound(index), self.max)
+        return self.max
+
+
+class Metrics:
+    enabled = True
+
+    def __init__(self, prefix="number_guessing"):
+        self.prefix = prefix
+        self.counters = {}
+        self.histograms = {}
+
+    def increment(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def start(self):
+        return time.perf_counter_ns()
+
+    def stop(self, name, started):
+        elapsed = time.perf_counter_ns() - started
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.record(elapsed)
+
+    def to_prometheus(self):
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            metric = f"{self.prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        for name, histogram in sorted(self.histograms.items()):
+            metric = f"{self.prefix}_{name}_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for quantile in QUANTILES:
+                seconds = histogram.percentile(quantile) / 1e9
+                lines.append(
+                    f'{metric}{{quantile="{quantile}"}} {seconds:.9f}')
+            lines.append(f"{metric}_sum {histogram.total / 1e9:.9f}")
+            lines.append(f"{metric}_count {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w') as file:
+            file.write(self.to_prometheus())
+        os.replace(temp_path, path)
+
+    def serve(self, port=9100, host="127.0.0.1"):
+        # Imported here so the game does not pay for http.server at startup.
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type",
+                                 "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        return server
+
+
+class NullMetrics:
+    # Stand-in used when instrumentation is off: every call is a no-op.
+    enabled = False
+
+    def increment(self, name, amount=1):
+        pass
+
+    def start(self):
+        return 0
+
+    def stop(self, name, started):
+        pass
+
+
+NULL_METRICS = NullMetrics()
@@ -1,33 +1,67 @@
 # Autor: Adam Szczotka
 # Title: Number guessing game
 
+import os
 import time
 import random
-import json
+import threading
+from array import array
+from functools import lru_cache
+
+from cli_io import RecordingInput, TerminalInput, TerminalOutput
+from event_log import (GUESS, HINT, LOSS, ROUND_START, WIN, EventLog,
+                       new_session_id)
+from leaderboard import Leaderboard
+from metrics import NULL_METRICS, Metrics
+from score_journal import ScoreJournal
+from storage import JsonScoreStorage
+from write_behind import WriteBehindStorage
+
+# Custom ranges may go up to 2^63; every per-guess operation stays O(1) or
+# O(log n) in the size of the numbers, never in the size of the range.
+MAX_NUMBER = 2 ** 63
 
 
 class GameManager:
-    def __init__(self):
+    def __init__(self, score_manager=None, game_settings=None, metrics=None,
+                 cli=None, rng=None, event_log=None, clock=None,
+                 round_history=None):
         self.current_player = None
-        self.game_settings = GameSettings()
-        self.high_score = ScoreManager()
+        self.game_settings = game_settings or GameSettings()
+        self.high_score = score_manager or ScoreManager()
         self.is_game_running = True
+        self.metrics = metrics or NULL_METRICS
+        self._cli = cli
+        self.rng = rng
+        self.event_log = event_log
+        self.session_id = new_session_id() if event_log is not None else 0
+        self.clock = clock
+        self.round_history = round_history
+
+    @property
+    def cli(self):
+        # Looked up at call time so the module-level CLI can be patched.
+        return self._cli or CLI
 
     def start_game(self):
-        CLI.print_welcome_message()
-        player_name = CLI.get_player_name()
-        self.current_player = Player(player_name)
-        self.high_score.load_score_history()
+        self.cli.print_welcome_message(self.game_settings.number_range)
+        # Scores load while the player types their name.
+        self.high_score.load_score_history_in_background()
+        player_name = self.cli.get_player_name()
+        self.current_player = self.high_score.load_player(player_name)
 
         while self.is_game_running:
             self.handle_game_round()
-            self.is_game_running = CLI.play_again()
+            self.is_game_running = self.cli.play_again()
         self.quit_game()
 
     def handle_game_round(self):
+        metrics = self.metrics
         try:
-            difficulty = CLI.get_difficulty_choice(
+            started = metrics.start()
+            difficulty = self.cli.get_difficulty_choice(
                 self.game_settings.difficulty_levels)
+            metrics.stop("input_wait", started)
             if difficulty not in self.game_settings.difficulty_levels:
                 raise ValueError("Invalid difficulty level")
 
@@ -35,15 +69,24 @@ class GameManager:
             hints_allowed = self.game_settings.get_hints_allowed(difficulty)
 
             game_round = GameRound(difficulty, self.game_settings.number_range,
-                                   attempts, hints_allowed)
+                                   attempts, hints_allowed, rng=self.rng,
+                                   event_log=self.event_log,
+                                   session_id=self.session_id,
+                                   clock=self.clock)
             game_round.generate_target_number()
+            metrics.increment("rounds")
 
             while not game_round.check_game_over():
                 try:
-                    guess = CLI.get_player_guess()
+                    started = metrics.start()
+                    guess = self.cli.get_player_guess()
+                    metrics.stop("input_wait", started)
                     if guess == "hint":
+                        started = metrics.start()
                         hint = game_round.provide_hint()
-                        CLI.show_hint(hint)
+                        metrics.stop("hint_generation", started)
+                        metrics.increment("hints")
+                        self.cli.show_hint(hint)
                         continue
 
                     guess = int(guess)
@@ -53,37 +96,53 @@ class GameManager:
                             f"Guess must be between "
                             f"{self.game_settings.number_range[0]} and "
                             f"{self.game_settings.number_range[1]}")
+                    started = metrics.start()
                     result = game_round.process_guess(guess)
-                    CLI.display_guess_result(result, game_round.target_number)
+                    metrics.stop("guess_processing", started)
+                    metrics.increment("guesses")
+                    self.cli.display_guess_result(result,
+                                                  game_round.target_number)
                     if result == "correct":
                         game_round.is_won = True
-                        game_round.end_time = time.time()
                         self.current_player.update_stats(game_round)
+                        started = metrics.start()
                         score = game_round.calculate_score(
                             self.game_settings.get_score_multiplier(difficulty)
                         )
+                        metrics.stop("score_calculation", started)
                         self.high_score.update_high_score(
                             difficulty, score, self.current_player.name
                         )
+                        metrics.increment("wins")
                         break
                 except ValueError as e:
-                    CLI.show_error_message(str(e))
+                    self.cli.show_error_message(str(e))
                     continue
 
             if not game_round.is_won:
-                CLI.display_guess_result("lost", game_round.target_number)
+                metrics.increment("losses")
+                self.cli.display_guess_result("lost", game_round.target_number)
                 self.current_player.update_stats(game_round)
+            self.high_score.save_player(self.current_player)
+            if self.round_history is not None:
+                self.round_history.record(self.current_player.name,
+                                          game_round)
 
-            CLI.display_game_stats(self.current_player, self.high_score)
+            self.cli.display_game_stats(self.current_player, self.high_score)
         except ValueError as e:
-            CLI.show_error_message(str(e))
+            self.cli.show_error_message(str(e))
 
     def quit_game(self):
-        self.high_score.save_score_history()
-        CLI.show_goodbye_message()
+        self.high_score.wait_until_loaded()
+        started = self.metrics.start()
+        self.high_score.flush_score_history()
+        self.metrics.stop("score_persistence", started)
+        self.cli.show_goodbye_message()
 
 
 class Player:
+    __slots__ = ("name", "best_scores", "total_games_played", "total_wins")
+
     def __init__(self, name):
         self.name = name
         self.best_scores = {}
@@ -102,59 +161,224 @@ class Player:
     def get_best_score(self, difficulty):
         return self.best_scores.get(difficulty, None)
 
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "total_games_played": self.total_games_played,
+            "total_wins": self.total_wins,
+            "best_scores": dict(self.best_scores),
+        }
+
+    @classmethod
+    def from_dict(cls, profile):
+        player = cls(profile["name"])
+        player.total_games_played = profile["total_games_played"]
+        player.total_wins = profile["total_wins"]
+        player.best_scores = dict(profile["best_scores"])
+        return player
+
+
+# Guess results as small ints; process_guess still returns the names.
+CORRECT = 0
+GREATER = 1
+LESS = 2
+RESULT_NAMES = ("correct", "greater", "less")
+RESULT_CODES = {name: code for code, name in enumerate(RESULT_NAMES)}
+
+# Difficulties are stored on rounds as small ints, so every round of a
+# difficulty shares one name string however the name was read.
+DIFFICULTY_NAMES = []
+DIFFICULTY_CODES = {}
+_DIFFICULTY_LOCK = threading.Lock()
+
+
+def difficulty_code(name):
+    code = DIFFICULTY_CODES.get(name)
+    if code is None:
+        # Server sessions create rounds from many threads; without the lock
+        # two new names could be given the same code.
+        with _DIFFICULTY_LOCK:
+            code = DIFFICULTY_CODES.get(name)
+            if code is None:
+                # The name is listed before its code is published, so a
+                # code found without the lock always resolves.
+                DIFFICULTY_NAMES.append(name)
+                code = DIFFICULTY_CODES[name] = len(DIFFICULTY_NAMES) - 1
+    return code
+
+
+for _name in ("easy", "medium", "hard"):
+    difficulty_code(_name)
+del _name
+
+
+def score_points(remaining_attempts, multiplier, duration):
+    # The score formula before truncation and the floor at zero. Only
+    # arithmetic, so round_history.rescore applies it to whole NumPy arrays.
+    return remaining_attempts * multiplier * 100 - duration
+
 
 class GameRound:
+    # Hundreds of thousands can be live at once, so no per-instance dict.
+    __slots__ = ("target_number", "remaining_attempts", "difficulty_code",
+                 "number_range", "started_ns", "ended_ns", "hints_remaining",
+                 "current_score", "is_won", "rng", "event_log", "session_id",
+                 "clock", "candidates")
+
     def __init__(self, difficulty_level, number_range,
-                 attempts, hints_remaining):
+                 attempts, hints_remaining, rng=None, event_log=None,
+                 session_id=0, clock=None, track_candidates=False):
         self.target_number = None
         self.remaining_attempts = attempts
-        self.difficulty_level = difficulty_level
+        self.difficulty_code = difficulty_code(difficulty_level)
         self.number_range = number_range
-        self.start_time = time.time()
-        self.end_time = None
+        # A monotonic nanosecond clock, so wall-clock jumps never change a
+        # score; simulations pass a clock.VirtualClock instead.
+        self.clock = clock or time.perf_counter_ns
+        self.started_ns = self.clock()
+        self.ended_ns = None
         self.hints_remaining = hints_remaining
         self.current_score = 0
         self.is_won = False
+        self.rng = rng or random
+        self.event_log = event_log
+        self.session_id = session_id
+        if event_log is not None:
+            event_log.record(session_id, ROUND_START, self.difficulty_code,
+                             attempts)
+        # What the guesses and hints so far still allow, for assist modes
+        # and analytics; off by default since most rounds never ask.
+        self.candidates = None
+        if track_candidates:
+            from candidates import CandidateTracker
+
+            self.candidates = CandidateTracker(number_range)
+
+    @property
+    def difficulty_level(self):
+        return DIFFICULTY_NAMES[self.difficulty_code]
+
+    @difficulty_level.setter
+    def difficulty_level(self, name):
+        self.difficulty_code = difficulty_code(name)
+
+    # Start and end times in seconds on the round's clock.
+    @property
+    def start_time(self):
+        return self.started_ns / 1e9
+
+    @start_time.setter
+    def start_time(self, seconds):
+        self.started_ns = round(seconds * 1_000_000_000)
+
+    @property
+    def end_time(self):
+        return self.ended_ns / 1e9 if self.ended_ns is not None else None
+
+    @end_time.setter
+    def end_time(self, seconds):
+        self.ended_ns = (round(seconds * 1_000_000_000)
+                         if seconds is not None else None)
 
     def generate_target_number(self):
-        self.target_number = random.randint(*self.number_range)
+        self.target_number = self.rng.randint(*self.number_range)
 
     def process_guess(self, guess):
+        # The names are shared constants, so no result allocates anything.
         self.remaining_attempts -= 1
+        if self.event_log is not None:
+            self._log_guess(guess)
+        if self.candidates is not None:
+            self.candidates.apply_guess(guess, self._result(guess))
         if guess == self.target_number:
-            self.end_time = time.time()
+            self.ended_ns = self.clock()
             return "correct"
         elif guess < self.target_number:
             return "greater"
         elif guess > self.target_number:
             return "less"
 
+    def _result(self, guess):
+        if guess == self.target_number:
+            return "correct"
+        return "greater" if guess < self.target_number else "less"
+
+    def process_guess_code(self, guess):
+        return RESULT_CODES[self.process_guess(guess)]
+
+    def _log_guess(self, guess):
+        log = self.event_log
+        log.record(self.session_id, GUESS, guess, self.remaining_attempts)
+        if guess == self.target_number:
+            log.record(self.session_id, WIN, guess, self.remaining_attempts)
+        elif self.remaining_attempts <= 0:
+            log.record(self.session_id, LOSS, self.target_number, 0)
+
     def calculate_score(self, multiplier):
-        duration = self.get_round_duration()
-        return max(
-            0, int((self.remaining_attempts * multiplier * 100) - duration))
+        return max(0, int(score_points(self.remaining_attempts, multiplier,
+                                       self.get_round_duration())))
 
     def get_round_duration(self):
-        return int((self.end_time or time.time()) - self.start_time)
+        # Whole seconds, as the score has always been penalised.
+        ended_ns = self.ended_ns if self.ended_ns is not None else self.clock()
+        return (ended_ns - self.started_ns) // 1_000_000_000
 
     def provide_hint(self):
         if self.hints_remaining > 0:
             self.hints_remaining -= 1
-            return HintSystem.generate_hint(self.target_number)
+            if self.event_log is not None:
+                self.event_log.record(self.session_id, HINT,
+                                      self.hints_remaining,
+                                      self.remaining_attempts)
+            hint_type, value = HintSystem.generate_hint_fact(
+                self.target_number, self.rng, self.number_range)
+            if self.candidates is not None:
+                self.candidates.apply_hint(hint_type, value)
+            return hint_text(hint_type, value)
         return "No hints left"
 
     def check_game_over(self):
         return self.remaining_attempts <= 0 or self.is_won
 
 
+class LockedGameRound(GameRound):
+    # A GameRound that several threads may play at once: each guess and
+    # hint is applied atomically. A separate class so that unshared
+    # rounds neither pay for a lock nor hold one.
+    __slots__ = ("lock",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lock = threading.Lock()
+
+    def process_guess(self, guess):
+        with self.lock:
+            if self.check_game_over():
+                # Another thread's guess already ended the round.
+                return None
+            result = GameRound.process_guess(self, guess)
+            if result == "correct":
+                self.is_won = True
+            return result
+
+    def provide_hint(self):
+        with self.lock:
+            return GameRound.provide_hint(self)
+
+
 class GameSettings:
-    def __init__(self):
+    def __init__(self, number_range=(1, 100)):
+        low, high = number_range
+        if not (isinstance(low, int) and isinstance(high, int)) or \
+           not (0 <= low < high <= MAX_NUMBER):
+            raise ValueError(
+                f"Number range must satisfy 0 <= low < high <= {MAX_NUMBER}")
         self.difficulty_levels = {
             "easy": 10,
             "medium": 7,
             "hard": 5
         }
-        self.number_range = (1, 100)
+        self.number_range = (low, high)
         self.hints_per_difficulty = {
             "easy": 3,
             "medium": 2,
@@ -177,154 +401,508 @@ class GameSettings:
 
 
 class CLI:
-    @staticmethod
-    def print_welcome_message():
-        print("\nWelcome to the Number Guessing Game!")
-        print("Rules: Guess the number between 1 and 100.")
-        print("You have limited attempts based on your chosen difficulty.")
-        print("Type 'hint' to use a hint if available.\n")
-
-    @staticmethod
-    def get_player_name():
+    input_driver = TerminalInput()
+    output = TerminalOutput()
+
+    @classmethod
+    def using(cls, input_driver=None, output=None):
+        # A CLI bound to other drivers, e.g. a recorded transcript and a
+        # null sink for replaying sessions at full speed.
+        return type(cls.__name__, (cls,), {
+            "input_driver": input_driver or cls.input_driver,
+            "output": output or cls.output,
+        })
+
+    @classmethod
+    def print_welcome_message(cls, number_range=(1, 100)):
+        cls.output.write("\nWelcome to the Number Guessing Game!")
+        cls.output.write(f"Rules: Guess the number between {number_range[0]} "
+                         f"and {number_range[1]}.")
+        cls.output.write(
+            "You have limited attempts based on your chosen difficulty.")
+        cls.output.write("Type 'hint' to use a hint if available.\n")
+
+    @classmethod
+    def get_player_name(cls):
         while True:
-            name = input("Enter your name: ").strip()
+            name = cls.input_driver.read("Enter your name: ").strip()
             if name:
                 return name
-            print("Name cannot be empty. Please try again.")
+            cls.output.write("Name cannot be empty. Please try again.")
 
-    @staticmethod
-    def get_difficulty_choice(difficulty_levels):
-        print("\nSelect difficulty:")
+    @classmethod
+    def get_difficulty_choice(cls, difficulty_levels):
+        cls.output.write("\nSelect difficulty:")
         for level in difficulty_levels:
-            print(f"- {level} ({difficulty_levels[level]} attempts)")
+            cls.output.write(
+                f"- {level} ({difficulty_levels[level]} attempts)")
         while True:
-            choice = input("Your choice: ").lower().strip()
+            choice = cls.input_driver.read("Your choice: ").lower().strip()
             if choice in difficulty_levels:
                 return choice
-            print("Invalid difficulty. Please try again.")
+            cls.output.write("Invalid difficulty. Please try again.")
 
-    @staticmethod
-    def get_player_guess():
+    @classmethod
+    def get_player_guess(cls):
         while True:
-            guess = input(
+            guess = cls.input_driver.read(
                 "Enter your guess (or 'hint' for a hint): ").lower().strip()
             if guess == "hint":
                 return guess
             try:
                 return int(guess)
             except ValueError:
-                print("Please enter a valid number or 'hint'.")
+                cls.output.write("Please enter a valid number or 'hint'.")
 
-    @staticmethod
-    def display_guess_result(result, target_number):
+    @classmethod
+    def display_guess_result(cls, result, target_number):
         if result == "correct":
-            print("\n🎉 Congratulations! You guessed the correct number! 🎉")
+            cls.output.write(
+                "\n🎉 Congratulations! You guessed the correct number! 🎉")
         elif result == "greater":
-            print("The number is greater than your guess. ⬆️")
+            cls.output.write("The number is greater than your guess. ⬆️")
         elif result == "less":
-            print("The number is less than your guess. ⬇️")
+            cls.output.write("The number is less than your guess. ⬇️")
         elif result == "lost":
-            print(f"\n😔 Game over! The correct number was {target_number}.")
-
-    @staticmethod
-    def display_game_stats(player, high_scores):
-        print(f"\nPlayer: {player.name}")
-        print(f"Games Played: {player.total_games_played}")
-        print(f"Wins: {player.total_wins}")
+            cls.output.write(
+                f"\n😔 Game over! The correct number was {target_number}.")
+
+    @classmethod
+    def display_game_stats(cls, player, high_scores):
+        cls.output.write(f"\nPlayer: {player.name}")
+        cls.output.write(f"Games Played: {player.total_games_played}")
+        cls.output.write(f"Wins: {player.total_wins}")
         if player.total_games_played > 0:
             win_rate = (player.total_wins / player.total_games_played) * 100
-            print(f"Win Rate: {win_rate:.1f}%")
-        print("\nHigh Scores:")
-        high_scores.display_high_scores()
+            cls.output.write(f"Win Rate: {win_rate:.1f}%")
+        cls.output.write("\nHigh Scores:")
+        high_scores.display_high_scores(write=cls.output.write)
 
-    @staticmethod
-    def play_again():
+    @classmethod
+    def play_again(cls):
         while True:
-            choice = input(
+            choice = cls.input_driver.read(
                 "\nDo you want to play again? (yes/no): ").lower().strip()
             if choice in ["yes", "no", "y", "n"]:
                 return choice in ["yes", "y"]
-            print("Please answer 'yes' or 'no'.")
+            cls.output.write("Please answer 'yes' or 'no'.")
 
-    @staticmethod
-    def show_hint(hint):
-        print(f"💡 Hint: {hint}")
+    @classmethod
+    def show_hint(cls, hint):
+        cls.output.write(f"💡 Hint: {hint}")
 
-    @staticmethod
-    def show_error_message(message):
-        print(f"❌ Error: {message}")
+    @classmethod
+    def show_error_message(cls, message):
+        cls.output.write(f"❌ Error: {message}")
 
-    @staticmethod
-    def show_goodbye_message():
-        print("\n👋 Thank you for playing! Goodbye!")
+    @classmethod
+    def show_goodbye_message(cls):
+        cls.output.write("\n👋 Thank you for playing! Goodbye!")
 
 
 class ScoreManager:
-    def __init__(self):
-        self.high_score = {}
+    def __init__(self, storage=None, metrics=None, profiles=None):
+        self.leaderboards = {}
+        self.storage = storage or JsonScoreStorage()
+        self.metrics = metrics or NULL_METRICS
+        # Player profiles come from the storage unless a dedicated profile
+        # store (e.g. ShardedProfileStore) is given.
+        self.profiles = profiles or self.storage
+        self._loader = None
+        self._load_error = None
+        # Safe to share between threads. Each difficulty's leaderboard has
+        # its own lock, so winners at different difficulties never wait on
+        # each other; _lock only guards creating leaderboards and locks,
+        # and _storage_lock serialises calls into the storage backend.
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._storage_lock = threading.Lock()
+        # Set when high_score replaces the leaderboards, which the storage
+        # has not seen until the next save_score_history.
+        self._replaced = False
+
+    def _leaderboard(self, difficulty, create=False):
+        # (leaderboard, its lock), or (None, None) for a difficulty with no
+        # scores yet unless `create` is set.
+        leaderboard = self.leaderboards.get(difficulty)
+        lock = self._locks.get(difficulty)
+        if leaderboard is None or lock is None:
+            if leaderboard is None and not create:
+                return None, None
+            with self._lock:
+                lock = self._locks.setdefault(difficulty, threading.Lock())
+                leaderboard = self.leaderboards.setdefault(difficulty,
+                                                           Leaderboard())
+        return leaderboard, lock
+
+    @property
+    def high_score(self):
+        if self._loader is not None:
+            self.wait_until_loaded()
+        high_score = {}
+        for difficulty in list(self.leaderboards):
+            leaderboard, lock = self._leaderboard(difficulty)
+            with lock:
+                if len(leaderboard):
+                    high_score[difficulty] = leaderboard.top(1)[0]
+        return high_score
+
+    @high_score.setter
+    def high_score(self, scores):
+        if self._loader is not None:
+            self.wait_until_loaded()
+        self.leaderboards = {}
+        for difficulty, (player_name, score) in scores.items():
+            self._apply_score(difficulty, score, player_name)
+        self._replaced = True
+
+    def replace_leaderboards(self, leaderboards):
+        # Installs rebuilt leaderboards (see round_history.rescore_history)
+        # in place of every current one and saves them. Meant for
+        # maintenance: a score added to an old leaderboard meanwhile is lost.
+        if self._loader is not None:
+            self.wait_until_loaded()
+        with self._lock:
+            for difficulty in leaderboards:
+                self._locks.setdefault(difficulty, threading.Lock())
+            self.leaderboards = dict(leaderboards)
+        self.save_score_history()
+
+    def score_events(self):
+        # Every recorded score as (difficulty, player_name, score), the
+        # form storages load and save.
+        if self._loader is not None:
+            self.wait_until_loaded()
+        events = []
+        for difficulty in list(self.leaderboards):
+            leaderboard, lock = self._leaderboard(difficulty)
+            with lock:
+                events.extend((difficulty, player_name, score)
+                              for player_name, score in leaderboard.items())
+        return events
 
     def update_high_score(self, difficulty, score, player_name):
-        if difficulty not in self.high_score or \
-           self.high_score[difficulty][1] < score:
-            self.high_score[difficulty] = (player_name, score)
-
-    def display_high_scores(self):
-        if not self.high_score:
-            print("No high scores yet!")
+        if self._loader is not None:
+            self.wait_until_loaded()
+        started = self.metrics.start()
+        # Applied and recorded in one critical section with the snapshot in
+        # save_score_history, so every score ends up in exactly one of the
+        # snapshot or the journal: never dropped, never stored twice.
+        with self._storage_lock:
+            self._apply_score(difficulty, score, player_name)
+            self.storage.record_score(difficulty, player_name, score)
+        self.metrics.stop("score_record", started)
+        self.metrics.increment("scores_recorded")
+        if self.storage.needs_compaction():
+            self.save_score_history()
+
+    def _apply_score(self, difficulty, score, player_name):
+        leaderboard, lock = self._leaderboard(difficulty, create=True)
+        with lock:
+            leaderboard.add(player_name, score)
+
+    def top_scores(self, difficulty, limit=10, offset=0):
+        if self._loader is not None:
+            self.wait_until_loaded()
+        leaderboard, lock = self._leaderboard(difficulty)
+        if leaderboard is None:
+            return []
+        with lock:
+            return leaderboard.top(limit, offset)
+
+    def get_rank(self, difficulty, player_name):
+        if self._loader is not None:
+            self.wait_until_loaded()
+        leaderboard, lock = self._leaderboard(difficulty)
+        if leaderboard is None:
+            return None
+        with lock:
+            return leaderboard.rank(player_name)
+
+    def count_scores_above(self, difficulty, score):
+        if self._loader is not None:
+            self.wait_until_loaded()
+        leaderboard, lock = self._leaderboard(difficulty)
+        if leaderboard is None:
+            return 0
+        with lock:
+            return leaderboard.count_above(score)
+
+    def display_high_scores(self, limit=1, write=print):
+        high_score = self.high_score
+        if not high_score:
+            write("No high scores yet!")
             return
-        for difficulty, (player, score) in self.high_score.items():
-            print(f"{difficulty.capitalize()}: {player} - {score} points")
+        for difficulty, (player, score) in high_score.items():
+            if limit == 1:
+                write(f"{difficulty.capitalize()}: {player} - {score} points")
+                continue
+            write(f"{difficulty.capitalize()}:")
+            for rank, (player, score) in enumerate(
+                    self.top_scores(difficulty, limit), 1):
+                write(f"  {rank}. {player} - {score} points")
 
     def save_score_history(self):
+        started = self.metrics.start()
         try:
-            with open('score_history.json', 'w') as file:
-                json.dump(
-                    {
-                        key: list(value) for key,
-                        value in self.high_score.items()
-                        },
-                    file
-                )
+            # Taken under the storage lock, so no score is recorded between
+            # the snapshot and a journal truncation that would drop it.
+            with self._storage_lock:
+                self.storage.save_scores(self.score_events())
+                self._replaced = False
         except IOError as e:
             print(f"Could not save scores: {e}")
+        self.metrics.stop("score_save", started)
+
+    def flush_score_history(self):
+        # What quitting calls: makes the recorded scores durable and leaves
+        # compaction to the journal's threshold. Only a storage that keeps
+        # nothing between saves, or replaced leaderboards, need a full save.
+        if self._replaced or not self.storage.keeps_recorded_scores():
+            self.save_score_history()
+            return
+        started = self.metrics.start()
+        try:
+            with self._storage_lock:
+                self.storage.flush()
+        except IOError as e:
+            print(f"Could not save scores: {e}")
+        self.metrics.stop("score_flush", started)
+
+    def load_score_history_in_background(self):
+        # Every other method waits for the load before touching the
+        # leaderboards, so callers can carry on as if it had finished.
+        def load():
+            try:
+                self.load_score_history()
+            except Exception as e:
+                self._load_error = e
+
+        self._load_error = None
+        self._loader = threading.Thread(target=load, daemon=True)
+        self._loader.start()
+
+    def wait_until_loaded(self):
+        loader = self._loader
+        if loader is None:
+            return
+        loader.join()
+        with self._lock:
+            if self._loader is not loader:
+                # Another thread finished waiting first.
+                return
+            self._loader = None
+            error, self._load_error = self._load_error, None
+        if error is not None:
+            raise error
 
     def load_score_history(self):
+        started = self.metrics.start()
+        self.leaderboards = {}
+        for difficulty, player_name, score in self.storage.load_scores():
+            self._apply_score(difficulty, score, player_name)
+        self.metrics.stop("score_load", started)
+
+    def close(self):
+        # Lets the storage finish any writes it still has queued.
         try:
-            with open('score_history.json', 'r') as file:
-                data = json.load(file)
-                self.high_score = {
-                    key: tuple(value) for key, value in data.items()
-                }
-        except FileNotFoundError:
-            self.high_score = {}
-        except json.JSONDecodeError:
-            print(
-                "Score history file is corrupted. Starting with fresh scores.")
-            self.high_score = {}
+            self.wait_until_loaded()
+        finally:
+            self.storage.close()
+            if self.profiles is not self.storage:
+                self.profiles.close()
+
+    def load_player(self, name):
+        profile = self.profiles.load_player(name)
+        if profile is None:
+            return Player(name)
+        return Player.from_dict(profile)
+
+    def save_player(self, player):
+        self.profiles.save_player(player.to_dict())
+
+
+DIVISOR_CANDIDATES = tuple(range(1, 11))
+HINT_TYPES = ("divisor", "parity", "digit_sum")
+HINT_TABLE_LIMIT = 1 << 16
+DIVISOR_HINTS = {
+    x: f"The number is divisible by {x}." for x in DIVISOR_CANDIDATES
+}
+PARITY_HINTS = ("The number is even.", "The number is odd.")
+
+
+# Divisibility by 1..10 only depends on n modulo their lcm.
+DIVISOR_LCM = 2520
+
+
+@lru_cache(maxsize=None)
+def divisor_masks_by_residue():
+    masks = array('H', bytes(2 * DIVISOR_LCM))
+    for x in DIVISOR_CANDIDATES:
+        for residue in range(0, DIVISOR_LCM, x):
+            masks[residue] |= 1 << (x - 1)
+    return masks
+
+
+def divisor_mask(n):
+    return divisor_masks_by_residue()[n % DIVISOR_LCM]
+
+
+@lru_cache(maxsize=None)
+def divisor_sets():
+    # One shared divisor tuple per possible bitmask of DIVISOR_CANDIDATES,
+    # built on the first hint rather than at import.
+    return [
+        tuple(x for x in DIVISOR_CANDIDATES if mask >> (x - 1) & 1)
+        for mask in range(1 << len(DIVISOR_CANDIDATES))
+    ]
+
+
+@lru_cache(maxsize=None)
+def digit_sums_below_10000():
+    sums = bytearray(10000)
+    for n in range(1, 10000):
+        sums[n] = sums[n // 10] + n % 10
+    return sums
+
+
+def digit_sum(n):
+    # Four digits per step, so 2^63 takes five table lookups.
+    sums = digit_sums_below_10000()
+    n = abs(n)
+    total = 0
+    while n:
+        n, chunk = divmod(n, 10000)
+        total += sums[chunk]
+    return total
+
+
+@lru_cache(maxsize=4096)
+def hint_facts(n):
+    return divisor_sets()[divisor_mask(n)], digit_sum(n)
+
+
+class HintTable:
+    # Hint facts for every number of a range, computed once: divisor
+    # bitmasks and digit sums packed into arrays.
+    def __init__(self, number_range):
+        self.low, self.high = number_range
+        size = self.high - self.low + 1
+        self.divisor_masks = array('H', bytes(2 * size))
+        for x in DIVISOR_CANDIDATES:
+            bit = 1 << (x - 1)
+            for index in range(-self.low % x, size, x):
+                self.divisor_masks[index] |= bit
+        self.digit_sums = array(
+            'B', (digit_sum(n) for n in range(self.low, self.high + 1)))
+        self.divisor_sets = divisor_sets()
+
+    def facts(self, n):
+        if self.low <= n <= self.high:
+            index = n - self.low
+            return (self.divisor_sets[self.divisor_masks[index]],
+                    self.digit_sums[index])
+        return hint_facts(n)
+
+
+def hint_text(hint_type, value):
+    if hint_type == "divisor":
+        return DIVISOR_HINTS[value]
+    if hint_type == "parity":
+        return PARITY_HINTS[value]
+    return f"The number's digits sum to {value}."
 
 
 class HintSystem:
     @staticmethod
-    def generate_hint(target_number):
-        hint_types = [
-            lambda n: (
-                f"The number is divisible by "
-                f"{random.choice([x for x in range(1, 11) if n % x == 0])}"
-            ),
-            lambda n: f"The number is {'even' if n % 2 == 0 else 'odd'}",
-            lambda n: (
-                f"The number's digits sum to "
-                f"{sum(int(d) for d in str(n))}"
-            )
-        ]
-        return random.choice(hint_types)(target_number) + "."
+    @lru_cache(maxsize=16)
+    def get_table(number_range):
+        low, high = number_range
+        if high - low + 1 > HINT_TABLE_LIMIT:
+            return None
+        return HintTable(number_range)
+
+    @staticmethod
+    def generate_hint(target_number, rng=random, number_range=None):
+        return hint_text(*HintSystem.generate_hint_fact(
+            target_number, rng, number_range))
+
+    @staticmethod
+    def generate_hint_fact(target_number, rng=random, number_range=None):
+        # The fact a hint reveals, as (hint type, value).
+        table = None
+        if number_range is not None:
+            table = HintSystem.get_table(number_range)
+        if table is not None:
+            divisors, total = table.facts(target_number)
+        else:
+            divisors, total = hint_facts(target_number)
+
+        # Same draws, in the same order, as picking one of three hint
+        # builders and then a divisor.
+        hint_type = rng.choice(HINT_TYPES)
+        if hint_type == "divisor":
+            return hint_type, rng.choice(divisors)
+        if hint_type == "parity":
+            return hint_type, target_number % 2
+        return hint_type, total
 
 
 if __name__ == "__main__":
+    # Instrumentation is off unless a Prometheus export target is given.
+    metrics_file = os.environ.get("GAME_METRICS_FILE")
+    metrics_port = os.environ.get("GAME_METRICS_PORT")
+    metrics = Metrics() if metrics_file or metrics_port else None
+    if metrics_port:
+        metrics.serve(int(metrics_port))
+    # GAME_TRANSCRIPT records every answer so src/replay.py can play the
+    # session back; the seed header reproduces the same target numbers.
+    transcript_path = os.environ.get("GAME_TRANSCRIPT")
+    transcript = cli = rng = None
+    if transcript_path:
+        seed = random.randrange(2 ** 32)
+        rng = random.Random(seed)
+        transcript = open(transcript_path, 'w')
+        transcript.write(f"# seed: {seed}\n")
+        cli = CLI.using(RecordingInput(TerminalInput(), transcript))
+    # GAME_EVENT_LOG records every guess, hint, win and loss for analytics.
+    event_log_path = os.environ.get("GAME_EVENT_LOG")
+    events = EventLog(event_log_path) if event_log_path else None
+    # GAME_ROUND_HISTORY keeps each round's score inputs so standings can be
+    # rescored after the settings change (see src/round_history.py).
+    round_history_path = os.environ.get("GAME_ROUND_HISTORY")
+    round_history = None
+    if round_history_path:
+        from round_history import RoundHistory
+        round_history = RoundHistory(round_history_path)
+    # GAME_SHARED_SCORES lets several game processes share one
+    # score_history.json: saves lock the file and merge into it.
+    if os.environ.get("GAME_SHARED_SCORES"):
+        from shared_storage import SharedJsonScoreStorage
+        storage = SharedJsonScoreStorage()
+    else:
+        storage = JsonScoreStorage(journal=ScoreJournal('score_history.log'))
+    # Scores and profiles are written behind the game loop and flushed on
+    # exit; returning players get their profile back from the sharded store.
+    from profile_store import ShardedProfileStore
+    score_manager = ScoreManager(WriteBehindStorage(storage), metrics,
+                                 WriteBehindStorage(ShardedProfileStore()))
     try:
-        game_manager = GameManager()
+        game_manager = GameManager(score_manager, metrics=metrics, cli=cli,
+                                   rng=rng, event_log=events,
+                                   round_history=round_history)
         game_manager.start_game()
     except KeyboardInterrupt:
         print("\n\nGame interrupted. Goodbye!")
     except Exception as e:
         print(f"\nAn unexpected error occurred: {e}")
+    finally:
+        score_manager.close()
+        if metrics_file:
+            metrics.write_prometheus(metrics_file)
+        if transcript is not None:
+            transcript.close()
+        if events is not None:
+            events.close()
+        if round_history is not None:
+            round_history.close()
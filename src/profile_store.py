@@ -0,0 +1,97 @@
+import os
+import threading
+import zlib
+from collections import OrderedDict
+
+
+def shard_of(name, shards):
+    # crc32 rather than hash(): str hashes change between runs.
+    return zlib.crc32(name.encode('utf-8')) % shards
+
+
+def copy_profile(profile):
+    # Cached profiles must not change when a caller edits its copy.
+    return dict(profile, best_scores=dict(profile["best_scores"]))
+
+
+class ShardedProfileStore:
+    # Player profiles spread over `shards` SQLite files by a hash of the
+    # name. A lookup touches one primary-key row in one shard, shards are
+    # opened on first use, and the most recently used profiles stay in an
+    # LRU cache, so neither startup nor lookups depend on how many players
+    # exist. Same load_player/save_player contract as ScoreStorage.
+    def __init__(self, directory='profiles', shards=64, cache_size=1024):
+        self.directory = directory
+        self.shards = shards
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.connections = {}
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def errors(self):
+        # What a failed write raises, for WriteBehindStorage.
+        import sqlite3
+
+        return (OSError, sqlite3.Error)
+
+    def _connection(self, name):
+        shard = shard_of(name, self.shards)
+        connection = self.connections.get(shard)
+        if connection is None:
+            # sqlite3 and json load with the first shard, after the game
+            # has already shown its first prompt.
+            import sqlite3
+
+            from sqlite_storage import PLAYERS_SCHEMA
+
+            connection = sqlite3.connect(
+                os.path.join(self.directory, f"shard-{shard:04d}.db"),
+                check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(PLAYERS_SCHEMA)
+            self.connections[shard] = connection
+        return connection
+
+    def _remember(self, name, profile):
+        self.cache[name] = profile
+        self.cache.move_to_end(name)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def load_player(self, name):
+        with self.lock:
+            if name in self.cache:
+                self.cache.move_to_end(name)
+                profile = self.cache[name]
+            else:
+                from sqlite_storage import SELECT_PLAYER, profile_from_row
+
+                row = self._connection(name).execute(
+                    SELECT_PLAYER, (name,)).fetchone()
+                profile = profile_from_row(row) if row is not None else None
+                # Misses are cached too, so new players cost one query.
+                self._remember(name, profile)
+        return copy_profile(profile) if profile is not None else None
+
+    def save_player(self, profile):
+        from sqlite_storage import UPSERT_PLAYER, profile_to_row
+
+        profile = copy_profile(profile)
+        with self.lock:
+            connection = self._connection(profile["name"])
+            with connection:
+                connection.execute(UPSERT_PLAYER, profile_to_row(profile))
+            self._remember(profile["name"], profile)
+
+    def flush(self):
+        # Every save_player commits on its own.
+        pass
+
+    def close(self):
+        with self.lock:
+            for connection in self.connections.values():
+                connection.close()
+            self.connections = {}
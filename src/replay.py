@@ -0,0 +1,107 @@
+import argparse
+import os
+import random
+import time
+
+from cli_io import (BufferedOutput, NullOutput, ScriptedInput,
+                    split_seed_header)
+from clock import VirtualClock
+from number_guessing_game import CLI, GameManager, GameSettings, ScoreManager
+from storage import MemoryScoreStorage
+
+
+def read_transcript(path):
+    # A transcript is one answer per line, exactly as typed at the prompts.
+    # An optional "# seed: N" header pins the target numbers.
+    with open(path, 'r') as file:
+        return split_seed_header([line.rstrip("\n") for line in file])
+
+
+def transcript_paths(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def replay_session(lines, seed=None, score_manager=None, game_settings=None,
+                   output=None):
+    cli = CLI.using(ScriptedInput(lines), output or NullOutput())
+    # A virtual clock keeps replayed scores free of replay-speed timing.
+    game_manager = GameManager(
+        score_manager or ScoreManager(MemoryScoreStorage()), game_settings,
+        cli=cli, rng=random.Random(seed), clock=VirtualClock())
+    try:
+        game_manager.start_game()
+    except EOFError:
+        # The recording stopped mid-session; everything played so far counts.
+        return False
+    return True
+
+
+class ReplayScoreManager(ScoreManager):
+    # The ScoreManager every session of a replay run shares. The history
+    # is loaded once for the run; a session starting does not reload it,
+    # because the leaderboards already hold what earlier sessions added.
+    # Quitting only flushes the storage, which keeps every recorded score.
+    def load_score_history_in_background(self):
+        pass
+
+
+class ReplayReport:
+    def __init__(self):
+        self.sessions = 0
+        self.truncated = 0
+        self.elapsed = 0.0
+        self.output = None
+        self.score_manager = None
+
+    @property
+    def sessions_per_second(self):
+        return self.sessions / self.elapsed if self.elapsed else 0.0
+
+
+def replay(paths, game_settings=None, capture=False):
+    # Every session shares one in-memory ScoreManager, so high scores carry
+    # over between transcripts the way they would for a real player base.
+    score_manager = ReplayScoreManager(MemoryScoreStorage())
+    score_manager.load_score_history()
+    report = ReplayReport()
+    output = BufferedOutput() if capture else None
+    started = time.perf_counter()
+    for path in transcript_paths(paths):
+        seed, lines = read_transcript(path)
+        if not replay_session(lines, seed, score_manager, game_settings,
+                              output):
+            report.truncated += 1
+        report.sessions += 1
+    report.elapsed = time.perf_counter() - started
+    report.output = output
+    report.score_manager = score_manager
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Replay recorded Number Guessing Game transcripts.")
+    parser.add_argument("paths", nargs="+",
+                        help="transcript files or directories of them")
+    parser.add_argument("--range", type=int, nargs=2, metavar=("LOW", "HIGH"),
+                        default=(1, 100))
+    parser.add_argument("--show-output", action="store_true",
+                        help="print what the sessions would have displayed")
+    args = parser.parse_args(argv)
+
+    report = replay(args.paths, GameSettings(tuple(args.range)),
+                    capture=args.show_output)
+    if args.show_output:
+        print(report.output.getvalue(), end="")
+    print(f"{report.sessions} sessions ({report.truncated} truncated) in "
+          f"{report.elapsed:.2f}s "
+          f"({report.sessions_per_second:,.0f} sessions/s)")
+
+
+if __name__ == "__main__":
+    main()
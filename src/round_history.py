@@ -0,0 +1,231 @@
+import argparse
+import mmap
+import os
+import struct
+
+from leaderboard import Leaderboard
+from number_guessing_game import GameSettings, ScoreManager, score_points
+from score_journal import ScoreJournal
+from storage import JsonScoreStorage
+
+# Every finished round is one fixed-size little-endian record of the raw
+# inputs to its score, not the score itself:
+#   player u32 | difficulty u32 | duration_s u32 | remaining u16 | won u8
+# padded to 16 bytes. Players and difficulties are indexes into a string
+# table kept next to the log (<path>.names, one string per line), so a
+# retuned multiplier or score formula can be replayed over every round ever
+# played.
+RECORD_FORMAT = "<IIIHB1x"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+HEADER_FORMAT = "<8sII"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+MAGIC = b"NGROUND1"
+
+# The same layout as a NumPy structured dtype, for as_array().
+ROUND_FIELDS = [("player", "<u4"), ("difficulty", "<u4"),
+                ("duration", "<u4"), ("remaining", "<u2"), ("won", "u1"),
+                ("padding", "V1")]
+
+
+def names_path(path):
+    return path + ".names"
+
+
+def read_names(path):
+    try:
+        with open(names_path(path), 'r', encoding='utf-8') as file:
+            return file.read().splitlines()
+    except FileNotFoundError:
+        return []
+
+
+class RoundHistory:
+    # Appends rounds to a preallocated buffer and writes it out in one call
+    # per `buffer_records` rounds, like event_log.EventLog.
+    def __init__(self, path, buffer_records=4096):
+        self.path = path
+        self.buffer_records = buffer_records
+        self.buffer = bytearray(buffer_records * RECORD_SIZE)
+        self.pending = 0
+        self.file = None
+        self.names_file = None
+        self.names = {name: index
+                      for index, name in enumerate(read_names(path))}
+
+    def _open(self):
+        self.file = open(self.path, 'ab')
+        size = self.file.tell()
+        if size == 0:
+            self.file.write(struct.pack(HEADER_FORMAT, MAGIC, RECORD_SIZE, 0))
+            return
+        with open(self.path, 'rb') as file:
+            magic, record_size, _ = struct.unpack(
+                HEADER_FORMAT, file.read(HEADER_SIZE))
+        if magic != MAGIC or record_size != RECORD_SIZE:
+            self.file.close()
+            self.file = None
+            raise ValueError(f"{self.path} is not a round history")
+        extra = (size - HEADER_SIZE) % RECORD_SIZE
+        if extra:
+            self.file.truncate(size - extra)
+            self.file.seek(0, os.SEEK_END)
+
+    def _index(self, name):
+        index = self.names.get(name)
+        if index is None:
+            # Names reach the disk before any record that refers to them.
+            if self.names_file is None:
+                self.names_file = open(names_path(self.path), 'a',
+                                       encoding='utf-8')
+            self.names_file.write(name + "\n")
+            self.names_file.flush()
+            index = self.names[name] = len(self.names)
+        return index
+
+    def record(self, player_name, game_round):
+        struct.pack_into(RECORD_FORMAT, self.buffer,
+                         self.pending * RECORD_SIZE,
+                         self._index(player_name),
+                         self._index(game_round.difficulty_level),
+                         game_round.get_round_duration(),
+                         game_round.remaining_attempts, game_round.is_won)
+        self.pending += 1
+        if self.pending == self.buffer_records:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        if self.file is None:
+            self._open()
+        with memoryview(self.buffer) as view:
+            self.file.write(view[:self.pending * RECORD_SIZE])
+        self.file.flush()
+        self.pending = 0
+
+    def close(self):
+        self.flush()
+        for file in (self.file, self.names_file):
+            if file is not None:
+                file.close()
+        self.file = self.names_file = None
+
+
+class RoundHistoryReader:
+    # Maps the file read-only; as_array() views the records in place.
+    def __init__(self, path):
+        self.names = read_names(path)
+        with open(path, 'rb') as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, record_size, _ = struct.unpack_from(HEADER_FORMAT, self.mmap)
+        if magic != MAGIC or record_size != RECORD_SIZE:
+            self.mmap.close()
+            raise ValueError(f"{path} is not a round history")
+        self.count = (len(self.mmap) - HEADER_SIZE) // RECORD_SIZE
+        self.view = memoryview(self.mmap)[
+            HEADER_SIZE:HEADER_SIZE + self.count * RECORD_SIZE]
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        # (player, difficulty, duration, remaining, won) index tuples.
+        return struct.iter_unpack(RECORD_FORMAT, self.view)
+
+    def as_array(self):
+        # The array borrows the mapping: drop it before calling close().
+        import numpy as np
+
+        return np.frombuffer(self.view, dtype=np.dtype(ROUND_FIELDS))
+
+    def close(self):
+        self.view.release()
+        self.mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def rescore(rounds, names, game_settings=None):
+    # GameRound.calculate_score over a whole array of rounds at once.
+    # Rounds lost, or of a difficulty the settings no longer have, score -1.
+    import numpy as np
+
+    game_settings = game_settings or GameSettings()
+    multipliers = np.array(
+        [game_settings.score_multiplier.get(name, -1) for name in names] or
+        [-1])
+    multiplier = multipliers[rounds["difficulty"]]
+    points = score_points(rounds["remaining"].astype(np.int64), multiplier,
+                          rounds["duration"].astype(np.int64))
+    # int() in calculate_score truncates toward zero, as np.trunc does.
+    scores = np.maximum(0, np.trunc(points).astype(np.int64))
+    return np.where(rounds["won"].astype(bool) & (multiplier >= 0),
+                    scores, -1)
+
+
+def rebuild_leaderboards(rounds, names, scores):
+    # Groups the scored rounds into one Leaderboard per difficulty, players
+    # listed in the order they played, without a Python call per round.
+    import numpy as np
+
+    names = np.array(names, dtype=object)
+    leaderboards = {}
+    for difficulty in np.unique(rounds["difficulty"][scores >= 0]):
+        selected = (rounds["difficulty"] == difficulty) & (scores >= 0)
+        players = rounds["player"][selected]
+        scored = scores[selected]
+
+        order = np.argsort(scored, kind="stable")
+        values, starts = np.unique(scored[order], return_index=True)
+        groups = np.split(names[players[order]], starts[1:])
+        entries = {int(value): group.tolist()
+                   for value, group in zip(values, groups)}
+
+        best = np.full(len(names), -1, dtype=np.int64)
+        np.maximum.at(best, players, scored)
+        best_scores = {names[player]: int(best[player])
+                       for player in np.flatnonzero(best >= 0)}
+        leaderboards[str(names[difficulty])] = Leaderboard.from_entries(
+            entries, best_scores)
+    return leaderboards
+
+
+def rescore_history(path, game_settings=None):
+    with RoundHistoryReader(path) as reader:
+        rounds = reader.as_array()
+        scores = rescore(rounds, reader.names, game_settings)
+        leaderboards = rebuild_leaderboards(rounds, reader.names, scores)
+        del rounds
+    return leaderboards
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Rescore every recorded round with the current "
+                    "GameSettings and print the rebuilt leaderboards.")
+    parser.add_argument("path", help="round history file")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument(
+        "--save", action="store_true",
+        help="replace score_history.json with the rebuilt leaderboards; "
+             "scores from rounds not in the history are dropped")
+    args = parser.parse_args(argv)
+    leaderboards = rescore_history(args.path)
+    for difficulty, leaderboard in leaderboards.items():
+        print(f"{difficulty.capitalize()} ({len(leaderboard):,} wins):")
+        for rank, (player, score) in enumerate(
+                leaderboard.top(args.top), 1):
+            print(f"  {rank}. {player} - {score} points")
+    if args.save:
+        score_manager = ScoreManager(JsonScoreStorage(
+            journal=ScoreJournal('score_history.log')))
+        score_manager.replace_leaderboards(leaderboards)
+        score_manager.close()
+
+
+if __name__ == "__main__":
+    main()
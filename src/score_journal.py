@@ -0,0 +1,88 @@
+import os
+
+
+class ScoreJournal:
+    # Append-only JSON lines log of score events. Events are buffered and
+    # written with one fsync per batch, so a crash loses at most the last
+    # unflushed batch; ScoreManager folds the log into its snapshot.
+    # Every event carries a sequence number and the snapshot stores the
+    # last one it holds, so a crash between writing the snapshot and
+    # truncating the log does not replay those events twice.
+    def __init__(self, path, batch_size=16, compact_every=1000):
+        self.path = path
+        self.batch_size = batch_size
+        self.compact_every = compact_every
+        self.pending = []
+        self.entries = 0
+        # The last sequence number handed out, and the last one the
+        # snapshot already holds.
+        self.sequence = 0
+        self.folded = 0
+        self.file = None
+
+    def append(self, difficulty, player_name, score):
+        import json
+
+        self.sequence += 1
+        self.pending.append(
+            json.dumps([difficulty, player_name, score, self.sequence]))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        if self.file is None:
+            self.file = open(self.path, 'a')
+        self.file.write("\n".join(self.pending) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.entries += len(self.pending)
+        self.pending = []
+
+    def needs_compaction(self):
+        return self.entries + len(self.pending) >= self.compact_every
+
+    def folded_into_snapshot(self, sequence):
+        # Called with the sequence number a loaded snapshot was saved at:
+        # replay skips the events up to it and new ones are numbered after.
+        self.folded = sequence
+        self.sequence = max(self.sequence, sequence)
+
+    def replay(self):
+        import json
+
+        try:
+            with open(self.path, 'r') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                        difficulty, player_name, score = entry[:3]
+                    except (ValueError, TypeError):
+                        # A torn write from a crash only affects the tail.
+                        continue
+                    self.entries += 1
+                    # Logs written before sequence numbers replay in full.
+                    if len(entry) > 3:
+                        self.sequence = max(self.sequence, entry[3])
+                        if entry[3] <= self.folded:
+                            continue
+                    yield difficulty, player_name, score
+        except FileNotFoundError:
+            return
+
+    def truncate(self):
+        # Called once the events are safely folded into the snapshot. The
+        # sequence carries on, so numbers are never reused.
+        self.close()
+        if os.path.exists(self.path):
+            with open(self.path, 'w') as file:
+                os.fsync(file.fileno())
+        self.entries = 0
+        self.folded = self.sequence
+
+    def close(self):
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,262 @@
+import argparse
+import asyncio
+import json
+
+from event_log import EventLog, new_session_id
+from number_guessing_game import GameRound, GameSettings, ScoreManager
+from profile_store import ShardedProfileStore
+from score_journal import ScoreJournal
+from storage import JsonScoreStorage
+from write_behind import WriteBehindStorage
+
+
+class GameSession:
+    # One connection's state; the protocol logic is kept free of I/O so it
+    # can be driven directly in tests.
+    def __init__(self, game_settings, score_manager, event_log=None):
+        self.game_settings = game_settings
+        self.high_score = score_manager
+        self.event_log = event_log
+        self.session_id = new_session_id() if event_log is not None else 0
+        self.player = None
+        self.game_round = None
+        self.is_open = True
+
+    def handle(self, message):
+        if not isinstance(message, dict):
+            raise ValueError("Message must be a JSON object")
+        action = message.get("action")
+        if action == "quit":
+            self.is_open = False
+            return {"event": "goodbye"}
+        if action == "hello":
+            return self.hello(message.get("name"))
+        if self.player is None:
+            raise ValueError("Say hello with your name first")
+        if action == "play":
+            return self.play(message.get("difficulty"))
+        if action == "guess":
+            return self.guess(message.get("value"))
+        if action == "hint":
+            return self.hint()
+        if action == "stats":
+            return self.stats()
+        if action == "leaderboard":
+            return self.leaderboard(message.get("difficulty"),
+                                    message.get("limit", 10),
+                                    message.get("offset", 0))
+        raise ValueError(f"Unknown action: {action}")
+
+    def hello(self, name):
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("Name cannot be empty")
+        self.player = self.high_score.load_player(name.strip())
+        return {"event": "ready", "player": self.player.name}
+
+    def play(self, difficulty):
+        settings = self.game_settings
+        # Checked first: an unhashable value would fail the dict lookup.
+        if not isinstance(difficulty, str) or \
+           difficulty not in settings.difficulty_levels:
+            raise ValueError("Invalid difficulty level")
+        self.game_round = GameRound(difficulty, settings.number_range,
+                                    settings.get_attempts(difficulty),
+                                    settings.get_hints_allowed(difficulty),
+                                    event_log=self.event_log,
+                                    session_id=self.session_id)
+        self.game_round.generate_target_number()
+        return {
+            "event": "round_started",
+            "difficulty": difficulty,
+            "attempts": self.game_round.remaining_attempts,
+            "hints": self.game_round.hints_remaining,
+        }
+
+    def current_round(self):
+        if self.game_round is None or self.game_round.check_game_over():
+            raise ValueError("No round in progress")
+        return self.game_round
+
+    def guess(self, value):
+        game_round = self.current_round()
+        low, high = self.game_settings.number_range
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError("Guess must be a whole number")
+        if not (low <= value <= high):
+            raise ValueError(f"Guess must be between {low} and {high}")
+
+        result = game_round.process_guess(value)
+        if result == "correct":
+            game_round.is_won = True
+            self.player.update_stats(game_round)
+            difficulty = game_round.difficulty_level
+            score = game_round.calculate_score(
+                self.game_settings.get_score_multiplier(difficulty))
+            self.high_score.update_high_score(difficulty, score,
+                                              self.player.name)
+            self.high_score.save_player(self.player)
+            return {"event": "won", "score": score,
+                    "remaining_attempts": game_round.remaining_attempts}
+        if game_round.check_game_over():
+            self.player.update_stats(game_round)
+            self.high_score.save_player(self.player)
+            return {"event": "lost",
+                    "target_number": game_round.target_number}
+        return {"event": "result", "result": result,
+                "remaining_attempts": game_round.remaining_attempts}
+
+    def hint(self):
+        game_round = self.current_round()
+        return {"event": "hint", "hint": game_round.provide_hint(),
+                "hints_remaining": game_round.hints_remaining}
+
+    def stats(self):
+        return {
+            "event": "stats",
+            "player": self.player.name,
+            "games_played": self.player.total_games_played,
+            "wins": self.player.total_wins,
+            "best_scores": self.player.best_scores,
+            "high_scores": {
+                difficulty: list(entry)
+                for difficulty, entry in self.high_score.high_score.items()
+            },
+        }
+
+    def leaderboard(self, difficulty, limit, offset):
+        if not isinstance(difficulty, str) or \
+           difficulty not in self.game_settings.difficulty_levels:
+            raise ValueError("Invalid difficulty level")
+        if not isinstance(limit, int) or not isinstance(offset, int):
+            raise ValueError("Limit and offset must be whole numbers")
+        limit = max(0, min(limit, 100))
+        return {
+            "event": "leaderboard",
+            "difficulty": difficulty,
+            "offset": offset,
+            "scores": [
+                list(entry) for entry in
+                self.high_score.top_scores(difficulty, limit, offset)
+            ],
+            "rank": self.high_score.get_rank(difficulty, self.player.name),
+        }
+
+
+class GameServer:
+    def __init__(self, host="127.0.0.1", port=8765, game_settings=None,
+                 score_manager=None, idle_timeout=300,
+                 max_line_length=1024, max_sessions=10000, event_log=None):
+        self.host = host
+        self.port = port
+        self.game_settings = game_settings or GameSettings()
+        self.high_score = score_manager or ScoreManager()
+        self.idle_timeout = idle_timeout
+        self.max_line_length = max_line_length
+        self.max_sessions = max_sessions
+        self.event_log = event_log
+        self.active_sessions = 0
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port,
+            limit=self.max_line_length)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def send(self, writer, payload):
+        writer.write(json.dumps(payload).encode() + b"\n")
+        # Waiting for the buffer to drain caps memory held for slow readers.
+        await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        if self.active_sessions >= self.max_sessions:
+            await self.send(writer, {"event": "error",
+                                     "message": "Server is full"})
+            writer.close()
+            return
+
+        self.active_sessions += 1
+        session = GameSession(self.game_settings, self.high_score,
+                              self.event_log)
+        try:
+            low, high = self.game_settings.number_range
+            await self.send(writer, {
+                "event": "welcome",
+                "number_range": [low, high],
+                "difficulties": self.game_settings.difficulty_levels,
+            })
+            while session.is_open:
+                try:
+                    line = await asyncio.wait_for(reader.readline(),
+                                                  self.idle_timeout)
+                except asyncio.TimeoutError:
+                    await self.send(writer, {"event": "timeout"})
+                    break
+                except (ValueError, asyncio.LimitOverrunError):
+                    await self.send(writer, {"event": "error",
+                                             "message": "Line too long"})
+                    break
+                if not line:
+                    break
+                try:
+                    response = session.handle(json.loads(line))
+                except ValueError as e:
+                    response = {"event": "error", "message": str(e)}
+                await self.send(writer, response)
+        except ConnectionError:
+            pass
+        finally:
+            self.active_sessions -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def serve(host, port, idle_timeout, event_log_path=None):
+    # Score and profile writes happen on worker threads, off the event loop.
+    score_manager = ScoreManager(WriteBehindStorage(JsonScoreStorage(
+        journal=ScoreJournal('score_history.log'))),
+        profiles=WriteBehindStorage(ShardedProfileStore()))
+    events = EventLog(event_log_path) if event_log_path else None
+    game_server = GameServer(host, port, score_manager=score_manager,
+                             idle_timeout=idle_timeout, event_log=events)
+    game_server.high_score.load_score_history()
+    server = await game_server.start()
+    print(f"Serving on {game_server.host}:{game_server.port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        game_server.high_score.flush_score_history()
+        game_server.high_score.close()
+        if events is not None:
+            events.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Host Number Guessing Game sessions over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--idle-timeout", type=float, default=300,
+                        help="seconds before an idle session is closed")
+    parser.add_argument("--event-log", metavar="FILE",
+                        help="record every guess, hint, win and loss here")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.idle_timeout,
+                          args.event_log))
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+
+
+if __name__ == "__main__":
+    main()
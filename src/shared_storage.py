@@ -0,0 +1,87 @@
+import contextlib
+import fcntl
+import json
+from collections import Counter
+
+from storage import (JsonScoreStorage, journals_from_json, scores_from_json,
+                     scores_to_json, write_json_atomically)
+
+
+@contextlib.contextmanager
+def locked(path):
+    # Advisory lock on a sidecar file. The data files are replaced by
+    # rename on every write, so they cannot carry the lock themselves.
+    with open(path, 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def read_json(path):
+    try:
+        with open(path, 'r') as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def merge_scores(on_disk, base, scores):
+    # `scores` replaces `base`, this process's last view of the file; what
+    # other processes added since is kept after it. Scores are compared as
+    # a multiset, so equal entries from different processes all survive.
+    others = Counter(on_disk)
+    others.subtract(base)
+    merged = list(scores)
+    for event in on_disk:
+        if others[event] > 0:
+            others[event] -= 1
+            merged.append(event)
+    return merged
+
+
+class SharedJsonScoreStorage(JsonScoreStorage):
+    # JsonScoreStorage for several processes sharing one score_history.json.
+    # Saves take an exclusive lock, re-read the file and merge into it
+    # instead of overwriting it. The lock is held only for that small
+    # read-merge-write; readers need no lock because every write is an
+    # atomic rename. Each process needs its own journal path, if any; the
+    # file keeps one sequence number per journal path.
+    def __init__(self, path='score_history.json', journal=None,
+                 players_path=None):
+        super().__init__(path, journal, players_path)
+        self.lock_path = path + '.lock'
+        self.base = Counter()
+
+    def _load_file(self):
+        events = super()._load_file()
+        self.base = Counter(events)
+        return events
+
+    def save_scores(self, scores):
+        scores = list(scores)
+        if self.journal is not None:
+            self.journal.flush()
+        with locked(self.lock_path):
+            data = read_json(self.path)
+            on_disk = scores_from_json(data)
+            # Every other process's journal position is kept as it was.
+            journals = journals_from_json(data)
+            journals.update(self._journals())
+            write_json_atomically(
+                self.path,
+                scores_to_json(merge_scores(on_disk, self.base, scores),
+                               journals))
+        self.base = Counter(scores)
+        if self.journal is not None:
+            self.journal.truncate()
+
+    def save_player(self, profile):
+        if self.players_path is None:
+            return
+        # Only this player's profile changes; everyone else's is re-read.
+        with locked(self.lock_path):
+            self.players = read_json(self.players_path)
+            self.players[profile["name"]] = profile
+            write_json_atomically(self.players_path, self.players)
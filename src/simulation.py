@@ -0,0 +1,370 @@
+import argparse
+import copy
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from clock import VirtualClock
+from number_guessing_game import GameRound, GameSettings
+
+
+class BinarySearchStrategy:
+    def __init__(self, use_hints=False):
+        self.use_hints = use_hints
+        self.low = None
+        self.high = None
+
+    def start_round(self, game_round, rng):
+        self.low, self.high = game_round.number_range
+
+    def next_guess(self, game_round):
+        if self.use_hints and game_round.hints_remaining > 0:
+            return "hint"
+        return (self.low + self.high) // 2
+
+    def observe(self, guess, result):
+        if result == "greater":
+            self.low = guess + 1
+        elif result == "less":
+            self.high = guess - 1
+
+    def observe_hint(self, hint):
+        pass
+
+
+class RandomStrategy(BinarySearchStrategy):
+    # Guesses uniformly inside the bounds learned so far.
+    def start_round(self, game_round, rng):
+        super().start_round(game_round, rng)
+        self.rng = rng
+
+    def next_guess(self, game_round):
+        if self.use_hints and game_round.hints_remaining > 0:
+            return "hint"
+        return self.rng.randint(self.low, self.high)
+
+
+class CandidateStrategy(BinarySearchStrategy):
+    # Guesses the median of the numbers that every guess and hint so far
+    # still allow, so hints narrow the search as well as the bounds.
+    tracks_candidates = True
+
+    def next_guess(self, game_round):
+        if self.use_hints and game_round.hints_remaining > 0:
+            return "hint"
+        candidates = game_round.candidates
+        return candidates.candidate_at(candidates.count // 2)
+
+
+class ReplayStrategy:
+    # Replays recorded rounds: each transcript is a list of guesses and
+    # "hint" requests, used one per round and cycled when exhausted.
+    def __init__(self, transcripts):
+        if not transcripts:
+            raise ValueError("At least one transcript is required")
+        self.transcripts = [list(actions) for actions in transcripts]
+        self.round_index = 0
+        self.actions = None
+
+    def start_round(self, game_round, rng):
+        transcript = self.transcripts[
+            self.round_index % len(self.transcripts)]
+        self.round_index += 1
+        self.actions = iter(transcript)
+
+    def next_guess(self, game_round):
+        return next(self.actions, None)
+
+    def observe(self, guess, result):
+        pass
+
+    def observe_hint(self, hint):
+        pass
+
+
+STRATEGIES = {
+    "binary": BinarySearchStrategy,
+    "candidates": CandidateStrategy,
+    "random": RandomStrategy,
+}
+
+
+class LognormalThinkTime:
+    # Seconds a player spends before each guess or hint request: lognormal
+    # around `mean` seconds, with a long tail of slow answers.
+    def __init__(self, mean=5.0, sigma=0.75):
+        if mean <= 0:
+            raise ValueError("Mean think time must be positive")
+        self.mean = mean
+        self.sigma = sigma
+        self.mu = math.log(mean) - sigma * sigma / 2
+
+    def __call__(self, rng):
+        # gauss() is several times faster than lognormvariate().
+        return math.exp(rng.gauss(self.mu, self.sigma))
+
+
+class DifficultyStats:
+    def __init__(self):
+        self.rounds = 0
+        self.wins = 0
+        self.attempts_used = 0
+        self.hints_used = 0
+        self.total_score = 0
+        self.best_score = 0
+
+    def record(self, won, attempts_used, hints_used, score):
+        self.rounds += 1
+        self.attempts_used += attempts_used
+        self.hints_used += hints_used
+        if won:
+            self.wins += 1
+            self.total_score += score
+            if score > self.best_score:
+                self.best_score = score
+
+    def merge(self, other):
+        self.rounds += other.rounds
+        self.wins += other.wins
+        self.attempts_used += other.attempts_used
+        self.hints_used += other.hints_used
+        self.total_score += other.total_score
+        self.best_score = max(self.best_score, other.best_score)
+
+    @property
+    def win_rate(self):
+        return self.wins / self.rounds if self.rounds else 0.0
+
+    @property
+    def mean_attempts(self):
+        return self.attempts_used / self.rounds if self.rounds else 0.0
+
+    @property
+    def mean_score(self):
+        return self.total_score / self.rounds if self.rounds else 0.0
+
+    def as_dict(self):
+        return {
+            "rounds": self.rounds,
+            "wins": self.wins,
+            "attempts_used": self.attempts_used,
+            "hints_used": self.hints_used,
+            "total_score": self.total_score,
+            "best_score": self.best_score,
+            "win_rate": self.win_rate,
+            "mean_attempts": self.mean_attempts,
+            "mean_score": self.mean_score,
+        }
+
+
+class SimulationReport:
+    def __init__(self, stats, elapsed):
+        self.stats = stats
+        self.elapsed = elapsed
+
+    @property
+    def total_rounds(self):
+        return sum(stats.rounds for stats in self.stats.values())
+
+    @property
+    def rounds_per_second(self):
+        return self.total_rounds / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            "rounds": self.total_rounds,
+            "elapsed": self.elapsed,
+            "rounds_per_second": self.rounds_per_second,
+            "difficulties": {
+                difficulty: stats.as_dict()
+                for difficulty, stats in self.stats.items()
+            },
+        }
+
+
+class Simulator:
+    # Rounds run on a virtual clock: with a think_time, each guess and hint
+    # request advances it by a drawn delay, so time penalties show up in the
+    # scores without anyone waiting.
+    def __init__(self, game_settings=None, seed=None, think_time=None):
+        self.game_settings = game_settings or GameSettings()
+        self.rng = random.Random(seed)
+        self.think_time = think_time
+        self.clock = VirtualClock()
+
+    def play_round(self, difficulty, strategy):
+        settings = self.game_settings
+        attempts = settings.get_attempts(difficulty)
+        hints_allowed = settings.get_hints_allowed(difficulty)
+        game_round = GameRound(difficulty, settings.number_range,
+                               attempts, hints_allowed, rng=self.rng,
+                               clock=self.clock,
+                               track_candidates=getattr(
+                                   strategy, "tracks_candidates", False))
+        game_round.generate_target_number()
+        strategy.start_round(game_round, self.rng)
+
+        # Mirrors GameManager.handle_game_round without the CLI.
+        while not game_round.check_game_over():
+            guess = strategy.next_guess(game_round)
+            if guess is None:
+                break
+            if self.think_time is not None:
+                self.clock.advance(self.think_time(self.rng))
+            if guess == "hint":
+                strategy.observe_hint(game_round.provide_hint())
+                continue
+            result = game_round.process_guess(guess)
+            strategy.observe(guess, result)
+            if result == "correct":
+                game_round.is_won = True
+                break
+
+        score = 0
+        if game_round.is_won:
+            score = game_round.calculate_score(
+                settings.get_score_multiplier(difficulty))
+        return game_round, score
+
+    def run(self, strategy, rounds, difficulties=None):
+        difficulties = list(
+            difficulties or self.game_settings.difficulty_levels)
+        stats = {difficulty: DifficultyStats() for difficulty in difficulties}
+        settings = self.game_settings
+
+        start = time.perf_counter()
+        for difficulty in difficulties:
+            attempts = settings.get_attempts(difficulty)
+            hints_allowed = settings.get_hints_allowed(difficulty)
+            record = stats[difficulty].record
+            for _ in range(rounds):
+                game_round, score = self.play_round(difficulty, strategy)
+                record(game_round.is_won,
+                       attempts - game_round.remaining_attempts,
+                       hints_allowed - game_round.hints_remaining,
+                       score)
+        elapsed = time.perf_counter() - start
+        return SimulationReport(stats, elapsed)
+
+
+def _run_shard(game_settings, strategy, think_time, difficulty, rounds,
+               seed):
+    simulator = Simulator(game_settings, seed, think_time)
+    report = simulator.run(strategy, rounds, [difficulty])
+    return difficulty, report.stats[difficulty]
+
+
+def plan_shards(difficulties, rounds, shard_size, seed=None):
+    # Shard boundaries and seeds depend only on the master seed and the
+    # shard size, never on the worker count, so merged stats are stable.
+    master = random.Random(seed)
+    shards = []
+    for difficulty in difficulties:
+        remaining = rounds
+        while remaining > 0:
+            size = min(shard_size, remaining)
+            shards.append((difficulty, size, master.getrandbits(64)))
+            remaining -= size
+    return shards
+
+
+def run_parallel(strategy, rounds, seed=None, workers=None,
+                 shard_size=10000, difficulties=None, game_settings=None,
+                 think_time=None):
+    game_settings = game_settings or GameSettings()
+    difficulties = list(difficulties or game_settings.difficulty_levels)
+    workers = workers or os.cpu_count() or 1
+    shards = plan_shards(difficulties, rounds, shard_size, seed)
+    stats = {difficulty: DifficultyStats() for difficulty in difficulties}
+
+    start = time.perf_counter()
+    if workers == 1:
+        # Every shard starts from its own copy of the strategy, as it would
+        # after being pickled to a pool worker, so state never carries over.
+        results = (_run_shard(game_settings, copy.deepcopy(strategy),
+                              copy.deepcopy(think_time), *shard)
+                   for shard in shards)
+        for difficulty, shard_stats in results:
+            stats[difficulty].merge(shard_stats)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_run_shard, game_settings, strategy,
+                                think_time, *shard)
+                for shard in shards
+            ]
+            for future in futures:
+                difficulty, shard_stats = future.result()
+                stats[difficulty].merge(shard_stats)
+    return SimulationReport(stats, time.perf_counter() - start)
+
+
+def run_vectorized(rounds, seed=None, game_settings=None):
+    # NumPy is optional, so the batch module is only imported on demand.
+    from batch_round import check_number_range, simulate_binary_search
+
+    game_settings = game_settings or GameSettings()
+    check_number_range(game_settings.number_range)
+    start = time.perf_counter()
+    stats = {
+        difficulty: simulate_binary_search(
+            game_settings, difficulty, rounds,
+            None if seed is None else seed + index)
+        for index, difficulty in enumerate(game_settings.difficulty_levels)
+    }
+    return SimulationReport(stats, time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Play headless rounds of the Number Guessing Game.")
+    parser.add_argument("--rounds", type=int, default=100000,
+                        help="rounds to play per difficulty")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES),
+                        default="binary")
+    parser.add_argument("--hints", action="store_true",
+                        help="let the strategy use its hints")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes to shard rounds across "
+                             "(0 uses every core)")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="play binary search rounds with NumPy arrays")
+    parser.add_argument("--think-time", type=float, metavar="SECONDS",
+                        help="mean lognormal delay before every guess, "
+                             "simulated on a virtual clock")
+    args = parser.parse_args(argv)
+    think_time = (LognormalThinkTime(args.think_time)
+                  if args.think_time else None)
+
+    if args.vectorized:
+        if args.strategy != "binary" or args.hints or think_time:
+            parser.error("--vectorized supports the binary strategy "
+                         "without hints or think time only")
+        report = run_vectorized(args.rounds, args.seed)
+    elif args.workers != 1:
+        strategy = STRATEGIES[args.strategy](use_hints=args.hints)
+        report = run_parallel(strategy, args.rounds, args.seed,
+                              workers=args.workers or None,
+                              think_time=think_time)
+    else:
+        simulator = Simulator(seed=args.seed, think_time=think_time)
+        strategy = STRATEGIES[args.strategy](use_hints=args.hints)
+        report = simulator.run(strategy, args.rounds)
+
+    for difficulty, stats in report.stats.items():
+        print(f"{difficulty.capitalize()}: "
+              f"{stats.wins}/{stats.rounds} wins "
+              f"({stats.win_rate * 100:.1f}%), "
+              f"{stats.mean_attempts:.2f} attempts, "
+              f"{stats.hints_used} hints, "
+              f"mean score {stats.mean_score:.1f}, "
+              f"best {stats.best_score}")
+    print(f"{report.total_rounds} rounds in {report.elapsed:.2f}s "
+          f"({report.rounds_per_second:,.0f} rounds/s)")
+
+
+if __name__ == "__main__":
+    main()
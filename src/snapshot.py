@@ -0,0 +1,392 @@
+import mmap
+import os
+import struct
+import threading
+import zlib
+from array import array
+from numbers import Integral
+from sys import byteorder
+
+from storage import ScoreStorage
+
+# A snapshot is a header, a section table and the sections themselves, all
+# little-endian:
+#   header   magic 8s | version u16 | compatible u16 | sections u32
+#            | crc32 u32 | payload size u64 | 4 bytes padding
+#   table    one (tag 4s, offset u64, length u64) per section
+# The crc32 covers everything after the header. `compatible` is the oldest
+# reader version that can still read the file: new versions add sections,
+# which older readers skip, and only raise it when they change an existing
+# one. Strings are stored once in STRS and referred to by index elsewhere.
+MAGIC = b"NGSNAP\r\n"
+VERSION = 2
+COMPATIBLE = 1
+HEADER_FORMAT = "<8sHHIIQ4x"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+SECTION_FORMAT = "<4sQQ"
+SECTION_SIZE = struct.calcsize(SECTION_FORMAT)
+
+# STRS: count u32, count + 1 offsets u32 into the UTF-8 blob that follows.
+# SCRS: count u32, then (difficulty, player, kind, score) records, every
+#       score in the order ScoreManager.score_events lists them. The score
+#       is an i64 for kind 0 and a f64 for kind 1.
+# PLYR: count u32, then (name, games, wins, first best, best count) records
+#       sorted by name, so one profile is found by binary search.
+# BEST: (difficulty, score) records, sliced by the PLYR entries.
+# SETS: number range and count, then (difficulty, attempts, hints,
+#       multiplier) records.
+# JRNL: the last ScoreJournal sequence number SCRS holds (version 2).
+SCORE_FORMAT = "<IIB7x8s"
+SCORE_KINDS = [struct.Struct("<q"), struct.Struct("<d")]
+PLAYER_FORMAT = "<IIIII"
+BEST_FORMAT = "<Iq"
+SETTINGS_FORMAT = "<QQI"
+JOURNAL_FORMAT = "<Q"
+DIFFICULTY_FORMAT = "<IIId"
+COUNT_FORMAT = "<I"
+COUNT_SIZE = struct.calcsize(COUNT_FORMAT)
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def _u32_array(values):
+    values = array('I', values)
+    if byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+class _StringTable:
+    def __init__(self):
+        self.indexes = {}
+
+    def __call__(self, string):
+        index = self.indexes.get(string)
+        if index is None:
+            index = self.indexes[string] = len(self.indexes)
+        return index
+
+    def pack(self):
+        blobs = [string.encode('utf-8') for string in self.indexes]
+        offsets = [0]
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+        return (struct.pack(COUNT_FORMAT, len(blobs)) + _u32_array(offsets) +
+                b"".join(blobs))
+
+
+def _pack_records(record_format, records, counted=True):
+    packer = struct.Struct(record_format)
+    body = b"".join(packer.pack(*record) for record in records)
+    if counted:
+        return struct.pack(COUNT_FORMAT, len(records)) + body
+    return body
+
+
+def write_snapshot(path, scores, players=(), game_settings=None,
+                   journal_sequence=None):
+    # `scores` as ScoreManager.score_events, `players` as Player.to_dict
+    # profiles. Written to a temporary file and renamed into place.
+    strings = _StringTable()
+    score_records = []
+    for difficulty, player_name, score in scores:
+        kind = 0 if isinstance(score, Integral) else 1
+        score_records.append((strings(difficulty), strings(player_name), kind,
+                              SCORE_KINDS[kind].pack(score)))
+    score_records = _pack_records(SCORE_FORMAT, score_records)
+
+    player_records = []
+    best_records = []
+    for profile in sorted(players, key=lambda profile: profile["name"]):
+        best_scores = profile["best_scores"]
+        player_records.append((strings(profile["name"]),
+                               profile["total_games_played"],
+                               profile["total_wins"], len(best_records),
+                               len(best_scores)))
+        best_records.extend((strings(difficulty), score)
+                            for difficulty, score in best_scores.items())
+    sections = [(b"SCRS", score_records),
+                (b"PLYR", _pack_records(PLAYER_FORMAT, player_records)),
+                (b"BEST", _pack_records(BEST_FORMAT, best_records,
+                                        counted=False))]
+
+    if game_settings is not None:
+        low, high = game_settings.number_range
+        difficulties = game_settings.difficulty_levels
+        sections.append((b"SETS", struct.pack(
+            SETTINGS_FORMAT, low, high, len(difficulties)) +
+            _pack_records(DIFFICULTY_FORMAT, [
+                (strings(difficulty), attempts,
+                 game_settings.hints_per_difficulty[difficulty],
+                 game_settings.score_multiplier[difficulty])
+                for difficulty, attempts in difficulties.items()],
+                counted=False)))
+    if journal_sequence is not None:
+        sections.append((b"JRNL", struct.pack(JOURNAL_FORMAT,
+                                              journal_sequence)))
+    # Packed last, once every other section has named its strings.
+    sections.insert(0, (b"STRS", strings.pack()))
+
+    table = bytearray()
+    offset = HEADER_SIZE + SECTION_SIZE * len(sections)
+    for tag, data in sections:
+        table += struct.pack(SECTION_FORMAT, tag, offset, len(data))
+        offset += len(data)
+    payload = [bytes(table)] + [data for _, data in sections]
+    crc = 0
+    for part in payload:
+        crc = zlib.crc32(part, crc)
+    header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, COMPATIBLE,
+                         len(sections), crc, offset - HEADER_SIZE)
+
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(header)
+        for part in payload:
+            file.write(part)
+    os.replace(temp_path, path)
+
+
+class Snapshot:
+    # Maps a snapshot read-only and decodes fields only when they are
+    # asked for: opening one costs the checksum pass and the section
+    # table, and a single profile is a binary search over fixed records.
+    def __init__(self, path, verify=True):
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size < HEADER_SIZE:
+                raise SnapshotError(f"{path} is not a snapshot")
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.sections = self._read_table(path, verify)
+        except Exception:
+            self.mmap.close()
+            raise
+
+    def _read_table(self, path, verify):
+        magic, version, compatible, count, crc, size = struct.unpack_from(
+            HEADER_FORMAT, self.mmap)
+        if magic != MAGIC:
+            raise SnapshotError(f"{path} is not a snapshot")
+        if compatible > VERSION:
+            raise SnapshotError(
+                f"{path} needs snapshot reader version {compatible}, "
+                f"this is version {VERSION}")
+        if len(self.mmap) < HEADER_SIZE + size:
+            raise SnapshotError(f"{path} is truncated")
+        if verify:
+            with memoryview(self.mmap) as view:
+                if zlib.crc32(view[HEADER_SIZE:HEADER_SIZE + size]) != crc:
+                    raise SnapshotError(f"{path} failed its checksum")
+        self.version = version
+        sections = {}
+        for index in range(count):
+            tag, offset, length = struct.unpack_from(
+                SECTION_FORMAT, self.mmap, HEADER_SIZE + index * SECTION_SIZE)
+            # Tags this version does not know are skipped.
+            sections[tag] = (offset, length)
+        return sections
+
+    def _count(self, tag):
+        if tag not in self.sections:
+            return 0
+        return struct.unpack_from(COUNT_FORMAT, self.mmap,
+                                  self.sections[tag][0])[0]
+
+    def _record(self, tag, record_format, index, counted=True):
+        offset = self.sections[tag][0] + (COUNT_SIZE if counted else 0)
+        return struct.unpack_from(
+            record_format, self.mmap,
+            offset + index * struct.calcsize(record_format))
+
+    def string(self, index):
+        offset = self.sections[b"STRS"][0]
+        count = struct.unpack_from(COUNT_FORMAT, self.mmap, offset)[0]
+        start, end = struct.unpack_from("<II", self.mmap,
+                                        offset + COUNT_SIZE + index * 4)
+        blob = offset + COUNT_SIZE + (count + 1) * 4
+        return self.mmap[blob + start:blob + end].decode('utf-8')
+
+    def scores(self):
+        scores = []
+        for index in range(self._count(b"SCRS")):
+            difficulty, player_name, kind, score = self._record(
+                b"SCRS", SCORE_FORMAT, index)
+            scores.append((self.string(difficulty), self.string(player_name),
+                           SCORE_KINDS[kind].unpack(score)[0]))
+        return scores
+
+    @property
+    def player_count(self):
+        return self._count(b"PLYR")
+
+    def _profile(self, index, name=None):
+        name_index, games, wins, first, count = self._record(
+            b"PLYR", PLAYER_FORMAT, index)
+        best_scores = {}
+        for best in range(first, first + count):
+            difficulty, score = self._record(b"BEST", BEST_FORMAT, best,
+                                             counted=False)
+            best_scores[self.string(difficulty)] = score
+        return {"name": name if name is not None else self.string(name_index),
+                "total_games_played": games, "total_wins": wins,
+                "best_scores": best_scores}
+
+    def load_player(self, name):
+        low, high = 0, self.player_count - 1
+        while low <= high:
+            middle = (low + high) // 2
+            found = self.string(self._record(b"PLYR", PLAYER_FORMAT,
+                                             middle)[0])
+            if found == name:
+                return self._profile(middle, name)
+            if found < name:
+                low = middle + 1
+            else:
+                high = middle - 1
+        return None
+
+    def players(self):
+        for index in range(self.player_count):
+            yield self._profile(index)
+
+    def game_settings(self):
+        if b"SETS" not in self.sections:
+            return None
+        from number_guessing_game import GameSettings
+
+        offset = self.sections[b"SETS"][0]
+        low, high, count = struct.unpack_from(SETTINGS_FORMAT, self.mmap,
+                                              offset)
+        game_settings = GameSettings((low, high))
+        game_settings.difficulty_levels = {}
+        game_settings.hints_per_difficulty = {}
+        game_settings.score_multiplier = {}
+        offset += struct.calcsize(SETTINGS_FORMAT)
+        size = struct.calcsize(DIFFICULTY_FORMAT)
+        for index in range(count):
+            difficulty, attempts, hints, multiplier = struct.unpack_from(
+                DIFFICULTY_FORMAT, self.mmap, offset + index * size)
+            difficulty = self.string(difficulty)
+            game_settings.difficulty_levels[difficulty] = attempts
+            game_settings.hints_per_difficulty[difficulty] = hints
+            game_settings.score_multiplier[difficulty] = \
+                int(multiplier) if multiplier.is_integer() else multiplier
+        return game_settings
+
+    def journal_sequence(self):
+        if b"JRNL" not in self.sections:
+            return 0
+        return struct.unpack_from(JOURNAL_FORMAT, self.mmap,
+                                  self.sections[b"JRNL"][0])[0]
+
+    def close(self):
+        self.mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SnapshotScoreStorage(ScoreStorage):
+    # JsonScoreStorage's contract over a binary snapshot holding every
+    # score, every player profile and optionally the game settings. Like
+    # the JSON backend, saving scores rewrites the file and scores recorded
+    # between saves can go to a ScoreJournal. Saved profiles are held in
+    # memory and written with the next save_scores or close, so a profile
+    # update does not rewrite every other player.
+    def __init__(self, path='game_state.snap', journal=None,
+                 game_settings=None):
+        self.path = path
+        self.journal = journal
+        self.game_settings = game_settings
+        self.snapshot = None
+        self.scores = None
+        # The journal sequence number `scores` holds.
+        self.sequence = 0
+        # Profiles saved since the file was last written; the rest are
+        # read from the snapshot on demand.
+        self.players = {}
+
+    def _open(self):
+        if self.snapshot is None and os.path.exists(self.path):
+            try:
+                self.snapshot = Snapshot(self.path)
+            except SnapshotError as e:
+                print(f"Could not read snapshot ({e}). Starting fresh.")
+        return self.snapshot
+
+    def load_scores(self):
+        snapshot = self._open()
+        if self.scores is None:
+            self._read_scores(snapshot)
+        events = list(self.scores)
+        if self.journal is not None:
+            self.journal.folded_into_snapshot(self.sequence)
+            events.extend(self.journal.replay())
+        return events
+
+    def record_score(self, difficulty, player_name, score):
+        if self.journal is not None:
+            self.journal.append(difficulty, player_name, score)
+
+    def _read_scores(self, snapshot):
+        self.scores = snapshot.scores() if snapshot else []
+        self.sequence = snapshot.journal_sequence() if snapshot else 0
+
+    def _write(self):
+        snapshot = self._open()
+        players = dict(self.players)
+        if snapshot is not None:
+            for profile in snapshot.players():
+                players.setdefault(profile["name"], profile)
+            if self.scores is None:
+                self._read_scores(snapshot)
+            # Unmapped before the rename; the new file is mapped on demand.
+            snapshot.close()
+            self.snapshot = None
+        # A profile-only write keeps the sequence the scores were saved at,
+        # so journaled events since are still replayed.
+        write_snapshot(self.path, self.scores or [], players.values(),
+                       self.game_settings,
+                       self.sequence if self.journal is not None else None)
+        self.players = {}
+
+    def save_scores(self, scores):
+        if self.journal is not None:
+            self.journal.flush()
+            self.sequence = self.journal.sequence
+        self.scores = list(scores)
+        self._write()
+        if self.journal is not None:
+            self.journal.truncate()
+
+    def flush(self):
+        if self.journal is not None:
+            self.journal.flush()
+
+    def keeps_recorded_scores(self):
+        return self.journal is not None
+
+    def load_player(self, name):
+        profile = self.players.get(name)
+        if profile is None:
+            snapshot = self._open()
+            return snapshot.load_player(name) if snapshot else None
+        return dict(profile, best_scores=dict(profile["best_scores"]))
+
+    def save_player(self, profile):
+        self.players[profile["name"]] = dict(
+            profile, best_scores=dict(profile["best_scores"]))
+
+    def close(self):
+        if self.players:
+            self._write()
+        if self.journal is not None:
+            self.journal.close()
+        if self.snapshot is not None:
+            self.snapshot.close()
+            self.snapshot = None
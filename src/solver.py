@@ -0,0 +1,217 @@
+import argparse
+import json
+import os
+from collections import defaultdict
+
+from number_guessing_game import HintSystem, GameSettings
+
+
+# Ranges with hints are solved by enumerating their targets and running an
+# interval DP over each group of them, quadratic in the group size. At
+# this limit a solve with three hints takes about half a minute.
+MAX_SOLVER_RANGE = 1 << 10
+
+
+class Solution:
+    def __init__(self, win_probability, expected_score):
+        self.win_probability = win_probability
+        self.expected_score = expected_score
+
+    def as_dict(self):
+        return {
+            "win_probability": self.win_probability,
+            "expected_score": self.expected_score,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["win_probability"], data["expected_score"])
+
+    def __eq__(self, other):
+        return isinstance(other, Solution) and \
+            self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        return (f"Solution(win_probability={self.win_probability!r}, "
+                f"expected_score={self.expected_score!r})")
+
+
+def uniform_total(size, attempts):
+    # Sum of remaining attempts at the win over `size` equally likely
+    # candidates. Any binary search tree shape fits any sorted candidate
+    # list, so the best tree is the complete one: level d (found with
+    # d guesses) holds 2^(d-1) candidates and leaves attempts - d.
+    total = 0
+    level_size = 1
+    for depth in range(1, attempts + 1):
+        if size <= 0:
+            break
+        found = min(level_size, size)
+        total += found * (attempts - depth)
+        size -= found
+        level_size *= 2
+    return total
+
+
+def weighted_total(weights, attempts):
+    # Interval DP, one attempt count at a time: best[i][j] is the largest
+    # weighted sum of remaining attempts when the target lies among
+    # candidates i..j-1 and `a` guesses are left. Guessing candidate k wins
+    # it with a - 1 attempts left and splits the rest into two intervals.
+    # As for height-limited search trees, the best first guess never moves
+    # left when the interval grows to the right or loses its left end, so
+    # each interval only tries guesses between its two sub-intervals'
+    # choices: O(n^2) per attempt rather than O(n^3).
+    if len(set(weights)) <= 1:
+        return (weights[0] if weights else 0) * uniform_total(
+            len(weights), attempts)
+
+    # Exact integer weights, so equal totals tie exactly and the leftmost
+    # best guess is well defined; every float is an integer over a power
+    # of two.
+    ratios = [float(weight).as_integer_ratio() for weight in weights]
+    scale = max(denominator for _, denominator in ratios)
+    weights = [numerator * (scale // denominator)
+               for numerator, denominator in ratios]
+
+    size = len(weights)
+    best = [[0] * (size + 1) for _ in range(size + 1)]
+    for a in range(2, attempts + 1):
+        # What finding each candidate with this guess is worth.
+        found = [weight * (a - 1) for weight in weights]
+        previous = best
+        best = [[0] * (size + 1) for _ in range(size + 1)]
+        roots = [[0] * (size + 1) for _ in range(size + 1)]
+        for i in range(size):
+            best[i][i + 1] = found[i]
+            roots[i][i + 1] = i
+        for length in range(2, size + 1):
+            for i in range(size - length + 1):
+                j = i + length
+                left = previous[i]
+                total, root = -1, None
+                for k in range(roots[i][j - 1], roots[i + 1][j] + 1):
+                    candidate = found[k] + left[k] + previous[k + 1][j]
+                    if candidate > total:
+                        total, root = candidate, k
+                best[i][j] = total
+                roots[i][j] = root
+    return best[0][size] / scale
+
+
+def hint_outcomes(target_number, number_range):
+    # The facts HintSystem.generate_hint can reveal about a target, with
+    # the probability of each.
+    divisors, total = HintSystem.get_table(number_range).facts(target_number)
+    outcomes = [(("divisor", x), 1 / (3 * len(divisors))) for x in divisors]
+    outcomes.append((("parity", target_number % 2), 1 / 3))
+    outcomes.append((("digit_sum", total), 1 / 3))
+    return outcomes
+
+
+def observation_groups(number_range, hints):
+    # Hints are free, so optimal play asks for all of them before guessing.
+    # Sequences with the same multiset of facts give the same posterior, so
+    # they are merged; each group maps targets to their joint probability.
+    low, high = number_range
+    size = high - low + 1
+    groups = defaultdict(dict)
+    for target_number in range(low, high + 1):
+        observations = {(): 1 / size}
+        outcomes = hint_outcomes(target_number, number_range)
+        for _ in range(hints):
+            extended = defaultdict(float)
+            for observed, probability in observations.items():
+                for outcome, outcome_probability in outcomes:
+                    key = tuple(sorted(observed + (outcome,)))
+                    extended[key] += probability * outcome_probability
+            observations = extended
+        for observed, probability in observations.items():
+            groups[observed][target_number] = probability
+    return groups.values()
+
+
+def solve(number_range, attempts, hints, multiplier=1):
+    low, high = number_range
+    size = high - low + 1
+    points = multiplier * 100
+    guessable = 2 ** attempts - 1
+    if hints == 0:
+        return Solution(min(size, guessable) / size,
+                        points * uniform_total(size, attempts) / size)
+    if size > MAX_SOLVER_RANGE:
+        raise ValueError(
+            f"Ranges with hints are limited to {MAX_SOLVER_RANGE} numbers")
+
+    win_probability = 0.0
+    expected_remaining = 0.0
+    for group in observation_groups(number_range, hints):
+        weights = [group[target_number] for target_number in sorted(group)]
+        # Any guessable-sized subset of candidates can be covered, so the
+        # best win chance keeps the most likely ones.
+        win_probability += sum(sorted(weights, reverse=True)[:guessable])
+        expected_remaining += weighted_total(weights, attempts)
+    return Solution(min(win_probability, 1.0),
+                    points * expected_remaining)
+
+
+class SolverCache:
+    # Solutions on disk, keyed by every setting that affects them.
+    def __init__(self, path='solver_cache.json'):
+        self.path = path
+        self.solutions = None
+
+    @staticmethod
+    def key(number_range, attempts, hints, multiplier):
+        return f"{number_range[0]}:{number_range[1]}:{attempts}:" \
+               f"{hints}:{multiplier}"
+
+    def load(self):
+        if self.solutions is None:
+            try:
+                with open(self.path, 'r') as file:
+                    self.solutions = json.load(file)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self.solutions = {}
+        return self.solutions
+
+    def solve(self, number_range, attempts, hints, multiplier=1):
+        key = self.key(number_range, attempts, hints, multiplier)
+        solutions = self.load()
+        if key not in solutions:
+            solution = solve(number_range, attempts, hints, multiplier)
+            solutions[key] = solution.as_dict()
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w') as file:
+                json.dump(solutions, file, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+        return Solution.from_dict(solutions[key])
+
+
+def solve_difficulties(game_settings=None, cache=None):
+    game_settings = game_settings or GameSettings()
+    solver = cache.solve if cache is not None else solve
+    return {
+        difficulty: solver(game_settings.number_range,
+                           game_settings.get_attempts(difficulty),
+                           game_settings.get_hints_allowed(difficulty),
+                           game_settings.get_score_multiplier(difficulty))
+        for difficulty in game_settings.difficulty_levels
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Solve optimal play for each difficulty level.")
+    parser.add_argument("--cache", default="solver_cache.json",
+                        help="file used to cache solutions")
+    args = parser.parse_args(argv)
+    for difficulty, solution in solve_difficulties(
+            cache=SolverCache(args.cache)).items():
+        print(f"{difficulty.capitalize()}: "
+              f"{solution.win_probability * 100:.2f}% win probability, "
+              f"expected score {solution.expected_score:.1f}")
+
+
+if __name__ == "__main__":
+    main()
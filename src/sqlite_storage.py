@@ -0,0 +1,125 @@
+import json
+import sqlite3
+
+from storage import ScoreStorage
+
+
+PLAYERS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    total_games_played INTEGER NOT NULL,
+    total_wins INTEGER NOT NULL,
+    best_scores TEXT NOT NULL
+);
+"""
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    difficulty TEXT NOT NULL,
+    player_name TEXT NOT NULL,
+    score INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_difficulty_score
+    ON scores (difficulty, score DESC);
+CREATE INDEX IF NOT EXISTS scores_by_player ON scores (player_name);
+""" + PLAYERS_SCHEMA
+
+# The sqlite3 module keeps prepared statements cached per SQL string, so
+# every query is a module constant.
+INSERT_SCORE = (
+    "INSERT INTO scores (difficulty, player_name, score) VALUES (?, ?, ?)")
+DELETE_SCORES = "DELETE FROM scores"
+SELECT_SCORES = "SELECT difficulty, player_name, score FROM scores ORDER BY id"
+SELECT_TOP_SCORES = (
+    "SELECT player_name, score FROM scores WHERE difficulty = ? "
+    "ORDER BY score DESC, id LIMIT ? OFFSET ?")
+SELECT_PLAYER = (
+    "SELECT name, total_games_played, total_wins, best_scores "
+    "FROM players WHERE name = ?")
+UPSERT_PLAYER = (
+    "INSERT INTO players (name, total_games_played, total_wins, best_scores) "
+    "VALUES (?, ?, ?, ?) ON CONFLICT (name) DO UPDATE SET "
+    "total_games_played = excluded.total_games_played, "
+    "total_wins = excluded.total_wins, best_scores = excluded.best_scores")
+
+
+def profile_from_row(row):
+    return {
+        "name": row[0],
+        "total_games_played": row[1],
+        "total_wins": row[2],
+        "best_scores": json.loads(row[3]),
+    }
+
+
+def profile_to_row(profile):
+    return (profile["name"], profile["total_games_played"],
+            profile["total_wins"], json.dumps(profile["best_scores"]))
+
+
+class SqliteScoreStorage(ScoreStorage):
+    # Keeps every recorded score. Inserts are buffered and committed in one
+    # transaction per batch; WAL mode keeps readers off the writer's path.
+    errors = (OSError, sqlite3.Error)
+
+    def __init__(self, path='scores.db', batch_size=500):
+        self.path = path
+        self.batch_size = batch_size
+        self.pending = []
+        # Callers serialise access, but the score loader and write-behind
+        # worker use the connection from their own threads.
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def flush(self):
+        if not self.pending:
+            return
+        with self.connection:
+            self.connection.executemany(INSERT_SCORE, self.pending)
+        self.pending = []
+
+    def keeps_recorded_scores(self):
+        return True
+
+    def load_scores(self):
+        self.flush()
+        return self.connection.execute(SELECT_SCORES).fetchall()
+
+    def record_score(self, difficulty, player_name, score):
+        self.pending.append((difficulty, player_name, score))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def save_scores(self, scores):
+        # Replaces every row in one transaction; the buffered events are
+        # part of `scores`.
+        with self.connection:
+            self.connection.execute(DELETE_SCORES)
+            self.connection.executemany(INSERT_SCORE, scores)
+        self.pending = []
+
+    def top_scores(self, difficulty, limit=10, offset=0):
+        self.flush()
+        return self.connection.execute(
+            SELECT_TOP_SCORES, (difficulty, limit, offset)).fetchall()
+
+    def load_player(self, name):
+        row = self.connection.execute(SELECT_PLAYER, (name,)).fetchone()
+        if row is None:
+            return None
+        return profile_from_row(row)
+
+    def save_player(self, profile):
+        self.save_players([profile])
+
+    def save_players(self, profiles):
+        with self.connection:
+            self.connection.executemany(
+                UPSERT_PLAYER,
+                [profile_to_row(profile) for profile in profiles])
+
+    def close(self):
+        self.flush()
+        self.connection.close()
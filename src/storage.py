@@ -0,0 +1,207 @@
+import os
+import threading
+
+
+class ScoreStorage:
+    # Persistence interface behind ScoreManager. Scores travel as
+    # (difficulty, player_name, score) events and player profiles as the
+    # plain dicts produced by Player.to_dict. `errors` lists the exception
+    # types a backend raises when a write fails.
+    errors = (OSError,)
+
+    def load_scores(self):
+        raise NotImplementedError
+
+    def record_score(self, difficulty, player_name, score):
+        raise NotImplementedError
+
+    def save_scores(self, scores):
+        # `scores` is every score as (difficulty, player_name, score),
+        # replacing whatever was saved or recorded before.
+        raise NotImplementedError
+
+    def needs_compaction(self):
+        return False
+
+    def flush(self):
+        # Makes the scores recorded so far durable without rewriting the
+        # history.
+        pass
+
+    def keeps_recorded_scores(self):
+        # Whether record_score and flush alone keep a score, or it is only
+        # kept by the next save_scores.
+        return False
+
+    def load_player(self, name):
+        raise NotImplementedError
+
+    def save_player(self, profile):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+def scores_from_json(data):
+    # {difficulty: [[player_name, score], ...]}, the same under "scores"
+    # next to the journal sequence numbers, or the original
+    # {difficulty: [player_name, score]} file that kept only the best.
+    if isinstance(data.get("scores"), dict):
+        data = data["scores"]
+    events = []
+    for difficulty, entries in data.items():
+        if entries and isinstance(entries[0], str):
+            entries = [entries]
+        events.extend((difficulty, player_name, score)
+                      for player_name, score in entries)
+    return events
+
+
+def journals_from_json(data):
+    # The last sequence number each journal had folded into the file.
+    if isinstance(data.get("scores"), dict):
+        return dict(data.get("journals", {}))
+    return {}
+
+
+def scores_to_json(scores, journals=None):
+    data = {}
+    for difficulty, player_name, score in scores:
+        data.setdefault(difficulty, []).append([player_name, score])
+    if journals:
+        return {"journals": journals, "scores": data}
+    return data
+
+
+def write_json_atomically(path, data):
+    import json
+
+    # Write a temporary file first so a crash never leaves a half-written
+    # file behind. The name is unique per process and thread, so writers
+    # sharing the target never rename each other's half-written files.
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'w') as file:
+        json.dump(data, file)
+    os.replace(temp_path, path)
+
+
+class JsonScoreStorage(ScoreStorage):
+    # score_history.json holds every score per difficulty, plus an optional
+    # ScoreJournal of events since the last snapshot; with a journal, the
+    # file also records the journal's sequence number it was saved at.
+    # Files in the original best-score-only format still load. Player profiles are only kept when
+    # players_path is set.
+    def __init__(self, path='score_history.json', journal=None,
+                 players_path=None):
+        self.path = path
+        self.journal = journal
+        self.players_path = players_path
+        self.players = None
+
+    def load_scores(self):
+        # json is imported on first use rather than at startup; the game
+        # loads scores on a background thread, so the import happens there.
+        events = self._load_file()
+        if self.journal is not None:
+            events.extend(self.journal.replay())
+        return events
+
+    def _load_file(self):
+        import json
+
+        try:
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            data = {}
+        except json.JSONDecodeError:
+            print(
+                "Score history file is corrupted. Starting with fresh scores.")
+            data = {}
+        if self.journal is not None:
+            self.journal.folded_into_snapshot(
+                journals_from_json(data).get(self.journal.path, 0))
+        return scores_from_json(data)
+
+    def _journals(self):
+        # This storage's entry for the file's journal sequence numbers.
+        if self.journal is None:
+            return {}
+        return {self.journal.path: self.journal.sequence}
+
+    def record_score(self, difficulty, player_name, score):
+        if self.journal is not None:
+            self.journal.append(difficulty, player_name, score)
+
+    def save_scores(self, scores):
+        if self.journal is not None:
+            self.journal.flush()
+        write_json_atomically(self.path,
+                              scores_to_json(scores, self._journals()))
+        if self.journal is not None:
+            self.journal.truncate()
+
+    def needs_compaction(self):
+        return self.journal is not None and self.journal.needs_compaction()
+
+    def flush(self):
+        if self.journal is not None:
+            self.journal.flush()
+
+    def keeps_recorded_scores(self):
+        return self.journal is not None
+
+    def _load_players(self):
+        import json
+
+        if self.players is None:
+            try:
+                with open(self.players_path, 'r') as file:
+                    self.players = json.load(file)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self.players = {}
+        return self.players
+
+    def load_player(self, name):
+        if self.players_path is None:
+            return None
+        profile = self._load_players().get(name)
+        return dict(profile) if profile is not None else None
+
+    def save_player(self, profile):
+        if self.players_path is None:
+            return
+        self._load_players()[profile["name"]] = profile
+        write_json_atomically(self.players_path, self.players)
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+
+
+class MemoryScoreStorage(ScoreStorage):
+    # Keeps everything in process; used for replays and tests that must not
+    # touch the disk.
+    def __init__(self):
+        self.events = []
+        self.players = {}
+
+    def load_scores(self):
+        return list(self.events)
+
+    def record_score(self, difficulty, player_name, score):
+        self.events.append((difficulty, player_name, score))
+
+    def save_scores(self, scores):
+        self.events = list(scores)
+
+    def keeps_recorded_scores(self):
+        return True
+
+    def load_player(self, name):
+        profile = self.players.get(name)
+        return dict(profile) if profile is not None else None
+
+    def save_player(self, profile):
+        self.players[profile["name"]] = dict(profile)
@@ -0,0 +1,175 @@
+import atexit
+import threading
+import time
+
+from storage import ScoreStorage
+
+
+class WriteBehindStorage(ScoreStorage):
+    # Wraps another storage so the game thread never waits on the disk.
+    # record_score, save_scores and save_player only queue work; a worker
+    # thread writes the latest requested snapshot and then hands the events
+    # recorded since to the inner storage, either `interval` seconds after
+    # the first change or as soon as `max_pending` events are waiting.
+    # close() (also run at exit) flushes whatever is left.
+    def __init__(self, inner, interval=1.0, max_pending=256):
+        self.inner = inner
+        self.interval = interval
+        self.max_pending = max_pending
+        # The scores last passed to save_scores, until they are written.
+        self.snapshot = None
+        self.pending = []
+        self.pending_players = {}
+        self.dirty_since = None
+        self.closing = False
+        self.condition = threading.Condition()
+        # Serialises every call into the inner storage.
+        self.io_lock = threading.Lock()
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+        atexit.register(self.close)
+
+    def load_scores(self):
+        with self.io_lock:
+            with self.condition:
+                snapshot = self.snapshot
+            if snapshot is None:
+                events = list(self.inner.load_scores())
+            else:
+                events = list(snapshot)
+        with self.condition:
+            events.extend(self.pending)
+        return events
+
+    def record_score(self, difficulty, player_name, score):
+        with self.condition:
+            self.pending.append((difficulty, player_name, score))
+            self._mark_dirty()
+
+    def save_scores(self, scores):
+        with self.condition:
+            # The snapshot covers every event recorded so far.
+            self.snapshot = list(scores)
+            self.pending = []
+            self._mark_dirty()
+
+    def needs_compaction(self):
+        # Once a snapshot is queued, asking again would only copy it.
+        with self.condition:
+            if self.snapshot is not None:
+                return False
+        return self.inner.needs_compaction()
+
+    def keeps_recorded_scores(self):
+        return self.inner.keeps_recorded_scores()
+
+    def load_player(self, name):
+        with self.condition:
+            profile = self.pending_players.get(name)
+        if profile is not None:
+            return dict(profile)
+        with self.io_lock:
+            return self.inner.load_player(name)
+
+    def save_player(self, profile):
+        with self.condition:
+            self.pending_players[profile["name"]] = dict(profile)
+            self._mark_dirty()
+
+    def _mark_dirty(self):
+        if self.dirty_since is None:
+            self.dirty_since = time.monotonic()
+            self.condition.notify()
+        elif len(self.pending) >= self.max_pending:
+            self.condition.notify()
+
+    def _due(self):
+        # Seconds until the next write is due, or None when nothing is dirty.
+        if self.dirty_since is None:
+            return None
+        if self.closing or len(self.pending) >= self.max_pending:
+            return 0
+        return self.dirty_since + self.interval - time.monotonic()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while True:
+                    wait = self._due()
+                    if wait is not None and wait <= 0:
+                        break
+                    if self.closing:
+                        return
+                    self.condition.wait(wait)
+            try:
+                flushed = self.flush()
+            except Exception as e:
+                # Never let the worker die: the data stays queued.
+                print(f"Could not save scores: {e!r}")
+                flushed = False
+            if not flushed:
+                # Keep the data queued and try again after a full interval.
+                with self.condition:
+                    if self.closing:
+                        return
+                    self.condition.wait(self.interval)
+
+    def flush(self):
+        # Writes everything queued so far and flushes the inner storage.
+        # Taking the batch under io_lock keeps snapshots on disk in the
+        # order they were taken.
+        with self.io_lock:
+            with self.condition:
+                if self.dirty_since is None:
+                    self.inner.flush()
+                    return True
+                snapshot, self.snapshot = self.snapshot, None
+                events, self.pending = self.pending, []
+                players = list(self.pending_players.values())
+                self.pending_players = {}
+                self.dirty_since = None
+            recorded = saved = 0
+            try:
+                if snapshot is not None:
+                    self.inner.save_scores(snapshot)
+                    snapshot = None
+                for difficulty, player_name, score in events:
+                    # Backends buffer an event before writing it, so one
+                    # whose write fails is still held by the inner storage.
+                    recorded += 1
+                    self.inner.record_score(difficulty, player_name, score)
+                for profile in players:
+                    self.inner.save_player(profile)
+                    saved += 1
+                self.inner.flush()
+            except Exception as e:
+                self._requeue(snapshot, events[recorded:], players[saved:])
+                if not isinstance(e, self.inner.errors):
+                    raise
+                print(f"Could not save scores: {e}")
+                return False
+        return True
+
+    def _requeue(self, snapshot, events, players):
+        # Puts back only what the inner storage did not take. A snapshot
+        # queued since already covers the failed one and its events; a
+        # newer profile wins over a failed one.
+        with self.condition:
+            if self.snapshot is None:
+                self.snapshot = snapshot
+                self.pending[:0] = events
+            for profile in players:
+                self.pending_players.setdefault(profile["name"], profile)
+            if self.dirty_since is None:
+                self.dirty_since = time.monotonic()
+
+    def close(self):
+        with self.condition:
+            if self.closing:
+                return
+            self.closing = True
+            self.condition.notify()
+        self.worker.join()
+        atexit.unregister(self.close)
+        with self.io_lock:
+            self.inner.close()
@@ -0,0 +1,100 @@
+import random
+import statistics
+import tracemalloc
+
+from analytics import (RunningStats, analyze, filter_rounds, read_rounds,
+                       rounds_from_event_log)
+from event_log import GUESS, HINT, LOSS, ROUND_START, WIN, EventLog
+from number_guessing_game import GameRound
+
+SECOND = 10 ** 9
+
+
+def test_rounds_are_rebuilt_from_interleaved_sessions():
+    events = [
+        (1, 0, 1, 10, HINT),
+        (2, 1 * SECOND, 50, 4, GUESS),
+        (1, 2 * SECOND, 30, 9, GUESS),
+        (1, 5 * SECOND, 30, 9, WIN),
+        (2, 6 * SECOND, 70, 3, GUESS),
+        (2, 6 * SECOND, 99, 0, LOSS),
+    ]
+    rounds = list(rounds_from_event_log(events))
+
+    assert [(r.session_id, r.difficulty, r.won, r.guesses, r.hints)
+            for r in rounds] == [(1, "easy", True, 1, 1),
+                                 (2, "hard", False, 2, 0)]
+    assert rounds[0].duration == 5 * SECOND
+
+
+def test_round_start_closes_an_abandoned_round():
+    events = [
+        (1, 0, 1, 10, ROUND_START),
+        (1, 1 * SECOND, 30, 9, GUESS),
+        # The player walked away and started a hard round instead.
+        (1, 8 * SECOND, 2, 5, ROUND_START),
+        (1, 9 * SECOND, 40, 4, GUESS),
+        (1, 12 * SECOND, 40, 4, WIN),
+        (2, 13 * SECOND, 0, 10, ROUND_START),
+    ]
+    rounds = list(rounds_from_event_log(events))
+
+    assert [(r.difficulty, r.started_at, r.duration, r.guesses)
+            for r in rounds] == [("hard", 8 * SECOND, 4 * SECOND, 1)]
+
+
+def test_welford_matches_statistics_module():
+    values = [random.Random(seed).uniform(-5, 5) for seed in range(1000)]
+    left, right = RunningStats(), RunningStats()
+    for value in values[:300]:
+        left.add(value)
+    for value in values[300:]:
+        right.add(value)
+    left.merge(right)
+
+    assert abs(left.mean - statistics.mean(values)) < 1e-9
+    assert abs(left.variance - statistics.variance(values)) < 1e-9
+
+
+def test_report_from_event_log(tmp_path):
+    path = str(tmp_path / "events.bin")
+    log = EventLog(path)
+    for session_id, target in enumerate([20, 40, 60, 80], 1):
+        game_round = GameRound("medium", (1, 100), 7, 2, event_log=log,
+                               session_id=session_id)
+        game_round.target_number = target
+        game_round.provide_hint()
+        for guess in [50, 25, 75, 20, 40, 60, 80]:
+            if game_round.process_guess(guess) == "correct":
+                break
+    log.close()
+
+    report = analyze(filter_rounds(read_rounds(path), "medium"))
+    summary = report["medium"].as_dict()
+
+    assert summary["rounds"] == 4
+    assert summary["win_rate"] == 1.0
+    assert summary["guesses_to_win"] == {4: 1, 5: 1, 6: 1, 7: 1}
+    assert summary["hint_usage_rate"] == 1.0
+
+
+def generated_events(rounds):
+    for session_id in range(rounds):
+        timestamp = session_id * SECOND
+        yield session_id, timestamp, 10, 9, GUESS
+        yield session_id, timestamp + session_id % 97, 10, 9, WIN
+
+
+def test_memory_stays_flat_as_input_grows():
+    tracemalloc.start()
+    try:
+        peaks = []
+        for rounds in (10 ** 3, 5 * 10 ** 4):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            analyze(rounds_from_event_log(generated_events(rounds)))
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+
+    assert peaks[1] < peaks[0] * 2 + 10000
@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from batch_round import (  # noqa: E402
+    CORRECT, GREATER, INACTIVE, LESS, RESULT_CODES, BatchRound,
+    play_binary_search, simulate_binary_search)
+from number_guessing_game import GameRound  # noqa: E402
+from simulation import BinarySearchStrategy, Simulator  # noqa: E402
+
+
+def test_process_guesses_codes():
+    batch = BatchRound("medium", (1, 100), 7, [50, 50, 50])
+    results = batch.process_guesses([25, 75, 50])
+
+    assert list(results) == [GREATER, LESS, CORRECT]
+    assert list(batch.remaining_attempts) == [6, 6, 6]
+    assert list(batch.is_won) == [False, False, True]
+
+
+def test_finished_rounds_are_inactive():
+    batch = BatchRound("hard", (1, 100), 1, [10, 20])
+    batch.process_guesses([10, 1])
+    results = batch.process_guesses([10, 20])
+
+    assert list(results) == [INACTIVE, INACTIVE]
+    assert list(batch.remaining_attempts) == [0, 0]
+    assert batch.check_game_over().all()
+
+
+def test_matches_scalar_game_round_for_same_seed():
+    size, attempts = 200, 7
+    scalar_rng = random.Random(11)
+    rounds = [GameRound("medium", (1, 100), attempts, 2, rng=scalar_rng)
+              for _ in range(size)]
+    for game_round in rounds:
+        game_round.generate_target_number()
+    batch = BatchRound.from_rng("medium", (1, 100), attempts, size,
+                                random.Random(11))
+
+    guess_rng = random.Random(12)
+    for _ in range(attempts):
+        guesses = [guess_rng.randint(1, 100) for _ in range(size)]
+        results = batch.process_guesses(guesses)
+        for game_round, guess, code in zip(rounds, guesses, results):
+            if game_round.check_game_over():
+                assert code == INACTIVE
+                continue
+            result = game_round.process_guess(guess)
+            game_round.is_won = result == "correct"
+            assert RESULT_CODES[result] == code
+
+    assert list(batch.remaining_attempts) == [
+        game_round.remaining_attempts for game_round in rounds]
+    assert list(batch.is_won) == [game_round.is_won for game_round in rounds]
+    assert list(batch.calculate_scores(2)) == [
+        game_round.calculate_score(2) for game_round in rounds]
+
+
+def test_binary_search_matches_scalar_simulation(game_settings):
+    size = 500
+    report = Simulator(game_settings, seed=5).run(
+        BinarySearchStrategy(), size, ["hard"])
+    batch = BatchRound.from_rng("hard", game_settings.number_range, 5, size,
+                                random.Random(5))
+    play_binary_search(batch)
+
+    scores = batch.calculate_scores(3)[batch.is_won]
+    assert report.stats["hard"].wins == int(batch.is_won.sum())
+    assert report.stats["hard"].total_score == int(scores.sum())
+
+
+def test_simulate_binary_search(game_settings):
+    stats = simulate_binary_search(game_settings, "easy", 10000, seed=1)
+
+    assert stats.rounds == 10000
+    assert stats.wins == 10000
+    assert 0 < stats.mean_attempts <= 7
+
+
+def test_binary_search_near_the_int64_limit():
+    low, high = 2 ** 62, 2 ** 63 - 1
+    batch = BatchRound("easy", (low, high), 64, [low, high, low + 12345])
+    play_binary_search(batch)
+
+    assert batch.is_won.all()
+
+
+def test_ranges_beyond_int64_are_rejected():
+    from number_guessing_game import GameSettings
+    from simulation import run_vectorized
+
+    game_settings = GameSettings((1, 2 ** 63))
+    with pytest.raises(ValueError, match="does not fit"):
+        simulate_binary_search(game_settings, "easy", 10, seed=1)
+    with pytest.raises(ValueError, match="does not fit"):
+        run_vectorized(10, seed=1, game_settings=game_settings)
+    with pytest.raises(ValueError, match="does not fit"):
+        BatchRound("easy", (-2 ** 63, 2 ** 63 - 1), 5, [0])
@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+from candidates import CandidateTracker
+from number_guessing_game import GameRound, HintSystem, digit_sum
+
+
+def brute_force(number_range, facts, guesses):
+    low, high = number_range
+    remaining = []
+    for n in range(low, high + 1):
+        if any(hint_type == "divisor" and n % value or
+               hint_type == "parity" and n % 2 != value or
+               hint_type == "digit_sum" and digit_sum(n) != value
+               for hint_type, value in facts):
+            continue
+        if any(result == "greater" and n <= guess or
+               result == "less" and n >= guess
+               for guess, result in guesses):
+            continue
+        remaining.append(n)
+    return remaining
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_tracker_matches_brute_force(seed):
+    rng = random.Random(seed)
+    number_range = (rng.randint(0, 50), rng.randint(200, 3000))
+    target = rng.randint(*number_range)
+    tracker = CandidateTracker(number_range)
+    facts = [HintSystem.generate_hint_fact(target, rng, number_range)
+             for _ in range(rng.randint(0, 3))]
+    for fact in facts:
+        tracker.apply_hint(*fact)
+    guesses = []
+    for _ in range(rng.randint(0, 3)):
+        guess = rng.randint(*number_range)
+        if guess != target:
+            result = "greater" if guess < target else "less"
+            tracker.apply_guess(guess, result)
+            guesses.append((guess, result))
+
+    expected = brute_force(number_range, facts, guesses)
+    assert target in expected
+    assert tracker.count == len(expected)
+    assert [tracker.candidate_at(i) for i in range(tracker.count)] == expected
+    assert all(n in tracker for n in expected)
+    assert tracker.random_candidate(rng) in expected
+
+
+def test_large_ranges_stay_cheap():
+    high = 2 ** 62
+    tracker = CandidateTracker((1, high))
+    tracker.apply_hint("divisor", 7)
+    tracker.apply_hint("parity", 1)
+    assert tracker.count == (high // 7 + 1) // 2
+    tracker.apply_hint("digit_sum", 40)
+    tracker.apply_guess(high // 3, "greater")
+    rng = random.Random(5)
+    for _ in range(20):
+        candidate = tracker.random_candidate(rng)
+        assert candidate in tracker
+        assert candidate > high // 3 and candidate % 14 == 7
+        assert digit_sum(candidate) == 40
+    assert tracker.information_bits > 3
+
+
+def test_wasted_guesses_are_counted():
+    tracker = CandidateTracker((1, 100))
+    tracker.apply_guess(50, "greater")
+    tracker.apply_guess(30, "greater")
+    tracker.apply_hint("parity", 0)
+    tracker.apply_guess(75, "less")
+    tracker.apply_guess(60, "less")
+    assert tracker.wasted_guesses == 2
+    assert tracker.count == len(range(52, 60, 2))
+
+
+def test_game_round_tracks_guesses_and_hints():
+    game_round = GameRound("easy", (1, 100), 10, 3, rng=random.Random(3),
+                           track_candidates=True)
+    game_round.target_number = 42
+    game_round.process_guess(20)
+    game_round.process_guess(80)
+    for _ in range(3):
+        game_round.provide_hint()
+    candidates = game_round.candidates
+    assert 42 in candidates
+    assert all(21 <= n <= 79 for n in map(candidates.candidate_at,
+                                          range(candidates.count)))
+    assert GameRound("easy", (1, 100), 10, 3).candidates is None
+
+
+def test_hint_text_is_unchanged():
+    for seed in range(30):
+        text = HintSystem.generate_hint(84, random.Random(seed), (1, 100))
+        tracked = GameRound("easy", (1, 100), 10, 1, rng=random.Random(seed),
+                            track_candidates=True)
+        tracked.target_number = 84
+        assert tracked.provide_hint() == text
@@ -0,0 +1,104 @@
+import io
+import random
+
+import pytest
+
+from cli_io import BufferedOutput, RecordingInput, ScriptedInput
+from number_guessing_game import CLI, GameManager, ScoreManager
+from replay import read_transcript, replay, replay_session
+from storage import MemoryScoreStorage
+
+
+def test_scripted_input_raises_eof_when_exhausted():
+    driver = ScriptedInput(["alice"])
+    assert driver.read("Enter your name: ") == "alice"
+    with pytest.raises(EOFError):
+        driver.read("Enter your name: ")
+
+
+def test_recording_input_writes_transcript():
+    transcript = io.StringIO()
+    driver = RecordingInput(ScriptedInput(["bob", "easy"]), transcript)
+    driver.read("")
+    driver.read("")
+    assert transcript.getvalue() == "bob\neasy\n"
+
+
+def test_cli_using_leaves_default_cli_untouched():
+    output = BufferedOutput()
+    cli = CLI.using(ScriptedInput(["", "carol"]), output)
+
+    assert cli.get_player_name() == "carol"
+    assert output.getvalue() == "Name cannot be empty. Please try again.\n"
+    assert CLI.output is not output
+
+
+def test_replay_session_through_start_game():
+    target = random.Random(7).randint(1, 100)
+    output = BufferedOutput()
+    score_manager = ScoreManager(MemoryScoreStorage())
+
+    finished = replay_session(["dave", "easy", str(target), "no"], seed=7,
+                              score_manager=score_manager, output=output)
+
+    assert finished
+    assert "Congratulations" in output.getvalue()
+    assert "Goodbye" in output.getvalue()
+    assert score_manager.high_score["easy"][0] == "dave"
+
+
+def test_truncated_transcript_is_reported(tmp_path):
+    (tmp_path / "a.txt").write_text("# seed: 1\neve\neasy\n50\n")
+    (tmp_path / "b.txt").write_text("frank\nhard\n")
+
+    report = replay([str(tmp_path)])
+
+    assert read_transcript(str(tmp_path / "a.txt")) == \
+        (1, ["eve", "easy", "50"])
+    assert report.sessions == 2
+    assert report.truncated == 2
+
+
+def test_replay_loads_the_history_once(tmp_path, monkeypatch):
+    loads = []
+    load_scores = MemoryScoreStorage.load_scores
+    monkeypatch.setattr(MemoryScoreStorage, "load_scores",
+                        lambda self: loads.append(self) or load_scores(self))
+    for index in range(5):
+        target = random.Random(index).randint(1, 100)
+        (tmp_path / f"{index}.txt").write_text(
+            f"# seed: {index}\np{index}\neasy\n{target}\nno\n")
+
+    report = replay([str(tmp_path)])
+
+    assert len(loads) == 1
+    assert report.truncated == 0
+    # Each session's win is still on the shared leaderboard.
+    assert len(report.score_manager.top_scores("easy")) == 5
+
+
+def test_only_a_leading_seed_line_is_metadata(tmp_path):
+    # A player may well be named "#1" or type "# seed: 5" as an answer.
+    path = tmp_path / "a.txt"
+    path.write_text("# seed: 3\n#1\neasy\n# seed: 5\n")
+    assert read_transcript(str(path)) == (3, ["#1", "easy", "# seed: 5"])
+
+    path.write_text("#1\neasy\n")
+    assert read_transcript(str(path)) == (None, ["#1", "easy"])
+    driver = ScriptedInput.from_file(str(path))
+    assert driver.read("Name: ") == "#1"
+
+
+def test_game_manager_uses_injected_cli():
+    target = random.Random(3).randint(1, 100)
+    output = BufferedOutput()
+    game_manager = GameManager(
+        ScoreManager(MemoryScoreStorage()),
+        cli=CLI.using(ScriptedInput(["gina", "easy", "hint", str(target),
+                                     "no"]), output),
+        rng=random.Random(3))
+
+    game_manager.start_game()
+
+    assert "Hint:" in output.getvalue()
+    assert game_manager.current_player.total_wins == 1
@@ -0,0 +1,73 @@
+import struct
+
+import pytest
+
+from event_log import (GUESS, HEADER_SIZE, HINT, LOSS, RECORD_SIZE,
+                       ROUND_START, WIN, EventLog, EventLogReader)
+from number_guessing_game import GameRound
+
+
+def play(path, guesses, target=50, attempts=3, session_id=7):
+    log = EventLog(path, buffer_records=2)
+    game_round = GameRound("easy", (1, 100), attempts, 1, event_log=log,
+                           session_id=session_id)
+    game_round.target_number = target
+    game_round.provide_hint()
+    for guess in guesses:
+        if game_round.process_guess(guess) == "correct":
+            break
+    log.close()
+
+
+def test_round_events_are_recorded(tmp_path):
+    path = str(tmp_path / "events.bin")
+    play(path, [10, 50])
+
+    with EventLogReader(path) as reader:
+        events = [(session, value, remaining, event)
+                  for session, _, value, remaining, event in reader]
+
+    # "easy" is difficulty code 0.
+    assert events == [(7, 0, 3, ROUND_START), (7, 0, 3, HINT),
+                      (7, 10, 2, GUESS), (7, 50, 1, GUESS), (7, 50, 1, WIN)]
+
+
+def test_loss_is_recorded_once(tmp_path):
+    path = str(tmp_path / "events.bin")
+    play(path, [10, 20], attempts=2)
+
+    with EventLogReader(path) as reader:
+        assert len(reader) == 5
+        assert reader[-1][2:] == (50, 0, LOSS)
+
+
+def test_appends_skip_torn_record(tmp_path):
+    path = str(tmp_path / "events.bin")
+    play(path, [50], session_id=1)
+    with open(path, 'ab') as file:
+        file.write(b"\x00" * (RECORD_SIZE // 2))
+    play(path, [50], session_id=2)
+
+    with EventLogReader(path) as reader:
+        assert [record[0] for record in reader] == [1] * 4 + [2] * 4
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "events.bin"
+    path.write_bytes(struct.pack("<8sII", b"NOTALOG!", RECORD_SIZE, 0))
+    with pytest.raises(ValueError):
+        EventLogReader(str(path))
+    assert path.stat().st_size == HEADER_SIZE
+
+
+def test_numpy_view(tmp_path):
+    np = pytest.importorskip("numpy")
+    path = str(tmp_path / "events.bin")
+    play(path, [10, 20, 30])
+
+    reader = EventLogReader(path)
+    events = reader.as_array()
+    assert int(np.count_nonzero(events["event"] == GUESS)) == 3
+    assert events["value"][events["event"] == LOSS].tolist() == [50]
+    del events
+    reader.close()
@@ -18,7 +18,7 @@ def test_start_game(mock_cli, game_manager):
 
     # Mock high_score
     game_manager.high_score.load_score_history = MagicMock()
-    game_manager.high_score.save_score_history = MagicMock()
+    game_manager.high_score.flush_score_history = MagicMock()
 
     # Run the game
     game_manager.start_game()
@@ -30,7 +30,7 @@ def test_start_game(mock_cli, game_manager):
     mock_cli.play_again.assert_called_once()
     mock_cli.show_goodbye_message.assert_called_once()
     game_manager.high_score.load_score_history.assert_called_once()
-    game_manager.high_score.save_score_history.assert_called_once()
+    game_manager.high_score.flush_score_history.assert_called_once()
 
 
 def test_game_manager_initialization(game_manager):
@@ -52,6 +52,7 @@ def test_handle_game_round_win(game_manager, mock_cli):
         instance.target_number = 50
         instance.check_game_over.side_effect = [False, True]
         instance.process_guess.return_value = "correct"
+        instance.calculate_score.return_value = 500
         instance.is_won = True
 
         # Execute
@@ -75,6 +76,7 @@ def test_handle_game_round_with_hint(game_manager, mock_cli):
         instance.target_number = 50
         instance.check_game_over.side_effect = [False, False, True]
         instance.process_guess.return_value = "correct"
+        instance.calculate_score.return_value = 500
         instance.provide_hint.return_value = "Test hint"
         instance.is_won = True
 
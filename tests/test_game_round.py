@@ -1,3 +1,4 @@
+from number_guessing_game import GameRound
 
 
 def test_game_round_initialization(game_round):
@@ -64,3 +65,105 @@ def test_calculate_score(game_round):
     game_round.end_time = 120
     score = game_round.calculate_score(2)
     assert score == 980  # (5 * 2 * 100) - 20
+
+
+def test_huge_range_round():
+    game_round = GameRound("hard", (1, 2 ** 63), 70, 3)
+    game_round.generate_target_number()
+    low, high = game_round.number_range
+    while not game_round.check_game_over():
+        guess = (low + high) // 2
+        result = game_round.process_guess(guess)
+        if result == "correct":
+            game_round.is_won = True
+        elif result == "greater":
+            low = guess + 1
+        else:
+            high = guess - 1
+
+    assert game_round.is_won
+    assert game_round.remaining_attempts >= 70 - 64
+    assert game_round.provide_hint().endswith(".")
+
+
+def test_rounds_share_difficulty_and_have_no_dict():
+    from number_guessing_game import CORRECT, GREATER, LESS
+
+    first = GameRound("".join("hard"), (1, 100), 5, 1)
+    second = GameRound("hard", (1, 100), 5, 1)
+    first.target_number = 40
+
+    assert first.difficulty_level is second.difficulty_level
+    assert not hasattr(first, "__dict__")
+    assert [first.process_guess_code(guess) for guess in (10, 90, 40)] == \
+        [GREATER, LESS, CORRECT]
+
+
+def test_virtual_clock_drives_the_score():
+    from clock import VirtualClock
+
+    clock = VirtualClock()
+    game_round = GameRound("medium", (1, 100), 7, 2, clock=clock)
+    game_round.target_number = 50
+    clock.advance(20.5)
+    game_round.process_guess(50)
+    clock.advance(1000)
+
+    assert game_round.get_round_duration() == 20
+    assert game_round.calculate_score(2) == 6 * 2 * 100 - 20
+
+
+def test_locked_round_counts_every_guess_once():
+    import threading
+
+    from number_guessing_game import LockedGameRound
+
+    game_round = LockedGameRound("easy", (1, 1000), 500, 0)
+    game_round.target_number = 999
+    results = []
+
+    def guess():
+        for _ in range(100):
+            results.append(game_round.process_guess(1))
+
+    workers = [threading.Thread(target=guess) for _ in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert game_round.remaining_attempts == 0
+    assert results.count("greater") == 500
+    assert results.count(None) == 300
+    assert not hasattr(game_round, "__dict__")
+
+
+def test_difficulty_codes_are_unique_across_threads():
+    import sys
+    import threading
+
+    from number_guessing_game import DIFFICULTY_NAMES, difficulty_code
+
+    names = [f"race-{index}" for index in range(200)]
+    codes = {}
+
+    def register(offset):
+        for name in names[offset:] + names[:offset]:
+            codes.setdefault(name, set()).add(difficulty_code(name))
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        workers = [threading.Thread(target=register, args=(offset * 25,))
+                   for offset in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert len(codes) == 200
+    for name, found in codes.items():
+        assert len(found) == 1
+        assert DIFFICULTY_NAMES[found.pop()] == name
@@ -1,3 +1,5 @@
+import pytest
+from number_guessing_game import GameSettings
 
 
 def test_game_settings_initialization(game_settings):
@@ -35,3 +37,14 @@ def test_get_score_multiplier(game_settings):
     assert game_settings.get_score_multiplier("easy") == 1
     assert game_settings.get_score_multiplier("medium") == 2
     assert game_settings.get_score_multiplier("hard") == 3
+
+
+def test_custom_number_range():
+    settings = GameSettings(number_range=(1, 2 ** 63))
+    assert settings.number_range == (1, 2 ** 63)
+
+
+def test_invalid_number_range():
+    for number_range in [(100, 1), (1, 2 ** 63 + 1), (-5, 10), (1.5, 10)]:
+        with pytest.raises(ValueError):
+            GameSettings(number_range=number_range)
@@ -1,3 +1,5 @@
+import random
+
 from number_guessing_game import HintSystem
 
 
@@ -34,3 +36,33 @@ def test_generate_hint_digit_sum():
 
     if "digits sum" in hint:
         assert "6" in hint  # 1 + 2 + 3 = 6
+
+
+def reference_hint(target_number, rng):
+    # The original lambda-based implementation
+    hint_types = [
+        lambda n: (
+            f"The number is divisible by "
+            f"{rng.choice([x for x in range(1, 11) if n % x == 0])}"
+        ),
+        lambda n: f"The number is {'even' if n % 2 == 0 else 'odd'}",
+        lambda n: f"The number's digits sum to {sum(int(d) for d in str(n))}"
+    ]
+    return rng.choice(hint_types)(target_number) + "."
+
+
+def test_generate_hint_matches_reference_distribution():
+    for number_range in [(1, 100), (50, 5000), None]:
+        rng, reference_rng = random.Random(8), random.Random(8)
+        for target_number in range(1, 2001):
+            hint = HintSystem.generate_hint(target_number, rng, number_range)
+            assert hint == reference_hint(target_number, reference_rng)
+
+
+def test_hint_tables_are_cached_per_range():
+    table = HintSystem.get_table((1, 100))
+
+    assert HintSystem.get_table((1, 100)) is table
+    assert table.facts(60) == ((1, 2, 3, 4, 5, 6, 10), 6)
+    assert table.facts(1000) == ((1, 2, 4, 5, 8, 10), 1)
+    assert HintSystem.get_table((1, 10 ** 9)) is None
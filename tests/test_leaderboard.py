@@ -0,0 +1,115 @@
+import random
+
+import pytest
+from leaderboard import Leaderboard
+
+
+@pytest.fixture
+def leaderboard():
+    board = Leaderboard()
+    for player, score in [("Ann", 300), ("Bob", 500), ("Cid", 300),
+                          ("Dan", 100), ("Ann", 700)]:
+        board.add(player, score)
+    return board
+
+
+def test_top_orders_by_score_then_age(leaderboard):
+    assert leaderboard.top(3) == [("Ann", 700), ("Bob", 500), ("Ann", 300)]
+    assert leaderboard.top(10, offset=3) == [("Cid", 300), ("Dan", 100)]
+    assert leaderboard.top(2, offset=5) == []
+
+
+def test_rank_queries(leaderboard):
+    assert leaderboard.count_above(300) == 2
+    assert leaderboard.count_above(50) == 5
+    assert leaderboard.rank_of_score(600) == 2
+    assert leaderboard.rank("Ann") == 1
+    assert leaderboard.rank("Cid") == 3
+    assert leaderboard.rank("Nobody") is None
+
+
+def test_memory_follows_distinct_scores_not_their_size():
+    board = Leaderboard()
+    board.add("Ann", 3)
+    board.add("Bob", 10**12)
+    board.add("Cid", 10**12)
+
+    assert board.top(3) == [("Bob", 10**12), ("Cid", 10**12), ("Ann", 3)]
+    assert board.count_above(3) == 2
+    assert len(board.tree) == 3
+
+
+def test_negative_and_fractional_scores():
+    board = Leaderboard()
+    board.add("Ann", -20)
+    board.add("Bob", 2.5)
+    board.add("Cid", -7.5)
+
+    assert board.top(3) == [("Bob", 2.5), ("Cid", -7.5), ("Ann", -20)]
+    assert board.rank("Ann") == 3
+    assert board.count_above(-10) == 2
+
+
+@pytest.mark.parametrize("score, error", [
+    ("100", TypeError), (None, TypeError), (True, TypeError),
+    (float("nan"), ValueError), (float("inf"), ValueError)])
+def test_bad_scores_are_rejected(score, error):
+    board = Leaderboard()
+    with pytest.raises(error):
+        board.add("Ann", score)
+    assert len(board) == 0
+
+
+def test_matches_sorted_reference():
+    rng = random.Random(3)
+    board = Leaderboard()
+    recorded = []
+    for index in range(2000):
+        score = rng.randint(-100, 1500)
+        board.add(f"P{index}", score)
+        recorded.append((f"P{index}", score))
+        if index % 97 == 0:
+            # Queries between inserts see every score added so far.
+            assert board.count_above(0) == sum(
+                1 for _, value in recorded if value > 0)
+
+    # Stable sort keeps the oldest entry first among equal scores
+    reference = sorted(recorded, key=lambda entry: -entry[1])
+    for offset in (0, 1, 17, 999, 1990):
+        assert board.top(25, offset) == reference[offset:offset + 25]
+    for score in (0, 750, 1500):
+        assert board.count_above(score) == sum(
+            1 for _, value in recorded if value > score)
+
+
+def test_score_manager_uses_leaderboards(score_manager):
+    score_manager.update_high_score("easy", 100, "Player1")
+    score_manager.update_high_score("easy", 300, "Player2")
+    score_manager.update_high_score("easy", 200, "Player3")
+
+    assert score_manager.high_score == {"easy": ("Player2", 300)}
+    assert score_manager.top_scores("easy", 2, offset=1) == [
+        ("Player3", 200), ("Player1", 100)]
+    assert score_manager.get_rank("easy", "Player3") == 2
+    assert score_manager.count_scores_above("easy", 100) == 2
+    assert score_manager.top_scores("hard") == []
+
+
+def test_from_entries_matches_incremental_adds():
+    rng = random.Random(9)
+    added = Leaderboard()
+    entries = {}
+    best_scores = {}
+    for index in range(500):
+        player_name = f"P{rng.randrange(40)}"
+        score = rng.randrange(5000)
+        added.add(player_name, score)
+        entries.setdefault(score, []).append(player_name)
+        best_scores[player_name] = max(best_scores.get(player_name, -1),
+                                       score)
+
+    loaded = Leaderboard.from_entries(entries, best_scores)
+    assert loaded.values == added.values
+    assert loaded.top(500) == added.top(500)
+    assert loaded.rank("P3") == added.rank("P3")
+    assert loaded.count_above(2500) == added.count_above(2500)
@@ -0,0 +1,78 @@
+import urllib.request
+from unittest.mock import patch
+
+from metrics import (NULL_METRICS, LatencyHistogram, Metrics, bucket_index,
+                     bucket_upper_bound)
+from number_guessing_game import GameManager, Player
+
+
+def test_buckets_bound_relative_error():
+    for value in [0, 1, 31, 32, 33, 1000, 123456, 10 ** 9, 2 ** 40 + 7]:
+        upper = bucket_upper_bound(bucket_index(value))
+        assert value <= upper <= value * (1 + 1 / 16) + 1
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for value in range(1, 10001):
+        histogram.record(value * 1000)
+
+    assert histogram.count == 10000
+    assert abs(histogram.percentile(0.5) - 5_000_000) <= 5_000_000 / 16
+    assert abs(histogram.percentile(0.99) - 9_900_000) <= 9_900_000 / 16
+    assert histogram.percentile(1.0) == 10_000_000
+
+
+def test_prometheus_export(tmp_path):
+    metrics = Metrics()
+    metrics.increment("wins")
+    metrics.increment("wins")
+    metrics.stop("guess_processing", metrics.start())
+    path = str(tmp_path / "game.prom")
+    metrics.write_prometheus(path)
+
+    with open(path) as file:
+        text = file.read()
+    assert "number_guessing_wins_total 2" in text
+    assert "number_guessing_guess_processing_seconds_count 1" in text
+    assert 'number_guessing_guess_processing_seconds{quantile="0.99"}' in text
+
+
+def test_http_endpoint():
+    metrics = Metrics()
+    metrics.increment("guesses", 3)
+    server = metrics.serve(port=0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(
+                f"http://127.0.0.1:{port}/metrics") as response:
+            body = response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert "number_guessing_guesses_total 3" in body
+
+
+def test_game_manager_records_round_metrics():
+    metrics = Metrics()
+    game_manager = GameManager(metrics=metrics)
+    game_manager.current_player = Player("Tester")
+
+    with patch('number_guessing_game.CLI') as mock_cli, \
+            patch('number_guessing_game.random.randint', return_value=40):
+        mock_cli.get_difficulty_choice.return_value = "easy"
+        mock_cli.get_player_guess.side_effect = ["hint", 50, 40]
+        game_manager.handle_game_round()
+
+    assert metrics.counters == {"rounds": 1, "hints": 1, "guesses": 2,
+                                "wins": 1}
+    assert metrics.histograms["input_wait"].count == 4
+    assert metrics.histograms["hint_generation"].count == 1
+    assert metrics.histograms["score_calculation"].count == 1
+
+
+def test_disabled_metrics_are_no_ops(game_manager):
+    assert game_manager.metrics is NULL_METRICS
+    assert NULL_METRICS.start() == 0
+    assert NULL_METRICS.stop("anything", 0) is None
@@ -43,3 +43,7 @@ def test_get_best_score(player):
     player.best_scores["easy"] = 100
     assert player.get_best_score("easy") == 100
     assert player.get_best_score("hard") is None
+
+
+def test_player_has_no_dict(player):
+    assert not hasattr(player, "__dict__")
@@ -0,0 +1,87 @@
+import os
+from unittest.mock import patch
+
+from number_guessing_game import GameManager, Player, ScoreManager
+from profile_store import ShardedProfileStore, shard_of
+from storage import MemoryScoreStorage
+from write_behind import WriteBehindStorage
+
+
+def test_profiles_persist_across_stores(tmp_path):
+    directory = str(tmp_path / "profiles")
+    store = ShardedProfileStore(directory, shards=8)
+    for index in range(50):
+        store.save_player({"name": f"P{index}", "total_games_played": index,
+                           "total_wins": 0, "best_scores": {}})
+    store.close()
+
+    reopened = ShardedProfileStore(directory, shards=8)
+    assert reopened.connections == {}
+    assert reopened.load_player("P42")["total_games_played"] == 42
+    assert len(reopened.connections) == 1
+    assert reopened.load_player("Nobody") is None
+    assert len(os.listdir(directory)) >= 8
+    reopened.close()
+
+
+def test_shards_are_stable():
+    assert shard_of("Alice", 64) == shard_of("Alice", 64)
+    assert len({shard_of(f"P{index}", 64) for index in range(1000)}) == 64
+
+
+def test_lru_keeps_hot_profiles(tmp_path):
+    store = ShardedProfileStore(str(tmp_path), shards=4, cache_size=2)
+    for name in ["A", "B", "C"]:
+        store.save_player({"name": name, "total_games_played": 1,
+                           "total_wins": 1, "best_scores": {"easy": 10}})
+
+    assert list(store.cache) == ["B", "C"]
+    store.load_player("B")
+    assert list(store.cache) == ["C", "B"]
+    # Returned profiles are copies; editing one leaves the cache alone.
+    store.load_player("B")["best_scores"]["easy"] = 99
+    assert store.load_player("B")["best_scores"] == {"easy": 10}
+    store.close()
+
+
+def test_returning_player_gets_their_profile(tmp_path):
+    store = ShardedProfileStore(str(tmp_path), shards=4)
+    returning = Player("Ann")
+    returning.total_games_played = 7
+    returning.total_wins = 5
+    store.save_player(returning.to_dict())
+
+    game_manager = GameManager(ScoreManager(MemoryScoreStorage(),
+                                            profiles=store))
+    with patch('number_guessing_game.CLI') as mock_cli, \
+            patch('number_guessing_game.random.randint', return_value=40):
+        mock_cli.get_player_name.return_value = "Ann"
+        mock_cli.get_difficulty_choice.return_value = "easy"
+        mock_cli.get_player_guess.side_effect = [40]
+        mock_cli.play_again.return_value = False
+        game_manager.start_game()
+
+    assert game_manager.current_player.total_games_played == 8
+    assert store.load_player("Ann")["total_wins"] == 6
+    store.close()
+
+
+def test_profile_saves_are_written_behind(tmp_path):
+    store = ShardedProfileStore(str(tmp_path), shards=4)
+    profiles = WriteBehindStorage(store, interval=60)
+    score_manager = ScoreManager(MemoryScoreStorage(), profiles=profiles)
+    player = Player("Ann")
+    player.total_games_played = 3
+
+    with patch.object(store, 'save_player',
+                      wraps=store.save_player) as save_player:
+        score_manager.save_player(player)
+        # Queued, not written, yet the profile is already visible.
+        assert not save_player.called
+        assert score_manager.load_player("Ann").total_games_played == 3
+        score_manager.close()
+        assert save_player.call_count == 1
+
+    reopened = ShardedProfileStore(str(tmp_path), shards=4)
+    assert reopened.load_player("Ann")["total_games_played"] == 3
+    reopened.close()
@@ -0,0 +1,151 @@
+import random
+from unittest.mock import patch
+
+import pytest
+
+from number_guessing_game import (GameManager, GameRound, GameSettings,
+                                  ScoreManager)
+from round_history import (HEADER_SIZE, RECORD_SIZE, RoundHistory,
+                           RoundHistoryReader)
+from storage import MemoryScoreStorage
+
+
+def played_rounds(count, seed=4):
+    rng = random.Random(seed)
+    game_settings = GameSettings()
+    for _ in range(count):
+        difficulty = rng.choice(list(game_settings.difficulty_levels))
+        attempts = game_settings.get_attempts(difficulty)
+        game_round = GameRound(difficulty, game_settings.number_range,
+                               attempts, 0)
+        game_round.remaining_attempts = rng.randint(0, attempts - 1)
+        game_round.is_won = rng.random() < 0.7
+        game_round.started_ns = 0
+        game_round.ended_ns = rng.randint(0, 900) * 1_000_000_000
+        yield f"P{rng.randrange(30)}", game_round
+
+
+def test_rounds_round_trip(tmp_path):
+    path = str(tmp_path / "rounds.bin")
+    history = RoundHistory(path, buffer_records=3)
+    rounds = list(played_rounds(10))
+    for player_name, game_round in rounds[:5]:
+        history.record(player_name, game_round)
+    history.close()
+    # Reopening keeps appending with the same string table.
+    history = RoundHistory(path)
+    for player_name, game_round in rounds[5:]:
+        history.record(player_name, game_round)
+    history.close()
+
+    with RoundHistoryReader(path) as reader:
+        assert len(reader) == 10
+        recorded = [(reader.names[player], reader.names[difficulty],
+                     duration, remaining, bool(won))
+                    for player, difficulty, duration, remaining, won
+                    in reader]
+    assert recorded == [
+        (player_name, game_round.difficulty_level,
+         game_round.get_round_duration(), game_round.remaining_attempts,
+         game_round.is_won)
+        for player_name, game_round in rounds]
+
+
+def test_torn_record_is_dropped(tmp_path):
+    path = str(tmp_path / "rounds.bin")
+    history = RoundHistory(path)
+    for player_name, game_round in played_rounds(2):
+        history.record(player_name, game_round)
+    history.close()
+    with open(path, 'ab') as file:
+        file.write(b"\x01\x02")
+
+    history = RoundHistory(path)
+    history.record(*next(played_rounds(1)))
+    history.close()
+    with open(path, 'rb') as file:
+        assert len(file.read()) == HEADER_SIZE + 3 * RECORD_SIZE
+
+
+def test_game_manager_records_rounds(tmp_path):
+    path = str(tmp_path / "rounds.bin")
+    history = RoundHistory(path)
+    game_manager = GameManager(ScoreManager(MemoryScoreStorage()),
+                               round_history=history)
+    with patch('number_guessing_game.CLI') as mock_cli, \
+            patch('number_guessing_game.random.randint', return_value=40):
+        mock_cli.get_player_name.return_value = "Ann"
+        mock_cli.get_difficulty_choice.return_value = "easy"
+        mock_cli.get_player_guess.side_effect = [10, 40]
+        mock_cli.play_again.return_value = False
+        game_manager.start_game()
+    history.close()
+
+    with RoundHistoryReader(path) as reader:
+        assert [(reader.names[player], reader.names[difficulty], remaining,
+                 won) for player, difficulty, _, remaining, won in reader] \
+            == [("Ann", "easy", 8, 1)]
+
+
+def test_rescoring_matches_calculate_score(tmp_path):
+    pytest.importorskip("numpy")
+    from round_history import rescore_history
+
+    path = str(tmp_path / "rounds.bin")
+    history = RoundHistory(path)
+    rounds = list(played_rounds(2000))
+    for player_name, game_round in rounds:
+        history.record(player_name, game_round)
+    history.close()
+
+    # Retune the multipliers and drop a difficulty entirely.
+    game_settings = GameSettings()
+    game_settings.score_multiplier = {"easy": 1.5, "medium": 4}
+    expected = ScoreManager(MemoryScoreStorage())
+    for player_name, game_round in rounds:
+        multiplier = game_settings.score_multiplier.get(
+            game_round.difficulty_level)
+        if game_round.is_won and multiplier is not None:
+            expected._apply_score(game_round.difficulty_level,
+                                  game_round.calculate_score(multiplier),
+                                  player_name)
+
+    leaderboards = rescore_history(path, game_settings)
+    assert sorted(leaderboards) == ["easy", "medium"]
+    for difficulty, leaderboard in leaderboards.items():
+        reference = expected.leaderboards[difficulty]
+        assert leaderboard.top(len(reference)) == \
+            reference.top(len(reference))
+        assert leaderboard.best_scores == reference.best_scores
+
+
+def test_rescored_leaderboards_replace_and_save(tmp_path):
+    pytest.importorskip("numpy")
+    from round_history import rescore_history
+
+    path = str(tmp_path / "rounds.bin")
+    history = RoundHistory(path)
+    for player_name, game_round in played_rounds(300):
+        history.record(player_name, game_round)
+    history.close()
+
+    storage = MemoryScoreStorage()
+    score_manager = ScoreManager(storage)
+    score_manager.update_high_score("easy", 10 ** 6, "Stale")
+    game_settings = GameSettings()
+    game_settings.score_multiplier["hard"] = 5
+    leaderboards = rescore_history(path, game_settings)
+    score_manager.replace_leaderboards(leaderboards)
+
+    assert score_manager.top_scores("hard", 5) == \
+        leaderboards["hard"].top(5)
+    assert score_manager.get_rank("easy", "Stale") is None
+    # Saved: a fresh manager over the same storage sees the same boards.
+    restored = ScoreManager(storage)
+    restored.load_score_history()
+    for difficulty, leaderboard in leaderboards.items():
+        assert restored.top_scores(difficulty, len(leaderboard)) == \
+            leaderboard.top(len(leaderboard))
+    # Later scores go to the installed leaderboards.
+    score_manager.update_high_score("hard", 10 ** 6, "Fresh")
+    assert score_manager.get_rank("hard", "Fresh") == 1
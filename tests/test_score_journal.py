@@ -0,0 +1,143 @@
+import json
+import os
+
+import pytest
+from number_guessing_game import ScoreManager
+from score_journal import ScoreJournal
+from snapshot import SnapshotScoreStorage
+from storage import JsonScoreStorage
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / "score_history.json"), \
+        str(tmp_path / "score_history.log")
+
+
+def test_events_are_written_in_batches(paths):
+    _, log_path = paths
+    journal = ScoreJournal(log_path, batch_size=2)
+
+    journal.append("easy", "Player1", 100)
+    assert list(ScoreJournal(log_path).replay()) == []
+
+    journal.append("easy", "Player2", 150)
+    assert list(ScoreJournal(log_path).replay()) == [
+        ("easy", "Player1", 100), ("easy", "Player2", 150)]
+    journal.close()
+
+
+def test_crash_recovery_replays_the_log(paths):
+    snapshot_path, log_path = paths
+    with open(snapshot_path, 'w') as file:
+        json.dump({"easy": ["Player1", 100]}, file)
+
+    score_manager = ScoreManager(JsonScoreStorage(
+        snapshot_path, ScoreJournal(log_path, batch_size=1)))
+    score_manager.load_score_history()
+    score_manager.update_high_score("easy", 150, "Player2")
+    score_manager.update_high_score("hard", 80, "Player3")
+    # No save_score_history: simulate a crash and start again
+    restored = ScoreManager(JsonScoreStorage(snapshot_path,
+                                             ScoreJournal(log_path)))
+    restored.load_score_history()
+
+    assert restored.high_score == {"easy": ("Player2", 150),
+                                   "hard": ("Player3", 80)}
+
+
+def test_torn_tail_is_ignored(paths):
+    snapshot_path, log_path = paths
+    with open(log_path, 'w') as file:
+        file.write('["easy", "Player1", 100]\n["easy", "Pla')
+
+    score_manager = ScoreManager(JsonScoreStorage(snapshot_path,
+                                                  ScoreJournal(log_path)))
+    score_manager.load_score_history()
+
+    assert score_manager.high_score == {"easy": ("Player1", 100)}
+
+
+def test_save_compacts_log_into_snapshot(paths):
+    snapshot_path, log_path = paths
+    journal = ScoreJournal(log_path, batch_size=1, compact_every=3)
+    score_manager = ScoreManager(JsonScoreStorage(snapshot_path, journal))
+
+    score_manager.update_high_score("easy", 100, "Player1")
+    score_manager.update_high_score("easy", 90, "Player2")
+    assert journal.entries == 2
+    score_manager.update_high_score("medium", 200, "Player3")
+
+    # The third event reached the threshold and triggered compaction
+    assert journal.entries == 0
+    assert list(ScoreJournal(log_path).replay()) == []
+    with open(snapshot_path) as file:
+        assert json.load(file) == {
+            "journals": {log_path: 3},
+            "scores": {"easy": [["Player2", 90], ["Player1", 100]],
+                       "medium": [["Player3", 200]]}}
+
+
+def test_quitting_leaves_compaction_to_the_threshold(paths):
+    snapshot_path, log_path = paths
+    score_manager = ScoreManager(JsonScoreStorage(snapshot_path,
+                                                  ScoreJournal(log_path)))
+    score_manager.update_high_score("easy", 100, "Player1")
+    score_manager.flush_score_history()
+
+    assert not os.path.exists(snapshot_path)
+    assert list(ScoreJournal(log_path).replay()) == [
+        ("easy", "Player1", 100)]
+
+
+def storage_class(name):
+    if name == "shared":
+        return pytest.importorskip("shared_storage").SharedJsonScoreStorage
+    return {"json": JsonScoreStorage, "snapshot": SnapshotScoreStorage}[name]
+
+
+@pytest.mark.parametrize("name", ["json", "snapshot", "shared"])
+def test_crash_before_truncation_does_not_replay_twice(paths, name,
+                                                       monkeypatch):
+    snapshot_path, log_path = paths
+
+    def open_manager():
+        score_manager = ScoreManager(storage_class(name)(
+            snapshot_path, ScoreJournal(log_path, batch_size=1)))
+        score_manager.load_score_history()
+        return score_manager
+
+    score_manager = open_manager()
+    score_manager.update_high_score("easy", 100, "Player1")
+    score_manager.update_high_score("easy", 100, "Player2")
+    # The snapshot is written, then the process dies before the journal
+    # is truncated.
+    with monkeypatch.context() as patched:
+        patched.setattr(ScoreJournal, "truncate", ScoreJournal.flush)
+        score_manager.save_score_history()
+    score_manager.update_high_score("hard", 50, "Player3")
+
+    restored = open_manager()
+    assert sorted(restored.score_events()) == [
+        ("easy", "Player1", 100), ("easy", "Player2", 100),
+        ("hard", "Player3", 50)]
+
+    # New events are numbered after the old ones, so they replay as well.
+    restored.update_high_score("hard", 60, "Player4")
+    assert len(open_manager().score_events()) == 4
+
+
+def test_logs_without_sequence_numbers_replay_in_full(paths):
+    snapshot_path, log_path = paths
+    with open(snapshot_path, 'w') as file:
+        json.dump({"journals": {log_path: 5}, "scores": {}}, file)
+    with open(log_path, 'w') as file:
+        file.write('["easy", "Player1", 100]\n["easy", "Player2", 90, 5]\n'
+                   '["easy", "Player3", 80, 6]\n')
+
+    score_manager = ScoreManager(JsonScoreStorage(snapshot_path,
+                                                  ScoreJournal(log_path)))
+    score_manager.load_score_history()
+
+    assert score_manager.top_scores("easy") == [("Player1", 100),
+                                                ("Player3", 80)]
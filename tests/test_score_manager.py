@@ -24,6 +24,21 @@ def test_update_high_score(score_manager):
     assert score_manager.high_score["easy"] == ("Player2", 150)
 
 
+def test_update_high_score_checks_the_score():
+    from number_guessing_game import ScoreManager
+    from storage import MemoryScoreStorage
+
+    score_manager = ScoreManager(MemoryScoreStorage())
+    score_manager.update_high_score("easy", -5, "Player1")
+    assert score_manager.high_score["easy"] == ("Player1", -5)
+
+    with pytest.raises(TypeError):
+        score_manager.update_high_score("easy", "900", "Player2")
+    # A rejected score is neither applied nor recorded.
+    assert score_manager.top_scores("easy") == [("Player1", -5)]
+    assert score_manager.storage.load_scores() == [("easy", "Player1", -5)]
+
+
 def test_save_score_history(score_manager, score_file):
     score_manager.high_score = {"easy": ("Player1", 100)}
     score_manager.save_score_history()
@@ -31,7 +46,7 @@ def test_save_score_history(score_manager, score_file):
     assert os.path.exists(score_file)
     with open(score_file, 'r') as file:
         data = json.load(file)
-        assert data == {"easy": ["Player1", 100]}
+        assert data == {"easy": [["Player1", 100]]}
 
 
 def test_load_score_history(score_manager, score_file):
@@ -56,3 +71,158 @@ def test_load_score_history_corrupted_file(score_manager, score_file):
 
     score_manager.load_score_history()
     assert score_manager.high_score == {}
+
+
+def test_background_load_is_awaited_on_first_access():
+    import threading
+
+    from number_guessing_game import ScoreManager
+    from storage import MemoryScoreStorage
+
+    class SlowStorage(MemoryScoreStorage):
+        def __init__(self):
+            super().__init__()
+            self.release = threading.Event()
+
+        def load_scores(self):
+            self.release.wait()
+            return [("easy", "Player1", 100)]
+
+    storage = SlowStorage()
+    score_manager = ScoreManager(storage)
+    score_manager.load_score_history_in_background()
+    storage.release.set()
+
+    assert score_manager.high_score == {"easy": ("Player1", 100)}
+    score_manager.update_high_score("easy", 120, "Player2")
+    assert score_manager.get_rank("easy", "Player2") == 1
+
+
+def test_background_load_errors_surface_on_access():
+    from number_guessing_game import ScoreManager
+    from storage import MemoryScoreStorage
+
+    class BrokenStorage(MemoryScoreStorage):
+        def load_scores(self):
+            raise OSError("disk on fire")
+
+    score_manager = ScoreManager(BrokenStorage())
+    score_manager.load_score_history_in_background()
+
+    with pytest.raises(OSError):
+        score_manager.top_scores("easy")
+    assert score_manager.top_scores("easy") == []
+
+
+def test_import_does_not_load_json():
+    import subprocess
+    import sys
+
+    src = os.path.join(os.path.dirname(__file__), '..', 'src')
+    output = subprocess.run(
+        [sys.executable, "-c",
+         "import sys, number_guessing_game; print('json' in sys.modules)"],
+        env=dict(os.environ, PYTHONPATH=src), capture_output=True,
+        text=True, check=True).stdout
+    assert output.strip() == "False"
+
+
+@pytest.fixture
+def fast_switching():
+    # Switch threads as often as possible so races show up quickly.
+    import sys
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_concurrent_winners_lose_no_scores(fast_switching):
+    import random
+    import threading
+
+    from number_guessing_game import ScoreManager
+    from storage import MemoryScoreStorage
+
+    threads = 8
+    for trial in range(20):
+        storage = MemoryScoreStorage()
+        score_manager = ScoreManager(storage)
+        barrier = threading.Barrier(threads)
+        submitted = [[] for _ in range(threads)]
+
+        def win(index):
+            rng = random.Random(trial * threads + index)
+            barrier.wait()
+            for _ in range(200):
+                entry = (rng.choice(["easy", "medium", "hard"]),
+                         rng.randrange(3000), f"P{rng.randrange(10)}")
+                score_manager.update_high_score(*entry)
+                submitted[index].append(entry)
+
+        workers = [threading.Thread(target=win, args=(index,))
+                   for index in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        entries = [entry for scores in submitted for entry in scores]
+        assert len(storage.events) == len(entries)
+        for difficulty in ["easy", "medium", "hard"]:
+            scores = [(score, player_name) for level, score, player_name
+                      in entries if level == difficulty]
+            best = max(score for score, _ in scores)
+            assert score_manager.high_score[difficulty][1] == best
+            assert score_manager.count_scores_above(difficulty, -1) == \
+                len(scores)
+            top = score_manager.top_scores(difficulty, len(scores))
+            assert sorted(score for _, score in top) == \
+                sorted(score for score, _ in scores)
+
+
+def test_concurrent_winners_are_journaled_exactly_once(tmp_path,
+                                                       fast_switching):
+    import threading
+
+    from number_guessing_game import ScoreManager
+    from score_journal import ScoreJournal
+    from storage import JsonScoreStorage
+
+    threads = 8
+    wins = 300
+
+    def open_storage():
+        return JsonScoreStorage(
+            str(tmp_path / "score_history.json"),
+            ScoreJournal(str(tmp_path / "score_history.log"), batch_size=4,
+                         compact_every=20))
+
+    score_manager = ScoreManager(open_storage())
+    barrier = threading.Barrier(threads)
+
+    def win(index):
+        barrier.wait()
+        for round_number in range(wins):
+            # Compactions keep interleaving with the wins.
+            score_manager.update_high_score(
+                ("easy", "medium", "hard")[round_number % 3],
+                round_number, f"P{index}")
+
+    workers = [threading.Thread(target=win, args=(index,))
+               for index in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    score_manager.close()
+
+    restored = ScoreManager(open_storage())
+    restored.load_score_history()
+    assert sum(restored.count_scores_above(difficulty, -1)
+               for difficulty in ("easy", "medium", "hard")) == threads * wins
+    assert sorted(restored.score_events()) == sorted(
+        (("easy", "medium", "hard")[round_number % 3], f"P{index}",
+         round_number)
+        for index in range(threads) for round_number in range(wins))
+    restored.close()
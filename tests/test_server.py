@@ -0,0 +1,137 @@
+import asyncio
+import json
+
+import pytest
+from number_guessing_game import ScoreManager
+from server import GameServer, GameSession
+
+
+@pytest.fixture
+def session(game_settings, score_manager):
+    return GameSession(game_settings, score_manager)
+
+
+def test_session_requires_hello(session):
+    with pytest.raises(ValueError):
+        session.handle({"action": "play", "difficulty": "easy"})
+
+
+def test_session_win_updates_shared_high_score(session, score_manager):
+    session.handle({"action": "hello", "name": "Alice"})
+    started = session.handle({"action": "play", "difficulty": "hard"})
+    assert started["attempts"] == 5
+
+    session.game_round.target_number = 42
+    assert session.handle({"action": "guess", "value": 10})["result"] == \
+        "greater"
+    won = session.handle({"action": "guess", "value": 42})
+
+    assert won["event"] == "won"
+    assert won["remaining_attempts"] == 3
+    assert score_manager.high_score["hard"] == ("Alice", won["score"])
+    assert session.player.total_wins == 1
+
+    board = session.handle({"action": "leaderboard", "difficulty": "hard"})
+    assert board["scores"] == [["Alice", won["score"]]]
+    assert board["rank"] == 1
+
+
+def test_session_loss_and_validation(session):
+    session.handle({"action": "hello", "name": "Bob"})
+    session.handle({"action": "play", "difficulty": "hard"})
+    session.game_round.target_number = 42
+
+    with pytest.raises(ValueError):
+        session.handle({"action": "guess", "value": 101})
+    with pytest.raises(ValueError):
+        session.handle({"action": "guess", "value": "50"})
+    for _ in range(4):
+        session.handle({"action": "guess", "value": 1})
+    lost = session.handle({"action": "guess", "value": 1})
+
+    assert lost == {"event": "lost", "target_number": 42}
+    assert session.player.total_games_played == 1
+    with pytest.raises(ValueError):
+        session.handle({"action": "hint"})
+
+
+@pytest.mark.parametrize("difficulty", [["easy"], {"easy": 1}, None, 3])
+def test_session_rejects_non_string_difficulty(session, difficulty):
+    session.handle({"action": "hello", "name": "Cid"})
+    with pytest.raises(ValueError, match="Invalid difficulty"):
+        session.handle({"action": "play", "difficulty": difficulty})
+    with pytest.raises(ValueError, match="Invalid difficulty"):
+        session.handle({"action": "leaderboard", "difficulty": difficulty})
+
+
+async def play_over_tcp(port, name):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+    async def request(payload):
+        writer.write(json.dumps(payload).encode() + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    await reader.readline()
+    await request({"action": "hello", "name": name})
+    await request({"action": "play", "difficulty": "easy"})
+    low, high = 1, 100
+    while True:
+        guess = (low + high) // 2
+        response = await request({"action": "guess", "value": guess})
+        if response["event"] != "result":
+            break
+        if response["result"] == "greater":
+            low = guess + 1
+        else:
+            high = guess - 1
+    await request({"action": "quit"})
+    writer.close()
+    return response
+
+
+def test_server_hosts_concurrent_sessions():
+    async def scenario():
+        score_manager = ScoreManager()
+        game_server = GameServer(port=0, score_manager=score_manager)
+        await game_server.start()
+        results = await asyncio.gather(*(
+            play_over_tcp(game_server.port, f"Player{i}")
+            for i in range(200)))
+        await game_server.close()
+        return results, score_manager
+
+    results, score_manager = asyncio.run(scenario())
+
+    assert all(result["event"] == "won" for result in results)
+    assert score_manager.high_score["easy"][1] == max(
+        result["score"] for result in results)
+
+
+def test_server_closes_idle_and_oversized_sessions():
+    async def scenario():
+        game_server = GameServer(port=0, idle_timeout=0.05,
+                                 max_line_length=64)
+        await game_server.start()
+
+        reader, writer = await asyncio.open_connection(
+            "127.0.0.1", game_server.port)
+        await reader.readline()
+        idle = json.loads(await reader.readline())
+        writer.close()
+
+        reader, writer = await asyncio.open_connection(
+            "127.0.0.1", game_server.port)
+        await reader.readline()
+        writer.write(b"x" * 200 + b"\n")
+        oversized = json.loads(await reader.readline())
+        writer.close()
+
+        await game_server.close()
+        return idle, oversized, game_server.active_sessions
+
+    idle, oversized, active_sessions = asyncio.run(scenario())
+
+    assert idle == {"event": "timeout"}
+    assert oversized == {"event": "error", "message": "Line too long"}
+    assert active_sessions == 0
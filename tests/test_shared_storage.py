@@ -0,0 +1,85 @@
+import json
+import multiprocessing
+import random
+
+import pytest
+
+pytest.importorskip("fcntl")
+
+from number_guessing_game import Player, ScoreManager  # noqa: E402
+from shared_storage import (SharedJsonScoreStorage,  # noqa: E402
+                            merge_scores)
+
+
+def test_merge_keeps_other_processes_scores():
+    base = [("easy", "Player1", 300)]
+    # Another process added a score, including one equal to ours.
+    on_disk = base + [("hard", "Player2", 50), ("easy", "Player3", 300)]
+    merged = merge_scores(on_disk, base, [("easy", "Player1", 300),
+                                          ("easy", "Player3", 300)])
+
+    assert merged == [("easy", "Player1", 300), ("easy", "Player3", 300),
+                      ("hard", "Player2", 50), ("easy", "Player3", 300)]
+
+
+def test_saves_do_not_erase_other_processes_scores(tmp_path):
+    path = str(tmp_path / "score_history.json")
+    first = ScoreManager(SharedJsonScoreStorage(path))
+    second = ScoreManager(SharedJsonScoreStorage(path))
+    first.load_score_history()
+    second.load_score_history()
+
+    first.update_high_score("easy", 500, "Player1")
+    first.save_score_history()
+    second.update_high_score("hard", 90, "Player2")
+    second.update_high_score("easy", 20, "Player2")
+    second.save_score_history()
+    first.update_high_score("easy", 40, "Player1")
+    first.save_score_history()
+
+    with open(path) as file:
+        stored = json.load(file)
+    assert sorted(stored["easy"]) == [["Player1", 40], ["Player1", 500],
+                                      ["Player2", 20]]
+    assert stored["hard"] == [["Player2", 90]]
+
+
+def test_player_saves_merge(tmp_path):
+    path = str(tmp_path / "score_history.json")
+    players_path = str(tmp_path / "players.json")
+    first = ScoreManager(SharedJsonScoreStorage(path, None, players_path))
+    second = ScoreManager(SharedJsonScoreStorage(path, None, players_path))
+    first.load_player("Nobody")
+    second.load_player("Nobody")
+
+    first.save_player(Player("Ann"))
+    second.save_player(Player("Bob"))
+
+    with open(players_path) as file:
+        assert sorted(json.load(file)) == ["Ann", "Bob"]
+
+
+def hammer(path, worker):
+    rng = random.Random(worker)
+    score_manager = ScoreManager(SharedJsonScoreStorage(path))
+    scores = []
+    for index in range(25):
+        difficulty = ("easy", "medium", "hard")[index % 3]
+        score = rng.randint(0, 10000)
+        score_manager.update_high_score(difficulty, score, f"W{worker}")
+        score_manager.save_score_history()
+        scores.append([difficulty, f"W{worker}", score])
+    return scores
+
+
+def test_concurrent_writers_lose_no_updates(tmp_path):
+    path = str(tmp_path / "score_history.json")
+    context = multiprocessing.get_context("fork")
+    with context.Pool(8) as pool:
+        results = pool.starmap(hammer, [(path, worker) for worker in range(8)])
+
+    with open(path) as file:
+        stored = json.load(file)
+    assert sorted([difficulty] + entry for difficulty, entries
+                  in stored.items() for entry in entries) == \
+        sorted(score for scores in results for score in scores)
@@ -0,0 +1,112 @@
+import pytest
+from simulation import (BinarySearchStrategy, LognormalThinkTime,
+                        RandomStrategy, ReplayStrategy, Simulator,
+                        plan_shards, run_parallel)
+
+
+def test_binary_search_always_wins_within_seven_guesses():
+    simulator = Simulator(seed=1)
+    report = simulator.run(BinarySearchStrategy(), 500)
+
+    # 2^7 - 1 >= 100, so binary search never runs out of attempts
+    assert report.stats["easy"].wins == 500
+    assert report.stats["medium"].wins == 500
+    assert report.stats["hard"].wins < 500
+    assert report.stats["medium"].attempts_used <= 500 * 7
+    assert report.total_rounds == 1500
+
+
+def test_scores_follow_calculate_score():
+    simulator = Simulator(seed=2)
+    report = simulator.run(BinarySearchStrategy(), 200, ["hard"])
+    stats = report.stats["hard"]
+
+    assert stats.best_score <= 5 * 3 * 100
+    assert stats.total_score > 0
+    assert stats.hints_used == 0
+
+
+def test_hints_are_counted():
+    simulator = Simulator(seed=3)
+    report = simulator.run(BinarySearchStrategy(use_hints=True), 100)
+
+    assert report.stats["easy"].hints_used == 300
+    assert report.stats["medium"].hints_used == 200
+    assert report.stats["hard"].hints_used == 100
+
+
+def test_same_seed_gives_same_report():
+    first = Simulator(seed=42).run(RandomStrategy(use_hints=True), 300)
+    second = Simulator(seed=42).run(RandomStrategy(use_hints=True), 300)
+
+    for difficulty in first.stats:
+        first_stats = first.stats[difficulty].as_dict()
+        second_stats = second.stats[difficulty].as_dict()
+        assert first_stats == second_stats
+
+
+def test_replay_strategy_forfeits_when_transcript_ends():
+    simulator = Simulator(seed=4)
+    strategy = ReplayStrategy([["hint", 50]])
+    report = simulator.run(strategy, 50, ["easy"])
+    stats = report.stats["easy"]
+
+    assert stats.attempts_used == 50
+    assert stats.hints_used == 50
+    assert stats.wins < 50
+
+
+def test_replay_strategy_requires_transcripts():
+    with pytest.raises(ValueError):
+        ReplayStrategy([])
+
+
+def test_plan_shards_is_independent_of_workers():
+    shards = plan_shards(["easy", "hard"], 25, 10, seed=9)
+
+    assert [(difficulty, size) for difficulty, size, _ in shards] == [
+        ("easy", 10), ("easy", 10), ("easy", 5),
+        ("hard", 10), ("hard", 10), ("hard", 5)]
+    assert shards == plan_shards(["easy", "hard"], 25, 10, seed=9)
+    assert len({seed for _, _, seed in shards}) == len(shards)
+
+
+def test_run_parallel_same_stats_for_any_worker_count():
+    strategy = RandomStrategy(use_hints=True)
+    single = run_parallel(strategy, 400, seed=7, workers=1, shard_size=50)
+    pooled = run_parallel(strategy, 400, seed=7, workers=3, shard_size=50)
+
+    assert single.total_rounds == pooled.total_rounds == 1200
+    for difficulty in single.stats:
+        assert (single.stats[difficulty].as_dict() ==
+                pooled.stats[difficulty].as_dict())
+
+
+def test_stateful_strategy_is_fresh_for_every_shard():
+    strategy = ReplayStrategy([[50, 25, 75, 12, 88, 37, 62],
+                               list(range(1, 101, 3)),
+                               list(range(100, 0, -2))])
+    single = run_parallel(strategy, 10, seed=3, workers=1, shard_size=4)
+    pooled = run_parallel(strategy, 10, seed=3, workers=2, shard_size=4)
+
+    for difficulty in single.stats:
+        assert (single.stats[difficulty].as_dict() ==
+                pooled.stats[difficulty].as_dict())
+    # The caller's strategy is left as it was.
+    assert strategy.round_index == 0
+
+
+def test_think_time_is_simulated_without_waiting():
+    think_time = LognormalThinkTime(mean=30)
+    instant = Simulator(seed=4).run(BinarySearchStrategy(), 300, ["easy"])
+    first = Simulator(seed=4, think_time=think_time).run(
+        BinarySearchStrategy(), 300, ["easy"])
+    second = run_parallel(BinarySearchStrategy(), 300, seed=4, workers=1,
+                          shard_size=300, difficulties=["easy"],
+                          think_time=think_time)
+
+    # Several 30 second pauses per round cost points on every win.
+    assert first.stats["easy"].mean_score < \
+        instant.stats["easy"].mean_score - 100
+    assert first.elapsed < 5
+    assert second.stats["easy"].total_score > 0
@@ -0,0 +1,141 @@
+import struct
+
+import pytest
+
+from number_guessing_game import GameSettings, Player, ScoreManager
+from score_journal import ScoreJournal
+from snapshot import (HEADER_FORMAT, HEADER_SIZE, MAGIC, VERSION, Snapshot,
+                      SnapshotError, SnapshotScoreStorage, write_snapshot)
+
+SCORES = [("easy", "Ann", 700), ("hard", "Bob", 1200),
+          ("easy", "Bob", -300), ("hard", "Cid", 12.5)]
+
+
+def profiles(count):
+    return [{"name": f"Player{index:04d}", "total_games_played": index,
+             "total_wins": index // 2,
+             "best_scores": {"easy": index, "hard": 3 * index} if index % 2
+             else {}}
+            for index in range(count)]
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "state.snap")
+    game_settings = GameSettings((1, 1000))
+    game_settings.score_multiplier["hard"] = 3.5
+    write_snapshot(path, SCORES, reversed(profiles(300)), game_settings)
+
+    with Snapshot(path) as snapshot:
+        assert snapshot.scores() == SCORES
+        assert snapshot.player_count == 300
+        assert snapshot.load_player("Player0123") == profiles(300)[123]
+        assert snapshot.load_player("Player9999") is None
+        assert list(snapshot.players()) == profiles(300)
+        restored = snapshot.game_settings()
+        assert restored.number_range == (1, 1000)
+        assert restored.score_multiplier == {"easy": 1, "medium": 2,
+                                             "hard": 3.5}
+        assert restored.hints_per_difficulty == \
+            game_settings.hints_per_difficulty
+
+
+def test_corruption_is_detected(tmp_path):
+    path = str(tmp_path / "state.snap")
+    write_snapshot(path, SCORES, profiles(10))
+    with open(path, 'r+b') as file:
+        file.seek(-3, 2)
+        file.write(b"\xff")
+    with pytest.raises(SnapshotError, match="checksum"):
+        Snapshot(path)
+
+    with open(path, 'r+b') as file:
+        file.truncate(HEADER_SIZE + 4)
+    with pytest.raises(SnapshotError, match="truncated"):
+        Snapshot(path)
+
+
+def test_newer_versions_are_read_or_refused(tmp_path):
+    path = str(tmp_path / "state.snap")
+    write_snapshot(path, SCORES)
+    with open(path, 'rb') as file:
+        data = bytearray(file.read())
+    _, _, _, sections, crc, size = struct.unpack_from(HEADER_FORMAT, data)
+
+    # A newer writer that stays compatible is read as far as we know it.
+    struct.pack_into(HEADER_FORMAT, data, 0, MAGIC, VERSION + 1, VERSION,
+                     sections, crc, size)
+    with open(path, 'wb') as file:
+        file.write(data)
+    with Snapshot(path) as snapshot:
+        assert snapshot.version == VERSION + 1
+        assert snapshot.scores() == SCORES
+
+    struct.pack_into(HEADER_FORMAT, data, 0, MAGIC, VERSION + 1,
+                     VERSION + 1, sections, crc, size)
+    with open(path, 'wb') as file:
+        file.write(data)
+    with pytest.raises(SnapshotError, match="reader version"):
+        Snapshot(path)
+
+
+def test_storage_keeps_scores_and_players(tmp_path):
+    path = str(tmp_path / "state.snap")
+    storage = SnapshotScoreStorage(
+        path, journal=ScoreJournal(str(tmp_path / "scores.log")))
+    score_manager = ScoreManager(storage)
+    score_manager.load_score_history()
+    score_manager.update_high_score("easy", 300, "Ann")
+    player = Player("Ann")
+    player.total_games_played = 4
+    player.best_scores = {"easy": 300}
+    score_manager.save_player(player)
+    score_manager.update_high_score("easy", 500, "Bob")
+    score_manager.close()
+
+    # Bob's score only reached the journal.
+    reopened = ScoreManager(SnapshotScoreStorage(
+        path, journal=ScoreJournal(str(tmp_path / "scores.log"))))
+    reopened.load_score_history()
+    assert reopened.high_score == {"easy": ("Bob", 500)}
+    assert reopened.get_rank("easy", "Ann") == 2
+    assert reopened.load_player("Ann").total_games_played == 4
+    reopened.save_score_history()
+    reopened.close()
+
+    with Snapshot(path) as snapshot:
+        assert snapshot.scores() == [("easy", "Ann", 300),
+                                     ("easy", "Bob", 500)]
+        assert snapshot.load_player("Ann")["best_scores"] == {"easy": 300}
+
+
+def test_profile_saves_wait_for_the_next_snapshot(tmp_path):
+    path = tmp_path / "state.snap"
+    storage = SnapshotScoreStorage(str(path))
+    storage.save_scores([("easy", "Ann", 300)])
+    written = path.stat().st_mtime_ns, path.read_bytes()
+
+    for games in range(1, 4):
+        storage.save_player({"name": "Ann", "total_games_played": games,
+                             "total_wins": 0, "best_scores": {}})
+    assert (path.stat().st_mtime_ns, path.read_bytes()) == written
+    assert storage.load_player("Ann")["total_games_played"] == 3
+    storage.close()
+
+    with Snapshot(str(path)) as snapshot:
+        assert snapshot.load_player("Ann")["total_games_played"] == 3
+        assert snapshot.scores() == [("easy", "Ann", 300)]
+
+
+def test_settings_hold_the_largest_range(tmp_path):
+    path = str(tmp_path / "state.snap")
+    write_snapshot(path, [], game_settings=GameSettings((0, 2 ** 63)))
+    with Snapshot(path) as snapshot:
+        assert snapshot.game_settings().number_range == (0, 2 ** 63)
+
+
+def test_corrupt_snapshot_starts_fresh(tmp_path, capsys):
+    path = tmp_path / "state.snap"
+    path.write_bytes(b"not a snapshot at all, just some bytes")
+    storage = SnapshotScoreStorage(str(path))
+    assert storage.load_scores() == []
+    assert "Starting fresh" in capsys.readouterr().out
@@ -0,0 +1,103 @@
+import random
+import time
+from functools import lru_cache
+
+import pytest
+import solver
+from simulation import BinarySearchStrategy, Simulator
+from solver import (Solution, SolverCache, solve, solve_difficulties,
+                    uniform_total, weighted_total)
+
+
+def interval_dp(weights, attempts):
+    # Plain interval DP without the uniform shortcut
+    @lru_cache(maxsize=None)
+    def best(i, j, a):
+        if i > j or a == 0:
+            return 0
+        return max(weights[k] * (a - 1) + best(i, k - 1, a - 1) +
+                   best(k + 1, j, a - 1) for k in range(i, j + 1))
+    return best(0, len(weights) - 1, attempts)
+
+
+def test_uniform_total_matches_interval_dp():
+    for size in range(0, 20):
+        for attempts in range(0, 6):
+            assert uniform_total(size, attempts) == \
+                interval_dp((1,) * size, attempts)
+
+
+def test_weighted_total_prefers_likely_candidates():
+    # With one guess left the most likely candidate is the only one found
+    assert weighted_total([1, 5, 2], 2) == 5
+    assert weighted_total([1, 5, 2], 3) == interval_dp((1, 5, 2), 3)
+
+
+def test_solution_without_hints_matches_binary_search(game_settings):
+    solution = solve((1, 100), 5, 0, 3)
+    report = Simulator(game_settings, seed=1).run(
+        BinarySearchStrategy(), 20000, ["hard"])
+
+    assert solution.win_probability == 31 / 100
+    assert solution.expected_score == pytest.approx(78.0)
+    assert report.stats["hard"].win_rate == pytest.approx(0.31, abs=0.02)
+
+
+def test_hints_improve_win_probability():
+    without_hints = solve((1, 30), 3, 0)
+    with_hints = solve((1, 30), 3, 1)
+
+    assert with_hints.win_probability > without_hints.win_probability
+    assert with_hints.expected_score > without_hints.expected_score
+    assert with_hints.win_probability <= 1.0
+
+
+def test_huge_range_with_hints_is_rejected():
+    with pytest.raises(ValueError):
+        solve((1, 2 ** 40), 10, 1)
+    assert solve((1, 2 ** 40), 10, 0).win_probability == \
+        (2 ** 10 - 1) / 2 ** 40
+
+
+def test_cache_reuses_solutions_from_disk(tmp_path, monkeypatch):
+    path = str(tmp_path / "solver_cache.json")
+    first = SolverCache(path).solve((1, 30), 4, 1, 2)
+
+    def fail(*args):
+        raise AssertionError("solved again")
+    monkeypatch.setattr(solver, "solve", fail)
+
+    assert SolverCache(path).solve((1, 30), 4, 1, 2) == first
+    assert isinstance(first, Solution)
+
+
+def test_solve_difficulties_uses_settings(game_settings, tmp_path):
+    game_settings.number_range = (1, 20)
+    solutions = solve_difficulties(
+        game_settings, SolverCache(str(tmp_path / "cache.json")))
+
+    assert set(solutions) == {"easy", "medium", "hard"}
+    assert solutions["easy"].win_probability == pytest.approx(1.0)
+
+
+def test_weighted_total_matches_interval_dp():
+    rng = random.Random(6)
+    for _ in range(200):
+        weights = [rng.choice([1 / 3, 1 / 6, 1 / 9, 0.25])
+                   for _ in range(rng.randint(0, 10))]
+        attempts = rng.randint(0, 5)
+        assert weighted_total(weights, attempts) == pytest.approx(
+            interval_dp(tuple(weights), attempts))
+
+
+def test_largest_group_solves_quickly():
+    # One observation group as big as the default range, with the most
+    # attempts of the default table; the cubic DP needed seconds for this.
+    rng = random.Random(8)
+    weights = [rng.choice([1 / 3, 1 / 6, 1 / 9, 1 / 12]) for _ in range(100)]
+    started = time.perf_counter()
+    weighted_total(weights, 10)
+    assert time.perf_counter() - started < 1
+    started = time.perf_counter()
+    solve_difficulties()
+    assert time.perf_counter() - started < 5
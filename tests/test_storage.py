@@ -0,0 +1,302 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+from number_guessing_game import Player, ScoreManager
+from score_journal import ScoreJournal
+from snapshot import SnapshotScoreStorage
+from sqlite_storage import SqliteScoreStorage
+from storage import JsonScoreStorage, MemoryScoreStorage
+from write_behind import WriteBehindStorage
+
+
+def json_storage(directory):
+    return JsonScoreStorage(str(directory / "score_history.json"),
+                            ScoreJournal(str(directory / "score_history.log")),
+                            players_path=str(directory / "players.json"))
+
+
+def sqlite_storage(directory):
+    return SqliteScoreStorage(str(directory / "scores.db"), batch_size=2)
+
+
+def snapshot_storage(directory):
+    return SnapshotScoreStorage(
+        str(directory / "game_state.snap"),
+        ScoreJournal(str(directory / "score_history.log")))
+
+
+def write_behind_storage(directory):
+    return WriteBehindStorage(json_storage(directory), interval=60)
+
+
+def shared_json_storage(directory):
+    shared_storage = pytest.importorskip("shared_storage")
+    return shared_storage.SharedJsonScoreStorage(
+        str(directory / "score_history.json"),
+        ScoreJournal(str(directory / "score_history.log")),
+        players_path=str(directory / "players.json"))
+
+
+@pytest.fixture(params=[json_storage, sqlite_storage, snapshot_storage,
+                        write_behind_storage, shared_json_storage],
+                ids=["json", "sqlite", "snapshot", "write-behind",
+                     "shared-json"])
+def make_storage(request, tmp_path):
+    opened = []
+
+    def factory():
+        storage = request.param(tmp_path)
+        opened.append(storage)
+        return storage
+
+    yield factory
+    for storage in opened:
+        storage.close()
+
+
+def test_empty_storage_loads_nothing(make_storage):
+    score_manager = ScoreManager(make_storage())
+    score_manager.load_score_history()
+
+    assert score_manager.high_score == {}
+    assert score_manager.load_player("Nobody").total_games_played == 0
+
+
+def test_high_scores_round_trip(make_storage):
+    score_manager = ScoreManager(make_storage())
+    score_manager.update_high_score("easy", 100, "Player1")
+    score_manager.update_high_score("easy", 300, "Player2")
+    score_manager.update_high_score("hard", 50, "Player3")
+    score_manager.save_score_history()
+    score_manager.close()
+
+    restored = ScoreManager(make_storage())
+    restored.load_score_history()
+
+    assert restored.high_score == {"easy": ("Player2", 300),
+                                   "hard": ("Player3", 50)}
+
+
+def test_leaderboards_survive_save_and_reload(make_storage):
+    score_manager = ScoreManager(make_storage())
+    for score, player_name in [(100, "Player1"), (300, "Player2"),
+                               (200, "Player3"), (300, "Player4")]:
+        score_manager.update_high_score("easy", score, player_name)
+    score_manager.save_score_history()
+    # Recorded after the save, so it is only in the journal or the batch.
+    score_manager.update_high_score("easy", 150, "Player5")
+    score_manager.close()
+
+    restored = ScoreManager(make_storage())
+    restored.load_score_history()
+
+    assert restored.top_scores("easy") == [
+        ("Player2", 300), ("Player4", 300), ("Player3", 200),
+        ("Player5", 150), ("Player1", 100)]
+    assert restored.get_rank("easy", "Player1") == 5
+    assert restored.get_rank("easy", "Player5") == 4
+
+    # Saving again must not drop anything either.
+    restored.save_score_history()
+    restored.close()
+    reloaded = ScoreManager(make_storage())
+    reloaded.load_score_history()
+    assert reloaded.top_scores("easy") == restored.top_scores("easy")
+
+
+def test_scores_flushed_at_quit_survive_a_crash(make_storage):
+    score_manager = ScoreManager(make_storage())
+    score_manager.load_score_history()
+    score_manager.update_high_score("easy", 100, "Player1")
+    score_manager.update_high_score("hard", 50, "Player2")
+    score_manager.update_high_score("easy", 70, "Player3")
+    score_manager.flush_score_history()
+    # No close: the process dies right after quitting.
+
+    restored = ScoreManager(make_storage())
+    restored.load_score_history()
+
+    assert sorted(restored.score_events()) == [
+        ("easy", "Player1", 100), ("easy", "Player3", 70),
+        ("hard", "Player2", 50)]
+
+
+def test_player_profiles_round_trip(make_storage):
+    player = Player("Ann")
+    player.total_games_played = 4
+    player.total_wins = 3
+    player.best_scores = {"easy": 700}
+    score_manager = ScoreManager(make_storage())
+    score_manager.save_player(player)
+    player.total_games_played = 5
+    score_manager.save_player(player)
+    score_manager.close()
+
+    restored = ScoreManager(make_storage()).load_player("Ann")
+
+    assert restored.to_dict() == {"name": "Ann", "total_games_played": 5,
+                                  "total_wins": 3,
+                                  "best_scores": {"easy": 700}}
+
+
+def test_sqlite_keeps_every_score(tmp_path):
+    storage = SqliteScoreStorage(str(tmp_path / "scores.db"), batch_size=10)
+    for index, score in enumerate([300, 100, 300, 500]):
+        storage.record_score("easy", f"P{index}", score)
+    storage.record_score("hard", "P9", 900)
+
+    assert storage.top_scores("easy", 3) == [("P3", 500), ("P0", 300),
+                                             ("P2", 300)]
+    assert storage.top_scores("easy", 10, offset=3) == [("P1", 100)]
+    assert len(storage.load_scores()) == 5
+    journal_mode = storage.connection.execute(
+        "PRAGMA journal_mode").fetchone()[0]
+    assert journal_mode == "wal"
+    storage.close()
+
+
+def test_quitting_does_not_rewrite_sqlite_scores(tmp_path, monkeypatch):
+    storage = SqliteScoreStorage(str(tmp_path / "scores.db"))
+    score_manager = ScoreManager(storage)
+    score_manager.update_high_score("easy", 100, "Player1")
+    saves = []
+    monkeypatch.setattr(storage, "save_scores", saves.append)
+
+    score_manager.flush_score_history()
+    assert saves == []
+    assert storage.pending == []
+
+    # Replaced leaderboards are new to the storage, so they are saved.
+    score_manager.high_score = {"easy": ("Player2", 300)}
+    score_manager.flush_score_history()
+    assert saves == [[("easy", "Player2", 300)]]
+    score_manager.flush_score_history()
+    assert len(saves) == 1
+    storage.close()
+
+
+class SnapshotStorage(MemoryScoreStorage):
+    errors = (OSError, sqlite3.Error)
+
+    def __init__(self, fail=0, error=IOError("disk full")):
+        super().__init__()
+        self.snapshots = []
+        self.fail = fail
+        self.error = error
+        self.release = threading.Event()
+        self.release.set()
+
+    def save_scores(self, scores):
+        self.release.wait()
+        if self.fail:
+            self.fail -= 1
+            raise self.error
+        self.snapshots.append(list(scores))
+
+
+def test_write_behind_never_blocks_the_caller():
+    inner = SnapshotStorage()
+    inner.release.clear()
+    storage = WriteBehindStorage(inner, interval=0)
+    score_manager = ScoreManager(storage)
+
+    # The worker is stuck writing, yet recording and saving return at once.
+    score_manager.update_high_score("easy", 100, "Player1")
+    score_manager.update_high_score("easy", 200, "Player2")
+    score_manager.save_score_history()
+    assert inner.snapshots == []
+
+    score_manager.update_high_score("hard", 50, "Player3")
+    inner.release.set()
+    storage.close()
+    assert inner.snapshots == [[("easy", "Player1", 100),
+                                ("easy", "Player2", 200)]]
+    # Only the score recorded after the snapshot is passed on as an event.
+    assert inner.events == [("hard", "Player3", 50)]
+
+
+def test_write_behind_coalesces_until_threshold():
+    inner = SnapshotStorage()
+    storage = WriteBehindStorage(inner, interval=60, max_pending=3)
+    storage.record_score("easy", "Player1", 100)
+    storage.record_score("easy", "Player2", 100)
+    assert inner.snapshots == []
+
+    assert inner.events == []
+
+    storage.record_score("hard", "Player3", 50)
+    deadline = time.monotonic() + 5
+    while len(inner.events) < 3 and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+    # One write for all three events, long before the interval ran out.
+    assert len(inner.events) == 3
+    assert inner.snapshots == []
+    storage.close()
+
+
+def test_write_behind_round_trip_after_close(tmp_path):
+    player = Player("Ann")
+    player.total_wins = 2
+    score_manager = ScoreManager(
+        WriteBehindStorage(json_storage(tmp_path), interval=60))
+    score_manager.update_high_score("easy", 100, "Player1")
+    score_manager.update_high_score("easy", 300, "Player2")
+    score_manager.save_player(player)
+    assert score_manager.load_player("Ann").total_wins == 2
+    score_manager.close()
+
+    restored = ScoreManager(json_storage(tmp_path))
+    restored.load_score_history()
+
+    assert restored.high_score == {"easy": ("Player2", 300)}
+    assert restored.load_player("Ann").total_wins == 2
+
+
+def test_write_behind_keeps_data_after_failed_write(capsys):
+    inner = SnapshotStorage(fail=1)
+    storage = WriteBehindStorage(inner, interval=60)
+    storage.save_scores([("easy", "Player1", 100)])
+
+    assert storage.flush() is False
+    assert "disk full" in capsys.readouterr().out
+    assert storage.load_scores() == [("easy", "Player1", 100)]
+    storage.close()
+
+    assert inner.snapshots == [[("easy", "Player1", 100)]]
+
+
+def test_write_behind_requeues_only_unwritten_data(capsys):
+    inner = SnapshotStorage(fail=1,
+                            error=sqlite3.OperationalError("database locked"))
+    storage = WriteBehindStorage(inner, interval=60)
+    storage.record_score("easy", "Player1", 100)
+    assert storage.flush() is True
+    storage.save_scores([("easy", "Player1", 100)])
+    storage.record_score("easy", "Player2", 200)
+
+    assert storage.flush() is False
+    assert "database locked" in capsys.readouterr().out
+    assert storage.flush() is True
+    storage.close()
+
+    # The first event reached the inner storage before the failed snapshot
+    # and is not written a second time.
+    assert inner.events == [("easy", "Player1", 100), ("easy", "Player2", 200)]
+    assert inner.snapshots == [[("easy", "Player1", 100)]]
+
+
+def test_write_behind_worker_survives_unexpected_errors(capsys):
+    inner = SnapshotStorage(fail=1, error=RuntimeError("bug"))
+    storage = WriteBehindStorage(inner, interval=0)
+    storage.save_scores([("easy", "Player1", 100)])
+    deadline = time.monotonic() + 5
+    while "bug" not in capsys.readouterr().out and \
+            time.monotonic() < deadline:
+        time.sleep(0.001)
+
+    assert storage.worker.is_alive()
+    storage.close()
+    assert inner.snapshots == [[("easy", "Player1", 100)]]